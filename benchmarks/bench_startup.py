@@ -0,0 +1,58 @@
+#-----------------------------------
+# Steam Uploader Menu startup benchmark
+#-----------------------------------
+# Measures cold-start time of the headless CLI (`steamuploader.py mods`) and compares it
+# with the cost of importing tkinter, which the script no longer pays unless a file dialog opens.
+# Everything runs in a throwaway workspace (see bench_uploads.workspace): a start can rewrite
+# settings.txt in its working directory, which must not be the repository's own.
+#
+# Usage: python benchmarks/bench_startup.py [runs]
+
+import os
+import sys
+import statistics
+import subprocess
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(os.path.dirname(SCRIPT_DIR), 'steamuploader.py')
+
+
+def time_command(args, runs, cwd):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    from bench_uploads import workspace
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with workspace(20) as (_, root, _):
+        run_cases(runs, root)
+
+
+def run_cases(runs, cwd):
+    cases = [
+        ("python (empty)", [sys.executable, '-c', 'pass']),
+        ("import tkinter", [sys.executable, '-c', 'import tkinter; from tkinter import filedialog']),
+        ("import steamuploader", [sys.executable, '-c', f'import sys; sys.path.insert(0, {os.path.dirname(SCRIPT)!r}); import steamuploader']),
+        ("steamuploader.py mods", [sys.executable, SCRIPT, 'mods']),
+    ]
+    print(f"{'CASE'.ljust(24)} | MEDIAN   | MIN      ({runs} runs)")
+    print("-" * 52)
+    for name, args in cases:
+        median, best = time_command(args, runs, cwd)
+        print(f"{name.ljust(24)} | {median * 1000:6.1f}ms | {best * 1000:6.1f}ms")
+
+    check = subprocess.run(
+        [sys.executable, '-c', f'import sys; sys.path.insert(0, {os.path.dirname(SCRIPT)!r}); import steamuploader; print("tkinter" in sys.modules)'],
+        cwd=cwd, capture_output=True, text=True
+    )
+    print(f"\ntkinter imported at startup: {check.stdout.strip()}")
+
+
+if __name__ == "__main__":
+    main()
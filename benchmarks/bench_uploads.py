@@ -0,0 +1,252 @@
+#-----------------------------------
+# Steam Uploader Menu upload benchmarks
+#-----------------------------------
+# Runs the upload pipeline against benchmarks/fake_steamuploader.py in a throwaway workspace
+# (own settings.txt, mods.txt, commands.txt and cache), so no Steam client is needed.
+#
+#   startup      cold start of `steamuploader.py mods` and `import steamuploader`
+#   overhead     execute_upload per call minus the bare fake uploader process
+#   batch        run_batch throughput at several worker counts
+#   manifest     build_content_manifest on a synthetic Contents tree, cold and warm
+#
+# Results are saved as JSON (benchmarks/results/ by default) and can be compared with an
+# earlier run to spot regressions:
+#
+#   python benchmarks/bench_uploads.py --save before.json
+#   python benchmarks/bench_uploads.py --compare before.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+FAKE_UPLOADER = os.path.join(SCRIPT_DIR, 'fake_steamuploader.py')
+RESULTS_DIR = os.path.join(SCRIPT_DIR, 'results')
+BENCHMARKS = ['startup', 'overhead', 'batch', 'manifest']
+
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+from bench_startup import time_command
+
+
+def fake_command(flags, **options):
+    extra = " ".join(f"--{key.replace('_', '-')} {value}" for key, value in options.items())
+    return f'"{sys.executable}" "{FAKE_UPLOADER}" {extra} -a 108600 -w {{WORKSHOP_ID}} {flags}'
+
+
+@contextlib.contextmanager
+def workspace(mod_count, **fake_options):
+    """Create a temporary workspace with fake mods and commands.txt, chdir into it and load steamuploader."""
+    root = tempfile.mkdtemp(prefix='steamuploader-bench-')
+    base_path = os.path.join(root, 'mods')
+    flags = ['-c {CONTENT}', '-d {DESC}', '-t {TITLE}', '-v {VISIBILITY}', '-T {TAGS}', '-p {PREVIEW}']
+    with open(os.path.join(root, 'commands.txt'), 'w') as f:
+        for flag in flags + [" ".join(flags)]:
+            f.write(fake_command(flag, **fake_options) + "\n")
+    with open(os.path.join(root, 'mods.txt'), 'w') as f:
+        for i in range(mod_count):
+            f.write(f"BenchMod{i:03d}={1000000 + i}\n")
+            contents = os.path.join(base_path, f"BenchMod{i:03d}", 'Contents')
+            os.makedirs(contents)
+            with open(os.path.join(contents, 'mod.txt'), 'w') as mod_file:
+                mod_file.write("bench\n")
+    with open(os.path.join(root, 'settings.txt'), 'w') as f:
+        f.write(f"DEFAULT_BASE_PATH={base_path}\nDEFAULT_DESCRIPTION_PATH={root}\nDEFAULT_DISCOVER_MODS=0\nDEFAULT_STEAM_CHECK=0\nDEFAULT_UPLOADS_PER_MINUTE=0\n")
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        import steamuploader
+        steamuploader.MODS.clear()
+        steamuploader.load_settings()
+        steamuploader.load_mods()
+        steamuploader.load_commands()
+        try:
+            yield steamuploader, root, base_path
+        finally:
+            # Write pending settings here; the exit handler would write them to settings.txt in the caller's cwd
+            steamuploader.flush_settings()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_startup(args):
+    results = {}
+    with workspace(20) as (su, root, base_path):
+        median, _ = time_command([sys.executable, '-c', 'pass'], args.runs, root)
+        results['startup.python_s'] = median
+        median, _ = time_command([sys.executable, '-c', f'import sys; sys.path.insert(0, {REPO_DIR!r}); import steamuploader'], args.runs, root)
+        results['startup.import_s'] = median
+        median, _ = time_command([sys.executable, os.path.join(REPO_DIR, 'steamuploader.py'), 'mods'], args.runs, root)
+        results['startup.cli_mods_s'] = median
+    return results
+
+
+def bench_overhead(args):
+    with workspace(1, latency=0, progress=0) as (su, root, base_path):
+        template = su.COMMAND_TEMPLATES[2]
+        workshop_id = su.MODS['BenchMod000']
+        argv = su.build_command(template, workshop_id, title='Bench')
+        raw, wrapped = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            raw.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            su.execute_upload(template, workshop_id, title='Bench')
+            wrapped.append(time.perf_counter() - start)
+    return {
+        'overhead.process_s': statistics.median(raw),
+        'overhead.execute_upload_s': statistics.median(wrapped),
+        'overhead.per_call_s': statistics.median(wrapped) - statistics.median(raw),
+    }
+
+
+def bench_batch(args):
+    results = {}
+    with workspace(args.jobs, latency=args.latency, progress=5, fail_rate=args.fail_rate, seed=1) as (su, root, base_path):
+        su.RETRY_BASE_DELAY = 0.05
+        for workers in args.workers:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                jobs = su.build_batch_jobs(sorted(su.MODS), ['3'], {'title': 'Bench'}, base_path)
+                start = time.perf_counter()
+                batch_results = su.run_batch(jobs, workers)
+                elapsed = time.perf_counter() - start
+            ok = sum(1 for result in batch_results if result['ok'])
+            results[f'batch.w{workers}.elapsed_s'] = elapsed
+            results[f'batch.w{workers}.jobs_per_s'] = len(jobs) / elapsed
+            results[f'batch.w{workers}.ok'] = ok
+    return results
+
+
+def make_content_tree(path, small_files, large_files, large_mb):
+    for i in range(small_files):
+        folder = os.path.join(path, f"dir{i % 32:02d}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"file{i:05d}.txt"), 'wb') as f:
+            f.write(os.urandom(4096))
+    block = os.urandom(1024 * 1024)
+    for i in range(large_files):
+        with open(os.path.join(path, f"large{i:02d}.bin"), 'wb') as f:
+            for _ in range(large_mb):
+                f.write(block)
+    # Age the files so the warm run may trust their mtimes (see MTIME_SAFETY_NS)
+    old = time.time() - 3600
+    for root, _, files in os.walk(path):
+        for name in files:
+            os.utime(os.path.join(root, name), (old, old))
+
+
+def bench_manifest(args):
+    with workspace(0) as (su, root, base_path):
+        contents = os.path.join(root, 'Contents')
+        make_content_tree(contents, args.small_files, args.large_files, args.large_mb)
+        total_mb = (args.small_files * 4096) / (1024 * 1024) + args.large_files * args.large_mb
+
+        su.CONTENT_SCANS.clear()
+        start = time.perf_counter()
+        manifest = su.build_content_manifest(contents)
+        cold = time.perf_counter() - start
+
+        su.CONTENT_SCANS.clear()
+        start = time.perf_counter()
+        su.build_content_manifest(contents, manifest)
+        warm = time.perf_counter() - start
+    return {
+        'manifest.files': args.small_files + args.large_files,
+        'manifest.total_mb': round(total_mb, 1),
+        'manifest.cold_s': cold,
+        'manifest.cold_mb_per_s': total_mb / cold,
+        'manifest.warm_s': warm,
+    }
+
+
+def compare_results(current, baseline, threshold):
+    """Print current vs baseline; timings (_s) that grew or rates (_per_s) that dropped by more than threshold are flagged."""
+    print(f"\n{'METRIC'.ljust(32)} | {'BASELINE'.rjust(10)} | {'CURRENT'.rjust(10)} | CHANGE")
+    print("-" * 70)
+    regressions = 0
+    for key in sorted(current):
+        if key not in baseline or not baseline[key]:
+            continue
+        change = (current[key] - baseline[key]) / baseline[key]
+        worse = -change if key.endswith('_per_s') else change
+        flag = ""
+        if key.endswith('_s') and worse > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key.ljust(32)} | {baseline[key]:10.4f} | {current[key]:10.4f} | {change * 100:+6.1f}%{flag}")
+    return regressions
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark steamuploader.py against a fake SteamUploader.")
+    parser.add_argument('benchmarks', nargs='*', help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--runs', type=int, default=10, help="Samples for startup and overhead")
+    parser.add_argument('--jobs', type=int, default=16, help="Mods in the batch benchmark")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Worker counts to compare")
+    parser.add_argument('--latency', type=float, default=0.25, help="Fake uploader run time per job (batch)")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fake uploader failure rate (batch)")
+    parser.add_argument('--small-files', type=int, default=2000, help="4 KiB files in the synthetic Contents tree")
+    parser.add_argument('--large-files', type=int, default=4, help="Large files in the synthetic Contents tree")
+    parser.add_argument('--large-mb', type=int, default=64, help="Size of each large file in MiB")
+    parser.add_argument('--save', help="Where to save the results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Relative change reported as a regression")
+    return parser
+
+
+def main(argv):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    selected = args.benchmarks or BENCHMARKS
+    runners = {'startup': bench_startup, 'overhead': bench_overhead, 'batch': bench_batch, 'manifest': bench_manifest}
+
+    results = {}
+    for name in BENCHMARKS:
+        if name in selected:
+            print(f"Running {name}...", flush=True)
+            results.update(runners[name](args))
+
+    print(f"\n{'METRIC'.ljust(32)} | VALUE")
+    print("-" * 46)
+    for key in sorted(results):
+        print(f"{key.ljust(32)} | {results[key]:.4f}")
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'args': vars(args),
+        'results': results,
+    }
+    save_path = args.save or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+    with open(save_path, 'w', encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {save_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding="utf-8") as f:
+            baseline = json.load(f)['results']
+        if compare_results(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+#-----------------------------------
+# Fake SteamUploader
+#-----------------------------------
+# Local stand-in for SteamUploader.exe. It accepts the same flags, prints Steam-like log,
+# progress and result lines and exits with the same codes, without a Steam client.
+#
+# Point commands.txt at it (see benchmarks/commands.txt):
+#   python benchmarks/fake_steamuploader.py --latency 2 -a 108600 -w {WORKSHOP_ID} -c {CONTENT}
+#
+# Behaviour is set with the --fake options below or with environment variables
+# (FAKE_UPLOADER_LATENCY, FAKE_UPLOADER_PROGRESS, FAKE_UPLOADER_OUTPUT, FAKE_UPLOADER_FAIL_RATE,
+# FAKE_UPLOADER_INIT_FAIL_RATE, FAKE_UPLOADER_SEED); options win over the environment.
+
+import os
+import sys
+import time
+import random
+import argparse
+
+
+def env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Fake SteamUploader for benchmarks and tests.")
+    parser.add_argument('-a', dest='app_id', default='')
+    parser.add_argument('-w', dest='workshop_id', default='')
+    parser.add_argument('-c', dest='content')
+    parser.add_argument('-d', dest='desc')
+    parser.add_argument('-t', dest='title')
+    parser.add_argument('-v', dest='visibility')
+    parser.add_argument('-T', dest='tags')
+    parser.add_argument('-p', dest='preview')
+    parser.add_argument('--latency', type=float, default=env_float('FAKE_UPLOADER_LATENCY', 0.5),
+                        help="Total run time in seconds, spread over the progress lines")
+    parser.add_argument('--progress', type=int, default=int(env_float('FAKE_UPLOADER_PROGRESS', 10)),
+                        help="Number of 'Uploading content' progress lines (content uploads only)")
+    parser.add_argument('--output', type=int, default=int(env_float('FAKE_UPLOADER_OUTPUT', 0)),
+                        help="Extra log lines to print (output volume)")
+    parser.add_argument('--fail-rate', type=float, default=env_float('FAKE_UPLOADER_FAIL_RATE', 0.0),
+                        help="Probability (0-1) that the update fails after upload")
+    parser.add_argument('--init-fail-rate', type=float, default=env_float('FAKE_UPLOADER_INIT_FAIL_RATE', 0.0),
+                        help="Probability (0-1) that the Steam API fails to initialize")
+    parser.add_argument('--seed', type=int, default=os.environ.get('FAKE_UPLOADER_SEED'),
+                        help="Random seed for reproducible failures")
+    return parser
+
+
+def content_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def main(argv):
+    args = build_arg_parser().parse_args(argv)
+    rng = random.Random(args.seed)
+
+    print("Initializing Steam API...", flush=True)
+    if rng.random() < args.init_fail_rate:
+        print("Failed to initialize Steam API (is Steam running?)", file=sys.stderr, flush=True)
+        return 3
+    if not args.workshop_id:
+        print("Error: missing workshop item id (-w)", file=sys.stderr, flush=True)
+        return 2
+
+    print(f"Starting update for item {args.workshop_id} (app {args.app_id})", flush=True)
+    for i in range(args.output):
+        print(f"[log] fake uploader line {i + 1}/{args.output}", flush=True)
+
+    steps = max(1, args.progress) if args.content else 1
+    total = content_size(args.content) if args.content and os.path.isdir(args.content) else 0
+    for step in range(1, steps + 1):
+        time.sleep(args.latency / steps)
+        if args.content:
+            done = total * step // steps
+            print(f"Uploading content: {step * 100 // steps}% ({done} / {total} bytes)", flush=True)
+
+    print("Submitting item update...", flush=True)
+    if rng.random() < args.fail_rate:
+        print("Failed to submit item update (error code 2)", file=sys.stderr, flush=True)
+        return 1
+    print(f"Item {args.workshop_id} updated successfully", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
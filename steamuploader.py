@@ -3,10 +3,26 @@
 #---------------------------
 
 import os
+import re
 import sys
+import json
+import mmap
+import time
+import uuid
+import shlex
+import atexit
+import bisect
+import random
+import shutil
+import locale
+import hashlib
+import fnmatch
+import argparse
+import threading
+import statistics
 import subprocess
-import tkinter as tk
-from tkinter import filedialog
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait as wait_futures
 
 # ANSI Colors
 RESET = "\033[0m"
@@ -19,6 +35,23 @@ YELLOW = "\033[93m"
 SETTINGS_FILE = 'settings.txt'
 COMMANDS_FILE = 'commands.txt'
 MODS_FILE = 'mods.txt'
+WORKSHOP_MANIFEST_FILE = 'workshop.json'
+
+# Cache directories (created on demand)
+CACHE_DIR = 'cache'
+MANIFESTS_DIR = os.path.join(CACHE_DIR, 'manifests')
+METADATA_DIR = os.path.join(CACHE_DIR, 'metadata')
+PREVIEWS_DIR = os.path.join(CACHE_DIR, 'previews')
+JOURNAL_FILE = os.path.join(CACHE_DIR, 'journal.jsonl')
+DAEMON_JOURNAL_FILE = os.path.join(CACHE_DIR, 'daemon_journal.jsonl')
+LOGS_DIR = os.path.join(CACHE_DIR, 'logs')
+DESCRIPTIONS_DIR = os.path.join(CACHE_DIR, 'descriptions')
+DESCRIPTIONS_STATE_FILE = os.path.join(DESCRIPTIONS_DIR, 'state.json')
+RECENT_FILES_FILE = os.path.join(CACHE_DIR, 'recent_files.json')
+DISCOVERY_FILE = os.path.join(CACHE_DIR, 'discovery.json')
+METRICS_STATE_FILE = os.path.join(CACHE_DIR, 'metrics_state.json')
+HISTORY_FILE = os.path.join(CACHE_DIR, 'history.sqlite3')
+LOCKS_DIR = os.path.join(CACHE_DIR, 'locks')
 
 # Script directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -33,8 +66,34 @@ SETTINGS = {
     'DEFAULT_VISIBILITY': '0',
     'DEFAULT_TAGS': '',
     'DEFAULT_PREVIEW_PATH': '',
+    'DEFAULT_BATCH_WORKERS': '4',
+    'DEFAULT_PICKER': 'auto',
+    'DEFAULT_DISCOVER_MODS': '1',
+    'DEFAULT_DISCOVER_IGNORE': '',
+    'DEFAULT_METRICS_DIR': '',
+    'DEFAULT_DAEMON_PORT': '8765',
+    'DEFAULT_UPLOAD_TIMEOUT': '3600',
+    'DEFAULT_STALL_TIMEOUT': '600',
+    'DEFAULT_UPLOADS_PER_MINUTE': '30',
+    'DEFAULT_CONTENT_UPLOADS': '2',
+    'DEFAULT_STEAM_CHECK': '1',
+    'DEFAULT_BREAKER_THRESHOLD': '3',
+    'DEFAULT_BREAKER_COOLDOWN': '120',
 }
 
+# Settings writes are coalesced: flushed after this many idle seconds, after this many changes and on exit
+SETTINGS_IDLE_FLUSH = 10.0
+SETTINGS_FLUSH_AFTER = 25
+SETTINGS_HEADER = [
+    "# Lines starting with '#' are comments.",
+    "# settings.txt stores last used values.",
+    "# The user can manually edit this file to change the values or let the script handle it.",
+    "# DEFAULT_BASE_PATH points to the directory where mods are located (not recommended to change).",
+    "",
+]
+SETTINGS_STATE = {'saved': {}, 'changes': 0, 'timer': None, 'exit_hook': False}
+SETTINGS_LOCK = threading.RLock()
+
 # Visibility options mapping
 VISIBILITY_MAP = {
     '0': "Public (default)",
@@ -42,11 +101,265 @@ VISIBILITY_MAP = {
     '2': "Private (hidden)",
     '3': "Unlisted"
 }
+VISIBILITY_NAMES = {'public': '0', 'friends': '1', 'friends-only': '1', 'private': '2', 'unlisted': '3'}
+
+# Workshop manifest (see load_workshop_manifest): fields accepted per mod
+WORKSHOP_MANIFEST_FIELDS = ('workshop_id', 'content', 'description', 'title', 'visibility', 'tags', 'preview')
 
-# Mods dictionary and command templates
+# Mods dictionary, optional per-mod tags (ModName=WorkshopID|Tag1,Tag2) and command templates
 MODS = {}
+MOD_TAGS = {}
 COMMAND_TEMPLATES = []
 
+# Command templates compiled once (see compile_command_template), keyed by template line
+COMPILED_COMMANDS = {}
+TEMPLATE_TOKEN = re.compile(r'(?:"[^"]*"|[^\s"])+')
+TEMPLATE_PLACEHOLDERS = {
+    '{CONTENT}': 'content_path',
+    '{DESC}': 'desc_path',
+    '{TITLE}': 'title',
+    '{VISIBILITY}': 'visibility',
+    '{TAGS}': 'tags',
+    '{PREVIEW}': 'preview',
+}
+
+# Mod catalog indexes, rebuilt from MODS whenever the mod list changes
+MOD_CATALOG = {'names': [], 'sorted': [], 'by_id': {}, 'by_tag': {}, 'version': None}
+MOD_PAGE_SIZE = 20
+
+# Project Zomboid metadata found by the discovery scan, keyed by mod folder name
+MOD_INFO = {}
+DISCOVERY_VERSION = 1
+
+# Description templates (*.bbcode.tmpl, *.txt.tmpl): {{variable}} and {{> partial file}}, rendered per mod
+# into DESCRIPTIONS_DIR (see render_description). Per-mod templates are looked up in DEFAULT_DESCRIPTION_PATH
+DESCRIPTION_TEMPLATE_EXT = '.tmpl'
+DESCRIPTION_TEMPLATE_NAMES = ['{mod}.bbcode.tmpl', '{mod}.txt.tmpl', 'description.bbcode.tmpl', 'description.txt.tmpl']
+DESCRIPTION_TAG = re.compile(r'\{\{\s*(>)?\s*([^{}]+?)\s*\}\}')
+DESCRIPTION_MAX_INCLUDE_DEPTH = 16
+DESCRIPTION_RENDER_VERSION = 1
+DESCRIPTIONS = {'state': None, 'lock': threading.Lock()}
+
+# Preview images: Steam Workshop size limit and optimization steps (needs Pillow)
+PREVIEW_MAX_BYTES = 1 * 1024 * 1024
+PREVIEW_MAX_DIMENSION = 1024
+PREVIEW_SCALE_STEPS = [1.0, 0.85, 0.7, 0.55, 0.4, 0.3]
+PREVIEW_JPEG_QUALITIES = [90, 82, 74, 66, 58, 50]
+PREVIEW_GIF_COLORS = [256, 128, 64, 32]
+PREVIEW_CACHE_VERSION = 1
+
+# File pickers: dialog settings and terminal picker index limits per kind of file
+PICKER_KINDS = {
+    'description': {
+        'title': "Select Description file",
+        'filetypes': [("Description Files", "*.txt *.bbcode *.tmpl")],
+        'extensions': ('.txt', '.bbcode', '.tmpl'),
+        'setting': 'DEFAULT_DESCRIPTION_PATH',
+    },
+    'preview': {
+        'title': "Select Preview image",
+        'filetypes': [("Image Files", "*.jpg *.png *.gif")],
+        'extensions': ('.jpg', '.png', '.gif'),
+        'setting': 'DEFAULT_PREVIEW_PATH',
+    },
+}
+PICKER_INDEX_MAX_FILES = 5000
+PICKER_INDEX_MAX_DEPTH = 4
+PICKER_RESULTS = 15
+RECENT_FILES_LIMIT = 10
+
+# Hidden Tk root shared by every file dialog, and the terminal picker's file index
+TK_ROOT = None
+FILE_INDEX = {}
+
+# Content staging: ignore rules live next to the mod's Contents folder,
+# the filtered mirror is built beside it so hardlinks stay on the same volume
+IGNORE_FILE_NAME = '.uploadignore'
+STAGING_DIR_NAME = '.upload_staging'
+DEFAULT_IGNORE_PATTERNS = [
+    '.git/',
+    '.svn/',
+    '.hg/',
+    '.vscode/',
+    '.idea/',
+    '*~',
+    '*.bak',
+    '*.swp',
+    '*.tmp',
+    '.DS_Store',
+    'Thumbs.db',
+    'desktop.ini',
+    IGNORE_FILE_NAME,
+]
+# Linux ioctl for copy-on-write clones (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Content manifests: files at least this big are hashed through mmap
+MMAP_HASH_THRESHOLD = 4 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# Files modified this close to the previous scan are always re-hashed (mtime granularity)
+MTIME_SAFETY_NS = 2 * 1000 * 1000 * 1000
+
+# Last content scan per path, reused to skip re-hashing within a session
+CONTENT_SCANS = {}
+
+# SteamUploader output parsing (matched case-insensitively against every line)
+PROGRESS_PATTERNS = {
+    'percent':    re.compile(r'(\d{1,3}(?:\.\d+)?)\s*%'),
+    'bytes':      re.compile(r'(\d+)\s*/\s*(\d+)\s*(?:bytes|b)\b', re.IGNORECASE),
+    'item_id':    re.compile(r'(?:item|workshop|published\s*file)\s*(?:id)?\s*[:=#]?\s*(\d{6,})', re.IGNORECASE),
+    'error_code': re.compile(r'(?:error|eresult|result)\s*(?:code)?\s*[:=]?\s*(\d+)', re.IGNORECASE),
+}
+# Checked in order; errors come first so "Failed to submit item ..." is an error, not the commit phase
+PHASE_KEYWORDS = [
+    ('error',   ('error', 'failed', 'failure')),
+    ('init',    ('initializ', 'init steam', 'connecting')),
+    ('prepare', ('preparing', 'start update', 'starting update')),
+    ('upload',  ('uploading', 'upload progress', 'sending')),
+    ('commit',  ('committing', 'submitting', 'submit item')),
+    ('done',    ('success', 'completed', 'done')),
+]
+PROGRESS_BAR_WIDTH = 30
+
+# Pre-flight checks run before SteamUploader is launched (Steam Workshop limits)
+TITLE_MAX_LENGTH = 128
+DESCRIPTION_MAX_LENGTH = 8000
+IMAGE_SIGNATURES = {
+    '.jpg': (b'\xff\xd8\xff',),
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.gif': (b'GIF87a', b'GIF89a'),
+}
+PLACEHOLDER_PATTERN = re.compile(r'\{[A-Z_]+\}')
+
+# Upload metrics: Prometheus textfile (node_exporter textfile collector) and JSON lines,
+# written to DEFAULT_METRICS_DIR or cache/metrics
+METRICS_PROM_FILE = 'steam_uploader.prom'
+METRICS_JSONL_FILE = 'uploads.jsonl'
+DURATION_BUCKETS = [1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600]
+METRICS_LOCK = threading.Lock()
+METRICS_STATE = {}
+
+# Upload history: one row per execute_upload call in HISTORY_FILE (see record_upload_history)
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY,
+    mod_name TEXT NOT NULL,
+    workshop_id TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    command TEXT,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL,
+    exit_code INTEGER,
+    error_code TEXT,
+    content_sent INTEGER NOT NULL DEFAULT 0,
+    content_bytes INTEGER,
+    content_files INTEGER,
+    attempt INTEGER NOT NULL DEFAULT 1,
+    queue_wait REAL,
+    log_path TEXT
+);
+CREATE INDEX IF NOT EXISTS uploads_started ON uploads (started_at);
+CREATE INDEX IF NOT EXISTS uploads_mod_started ON uploads (mod_name, started_at);
+CREATE INDEX IF NOT EXISTS uploads_duration ON uploads (duration);
+CREATE INDEX IF NOT EXISTS uploads_content ON uploads (content_sent, status, content_bytes);
+"""
+HISTORY_SIZE_BUCKETS = [
+    (1024 ** 2, '< 1 MB'), (10 * 1024 ** 2, '1-10 MB'), (100 * 1024 ** 2, '10-100 MB'),
+    (1024 ** 3, '100 MB-1 GB'), (None, '>= 1 GB'),
+]
+HISTORY_REPORTS = ('recent', 'slowest', 'failures', 'sizes')
+HISTORY_LOCK = threading.Lock()
+HISTORY = {'db': None}
+
+# Batch retries: exponential backoff with jitter between attempts. Only transient failures are retried:
+# a stalled uploader, one killed by a signal, a Steam API init failure or one of these Steam EResult codes
+# (Fail, NoConnection, Busy, Timeout, ServiceUnavailable, RateLimitExceeded). Timeouts are not retried
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 120.0
+RETRYABLE_STATUSES = {'stalled'}
+RETRYABLE_ERESULTS = {'2', '3', '10', '16', '20', '84'}
+
+# Watch mode: poll Contents snapshots every WATCH_INTERVAL seconds, upload once a folder has been
+# quiet for WATCH_QUIET seconds (or WATCH_MAX_DELAY seconds after the first change of a burst)
+WATCH_INTERVAL = 2.0
+WATCH_QUIET = 5.0
+WATCH_MAX_DELAY = 120.0
+
+# Execution engine: one asyncio loop runs every uploader process (see stream_command_async).
+# Timeouts come from DEFAULT_UPLOAD_TIMEOUT / DEFAULT_STALL_TIMEOUT (seconds, 0 = no limit)
+ENGINE = {'loop': None, 'thread': None, 'lock': threading.Lock()}
+ENGINE_POLL = 0.25
+KILL_GRACE = 5.0
+OUTPUT_SPLIT = re.compile(rb'\r\n|\r|\n')
+STOP_REASONS = {
+    'timeout': "timed out after {timeout:g}s",
+    'stalled': "no output for {stall_timeout:g}s",
+    'canceled': "canceled",
+}
+# Job logs: every upload appends its full output to LOGS_DIR/<mod>.log, rotated at LOG_MAX_BYTES
+# with LOG_BACKUPS older files; results and the console keep only the last OUTPUT_TAIL_LINES lines
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+OUTPUT_TAIL_LINES = 200
+
+# Steam health: uploads only start while Steam is running (probed at most every STEAM_PROBE_TTL seconds,
+# DEFAULT_STEAM_CHECK=0 skips the probe). After DEFAULT_BREAKER_THRESHOLD Steam API init failures in a row
+# the circuit breaker holds every upload for DEFAULT_BREAKER_COOLDOWN seconds
+STEAM_PROBE_TTL = 10.0
+STEAM_PID_FILES = ['~/.steam/steam.pid', '~/.var/app/com.valvesoftware.Steam/.steam/steam.pid']
+STEAM_PROCESS_NAMES = {'steam', 'steam.exe', 'steamwebhelper'}
+STEAM_INIT_FAILURE = re.compile(
+    r'(?:failed to init\w*|SteamAPI_Init\w*\s*(?:\(\))?\s*failed|steam (?:is not|isn.t) running|is steam running)', re.IGNORECASE)
+STEAM = {'probe': None, 'probed_at': 0.0, 'failures': 0, 'opened_at': None, 'lock': threading.Lock()}
+
+# Upload scheduler: a token bucket (DEFAULT_UPLOADS_PER_MINUTE, bursts of SCHEDULER_BURST) gates every
+# SteamUploader launch; metadata-only calls go ahead of content uploads, and at most
+# DEFAULT_CONTENT_UPLOADS content uploads run at once. Its state is only used on the execution engine loop
+SCHEDULER_BURST = 5
+LANE_PRIORITY = {'metadata': 0, 'content': 1}
+SCHEDULER = {
+    'wakeup': None,
+    'waiting': [],
+    'seq': 0,
+    'tokens': float(SCHEDULER_BURST),
+    'updated': time.monotonic(),
+    'content_running': 0,
+}
+
+# execute_upload keywords that control the run rather than fill the command
+EXECUTION_OPTIONS = ('force', 'timeout', 'stall_timeout')
+
+# Upload daemon: localhost-only JSON API in front of a job queue (see serve_daemon)
+DAEMON_HOST = '127.0.0.1'
+DAEMON_KEEP_FINISHED = 200
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+DAEMON = {
+    'jobs': {},
+    'order': [],
+    'busy': set(),
+    'running': 0,
+    'tasks': [],
+    'cond': threading.Condition(),
+    'stop': threading.Event(),
+}
+# Job keys that only live in memory, never in the journal
+JOURNAL_RUNTIME_KEYS = ('id', 'attempts', 'journal')
+JOURNAL_LOCK = threading.Lock()
+
+# Option number -> (COMMAND_TEMPLATES index, execute_upload keyword)
+UPLOAD_OPTIONS = {
+    '1': (0, 'content_path'),
+    '2': (1, 'desc_path'),
+    '3': (2, 'title'),
+    '4': (3, 'visibility'),
+    '5': (4, 'tags'),
+    '6': (5, 'preview'),
+}
+
 # -----------------
 # Utility Functions
 # -----------------
@@ -70,13 +383,15 @@ def clear_screen():
 
 
 def save_mods_to_file():
+    invalidate_mod_catalog()
     try:
         with open(MODS_FILE, 'w') as f:
             f.write("# Lines starting with '#' are comments.\n")
             f.write("# The user can manually edit this file to add/remove mods or use the \"Manage Mods\" option in the script main menu.\n")
-            f.write("# Format: ModName=WorkshopID\n\n")
+            f.write("# Format: ModName=WorkshopID (optional tags: ModName=WorkshopID|Tag1,Tag2)\n\n")
             for mod_name, mod_id in MODS.items():
-                f.write(f'{mod_name}={mod_id}\n')
+                tags = MOD_TAGS.get(mod_name)
+                f.write(f'{mod_name}={mod_id}|{",".join(tags)}\n' if tags else f'{mod_name}={mod_id}\n')
     except Exception as e:
         print(f"{RED}ERROR writing to {MODS_FILE}: {e}{RESET}")
 
@@ -87,9 +402,14 @@ def update_mods_file(mod_name, new_id):
 
 
 def load_settings():
+    # Pending changes are written at exit; register the hook once however often settings are reloaded
+    if not SETTINGS_STATE['exit_hook']:
+        atexit.register(flush_settings)
+        SETTINGS_STATE['exit_hook'] = True
     if not os.path.exists(SETTINGS_FILE):
         SETTINGS['DEFAULT_DESCRIPTION_PATH'] = SCRIPT_DIR
         save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
+        flush_settings()
         return
 
     try:
@@ -103,6 +423,7 @@ def load_settings():
                     var_name, var_value = var_name.strip(), var_value.strip()
                     if var_name in SETTINGS:
                         SETTINGS[var_name] = var_value
+        SETTINGS_STATE['saved'] = dict(SETTINGS)
 
         if not SETTINGS['DEFAULT_DESCRIPTION_PATH']:
             SETTINGS['DEFAULT_DESCRIPTION_PATH'] = SCRIPT_DIR
@@ -113,6 +434,7 @@ def load_settings():
 
 
 def load_mods():
+    invalidate_mod_catalog()
     if not os.path.exists(MODS_FILE):
         return
     try:
@@ -121,7 +443,11 @@ def load_mods():
                 line = line.strip()
                 if line and not line.startswith('#') and '=' in line:
                     mod_name, mod_id = line.split('=', 1)
+                    mod_id, _, tags = mod_id.partition('|')
                     MODS[mod_name.strip()] = mod_id.strip().lstrip('+')
+                    tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+                    if tag_list:
+                        MOD_TAGS[mod_name.strip()] = tag_list
     except Exception as e:
         print(f"{RED}ERROR reading {MODS_FILE}: {e}{RESET}")
 
@@ -134,6 +460,9 @@ def load_commands():
         with open(COMMANDS_FILE, 'r') as f:
             global COMMAND_TEMPLATES
             COMMAND_TEMPLATES = [line.strip() for line in f if line.strip()]
+        COMPILED_COMMANDS.clear()
+        for template in COMMAND_TEMPLATES:
+            compile_command_template(template)
         if len(COMMAND_TEMPLATES) < 2:
             print(f"{RED}ERROR: {COMMANDS_FILE} must contain at least two templates.{RESET}")
             sys.exit(1)
@@ -143,50 +472,411 @@ def load_commands():
 
 
 def save_settings(mod_name, description_file_name):
+    """
+    Record the last used mod / description file and schedule a settings.txt write.
+    Writes are coalesced: the file is only rewritten when a value really changed, after
+    SETTINGS_IDLE_FLUSH seconds without further changes, every SETTINGS_FLUSH_AFTER changes or on exit.
+    """
     if not all([SETTINGS['DEFAULT_BASE_PATH'], SETTINGS['DEFAULT_DESCRIPTION_PATH']]):
         return
 
     SETTINGS['DEFAULT_MOD_NAME'] = mod_name
     SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'] = description_file_name
 
+    with SETTINGS_LOCK:
+        if not settings_dirty_keys():
+            return
+        SETTINGS_STATE['changes'] += 1
+        if SETTINGS_STATE['changes'] >= SETTINGS_FLUSH_AFTER:
+            flush_settings()
+            return
+        if SETTINGS_STATE['timer']:
+            SETTINGS_STATE['timer'].cancel()
+        timer = threading.Timer(SETTINGS_IDLE_FLUSH, flush_settings)
+        timer.daemon = True
+        timer.start()
+        SETTINGS_STATE['timer'] = timer
+
+
+def settings_dirty_keys():
+    saved = SETTINGS_STATE['saved']
+    return [key for key, value in SETTINGS.items() if saved.get(key) != value]
+
+
+def flush_settings():
+    """Write pending settings changes now. Returns True if settings.txt was written."""
+    with SETTINGS_LOCK:
+        if SETTINGS_STATE['timer']:
+            SETTINGS_STATE['timer'].cancel()
+            SETTINGS_STATE['timer'] = None
+        if not all([SETTINGS['DEFAULT_BASE_PATH'], SETTINGS['DEFAULT_DESCRIPTION_PATH']]):
+            return False
+        if not settings_dirty_keys() and os.path.exists(SETTINGS_FILE):
+            return False
+        snapshot = dict(SETTINGS)
+        try:
+            write_settings_file(snapshot)
+        except Exception as e:
+            print(f"{RED}ERROR writing to {SETTINGS_FILE}: {e}{RESET}")
+            return False
+        SETTINGS_STATE['saved'] = snapshot
+        SETTINGS_STATE['changes'] = 0
+        return True
+
+
+def write_settings_file(values):
+    """
+    Rewrite settings.txt atomically (temp file + rename), keeping the user's comments,
+    unknown lines and key order. Keys missing from the file are appended.
+    """
+    lines = SETTINGS_HEADER
+    if os.path.exists(SETTINGS_FILE):
+        with open(SETTINGS_FILE, 'r', encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    output, written = [], set()
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#') and '=' in stripped:
+            key = stripped.split('=', 1)[0].strip()
+            if key in values and key not in written:
+                output.append(f"{key}={values[key]}")
+                written.add(key)
+                continue
+        output.append(line)
+    for key, value in values.items():
+        if key not in written:
+            output.append(f"{key}={value}")
+
+    tmp_path = SETTINGS_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        f.write("\n".join(output) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SETTINGS_FILE)
+
+
+# --------------------
+# Preview Optimization
+# --------------------
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_image(image, fmt, **params):
+    from io import BytesIO
+    buffer = BytesIO()
+    image.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def fit_image(image, scale):
+    """Resize to at most PREVIEW_MAX_DIMENSION on the long side, times scale."""
+    from PIL import Image
+    ratio = min(1.0, PREVIEW_MAX_DIMENSION / max(image.size)) * scale
+    if ratio >= 1.0:
+        return image
+    size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def optimize_jpeg(image):
+    image = image.convert('RGB')
+    for scale in PREVIEW_SCALE_STEPS:
+        resized = fit_image(image, scale)
+        for quality in PREVIEW_JPEG_QUALITIES:
+            data = encode_image(resized, 'JPEG', quality=quality, optimize=True, progressive=True)
+            if len(data) <= PREVIEW_MAX_BYTES:
+                return data
+    return None
+
+
+def optimize_png(image):
+    if image.mode not in ('RGB', 'RGBA', 'P', 'L', 'LA'):
+        image = image.convert('RGBA')
+    for scale in PREVIEW_SCALE_STEPS:
+        resized = fit_image(image, scale)
+        data = encode_image(resized, 'PNG', optimize=True)
+        if len(data) <= PREVIEW_MAX_BYTES:
+            return data
+        data = encode_image(resized.quantize(colors=256), 'PNG', optimize=True)
+        if len(data) <= PREVIEW_MAX_BYTES:
+            return data
+    return None
+
+
+def optimize_gif(image):
+    """Shrink an (animated) GIF by resizing, reducing the palette and dropping every other frame."""
+    from PIL import ImageSequence
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(image):
+        frames.append(frame.convert('RGBA'))
+        durations.append(frame.info.get('duration', image.info.get('duration', 100)))
+
+    step = 1
+    while True:
+        kept = frames[::step]
+        kept_durations = [sum(durations[i:i + step]) for i in range(0, len(frames), step)]
+        for scale in PREVIEW_SCALE_STEPS:
+            scaled = [fit_image(frame, scale) for frame in kept]
+            for colors in PREVIEW_GIF_COLORS:
+                resized = [frame.quantize(colors=colors) for frame in scaled]
+                params = {'optimize': True, 'loop': image.info.get('loop', 0)}
+                if len(resized) > 1:
+                    params.update(save_all=True, append_images=resized[1:], duration=kept_durations)
+                data = encode_image(resized[0], 'GIF', **params)
+                if len(data) <= PREVIEW_MAX_BYTES:
+                    return data
+                # Fewer colors only shave a little off; far too big means the next scale step
+                if len(data) > PREVIEW_MAX_BYTES * 1.5:
+                    break
+        if len(kept) <= 1:
+            return None
+        step *= 2
+
+
+def optimize_preview(file_path):
+    """
+    Make a preview image fit the Workshop size limit.
+    Returns (path, message): the original path if it already fits, an optimized copy cached by
+    source hash in cache/previews, or (None, error) if the image cannot be optimized.
+    """
+    if os.path.getsize(file_path) <= PREVIEW_MAX_BYTES:
+        return file_path, None
+
+    ext = os.path.splitext(file_path)[1].lower()
+    key = f"{file_digest(file_path)}-v{PREVIEW_CACHE_VERSION}"
+    cached_path = os.path.abspath(os.path.join(PREVIEWS_DIR, key + ext))
+    if os.path.isfile(cached_path):
+        return cached_path, f"Using cached optimized preview ({format_bytes(os.path.getsize(cached_path))})."
+
     try:
-        with open(SETTINGS_FILE, 'w', encoding="utf-8") as f:
-            f.write("# Lines starting with '#' are comments.\n")
-            f.write("# settings.txt stores last used values.\n")
-            f.write("# The user can manually edit this file to change the values or let the script handle it.\n")
-            f.write("# DEFAULT_BASE_PATH points to the directory where mods are located (not recommended to change).\n\n")
-            for key, value in SETTINGS.items():
-                f.write(f"{key}={value}\n")
+        from PIL import Image
+    except ImportError:
+        return None, f"File too large (>1MB): {file_path}\nInstall Pillow (pip install pillow) to optimize previews automatically."
+
+    try:
+        with Image.open(file_path) as image:
+            if ext == '.gif':
+                data = optimize_gif(image)
+            elif ext == '.png':
+                data = optimize_png(image)
+            else:
+                data = optimize_jpeg(image)
+    except Exception as e:
+        return None, f"Could not optimize {file_path}: {e}"
+
+    if not data:
+        return None, f"Could not get {os.path.basename(file_path)} under 1MB."
+
+    os.makedirs(PREVIEWS_DIR, exist_ok=True)
+    tmp_path = cached_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, cached_path)
+    return cached_path, (
+        f"Optimized preview: {format_bytes(os.path.getsize(file_path))} -> {format_bytes(len(data))}."
+    )
+
+
+# ------------
+# File Pickers
+# ------------
+
+def dialog_available():
+    """File dialogs need tkinter and, outside Windows/macOS, a display that is not an SSH session."""
+    if os.name != "nt" and sys.platform != "darwin":
+        if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+            return False
+    if os.environ.get("SSH_CONNECTION") or os.environ.get("SSH_TTY"):
+        return False
+    try:
+        import tkinter
+    except ImportError:
+        return False
+    return True
+
+
+def get_tk_root():
+    """Create the hidden Tk root on first use and keep it for the whole session."""
+    global TK_ROOT
+    if TK_ROOT is None:
+        import tkinter as tk
+        TK_ROOT = tk.Tk()
+        TK_ROOT.withdraw()
+        TK_ROOT.attributes("-topmost", True)
+    return TK_ROOT
+
+
+def close_tk_root():
+    global TK_ROOT
+    if TK_ROOT is not None:
+        try:
+            TK_ROOT.destroy()
+        except Exception:
+            pass
+        TK_ROOT = None
+
+
+def dialog_pick_file(kind, initial_dir):
+    from tkinter import filedialog
+    root = get_tk_root()
+    file_path = filedialog.askopenfilename(
+        parent=root,
+        title=PICKER_KINDS[kind]['title'],
+        filetypes=PICKER_KINDS[kind]['filetypes'],
+        initialdir=initial_dir
+    )
+    root.update()
+    return file_path
+
+
+def load_recent_files():
+    if not os.path.exists(RECENT_FILES_FILE):
+        return {}
+    try:
+        with open(RECENT_FILES_FILE, 'r', encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
 
+
+def remember_recent_file(kind, file_path):
+    recent = load_recent_files()
+    entries = [p for p in recent.get(kind, []) if os.path.normcase(p) != os.path.normcase(file_path)]
+    recent[kind] = [file_path] + entries[:RECENT_FILES_LIMIT - 1]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(RECENT_FILES_FILE, 'w', encoding="utf-8") as f:
+            json.dump(recent, f, indent=1)
     except Exception as e:
-        print(f"{RED}ERROR writing to {SETTINGS_FILE}: {e}{RESET}")
+        print(f"{RED}ERROR writing to {RECENT_FILES_FILE}: {e}{RESET}")
+
+
+def build_file_index(root_dir, extensions):
+    """List candidate files under root_dir (hidden folders skipped, depth and size capped)."""
+    files = []
+    stack = [(root_dir, 0)]
+    while stack and len(files) < PICKER_INDEX_MAX_FILES:
+        current, depth = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < PICKER_INDEX_MAX_DEPTH:
+                            stack.append((entry.path, depth + 1))
+                    elif entry.name.lower().endswith(extensions):
+                        files.append(entry.path)
+        except OSError:
+            continue
+    return files
 
 
-# ---------------
-# Input Functions
-# ---------------
+def get_file_index(kind, root_dir, refresh=False):
+    key = (kind, os.path.normcase(os.path.abspath(root_dir)))
+    if refresh or key not in FILE_INDEX:
+        FILE_INDEX[key] = build_file_index(root_dir, PICKER_KINDS[kind]['extensions'])
+    return FILE_INDEX[key]
 
-def get_description():
+
+def fuzzy_score(query, candidate):
+    """
+    Score a subsequence match of query in candidate (higher is better), None if it does not match.
+    Consecutive characters and matches inside the file name score more.
+    """
+    query, text = query.lower(), candidate.lower()
+    name_start = len(text) - len(os.path.basename(text))
+    score, pos, streak = 0, 0, 0
+    for ch in query:
+        found = text.find(ch, pos)
+        if found < 0:
+            return None
+        streak = streak + 1 if found == pos else 0
+        score += 1 + streak * 2 + (3 if found >= name_start else 0)
+        pos = found + 1
+    return score - len(text) * 0.01
+
+
+def fuzzy_search(query, candidates, limit=PICKER_RESULTS):
+    scored = [(fuzzy_score(query, path), path) for path in candidates]
+    scored = [(score, path) for score, path in scored if score is not None]
+    scored.sort(key=lambda item: -item[0])
+    return [path for _, path in scored[:limit]]
+
+
+def terminal_pick_file(kind, initial_dir):
+    """In-terminal picker: recent files, fuzzy search over an index of initial_dir, or a typed path."""
+    extensions = PICKER_KINDS[kind]['extensions']
+    recent = [p for p in load_recent_files().get(kind, []) if os.path.isfile(p)]
+
+    def default_listing():
+        index = [p for p in get_file_index(kind, initial_dir) if p not in recent]
+        return (recent + sorted(index, key=str.lower))[:PICKER_RESULTS], "Recent and indexed files"
+
+    shown, heading = default_listing()
     while True:
-        if SETTINGS.get('DEFAULT_DESCRIPTION_PATH'):
-            initial_dir = SETTINGS['DEFAULT_DESCRIPTION_PATH']
+        clear_screen()
+        print(f"{CYAN}=== {PICKER_KINDS[kind]['title'].upper()} ==={RESET}")
+        print(f"Searching in: {YELLOW}{initial_dir}{RESET} ({', '.join(extensions)})\n")
+        if shown:
+            print(f"{heading}:")
+            for i, path in enumerate(shown):
+                print(f"{i+1}) {os.path.basename(path)} ({os.path.dirname(path)})")
         else:
-            initial_dir = os.path.expanduser("~")
+            print(f"{YELLOW}No matching files.{RESET}")
+        print("\nR) Rescan folder")
+        print("Q) Cancel\n")
+        raw = input("Number to pick, text to search, or a file path: ").strip()
+        if not raw or raw.upper() == 'Q':
+            clear_screen()
+            return ''
+        if raw.upper() == 'R':
+            get_file_index(kind, initial_dir, refresh=True)
+            shown, heading = default_listing()
+            continue
+        if raw.isdigit() and 1 <= int(raw) <= len(shown):
+            clear_screen()
+            return shown[int(raw) - 1]
+        candidate = os.path.expanduser(raw.strip('"'))
+        if os.path.isfile(candidate):
+            clear_screen()
+            return os.path.abspath(candidate)
+        shown = fuzzy_search(raw, recent + [p for p in get_file_index(kind, initial_dir) if p not in recent])
+        heading = f"Matches for '{raw}'"
 
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes("-topmost", True)
 
-        file_path = filedialog.askopenfilename(
-            title="Select Description file",
-            filetypes=[("Text Files", "*.txt *.bbcode")],
-            initialdir=initial_dir
-        )
+def pick_file(kind):
+    """
+    Let the user pick a description or preview file with the configured picker
+    (DEFAULT_PICKER: auto, dialog or terminal). Returns the path or '' if nothing was picked.
+    """
+    initial_dir = SETTINGS.get(PICKER_KINDS[kind]['setting']) or os.path.expanduser("~")
+    mode = (SETTINGS.get('DEFAULT_PICKER') or 'auto').lower()
+    if mode == 'dialog' or (mode == 'auto' and dialog_available()):
+        file_path = dialog_pick_file(kind, initial_dir)
+    else:
+        file_path = terminal_pick_file(kind, initial_dir)
+
+    file_path = (file_path or '').strip()
+    if file_path and os.path.isfile(file_path):
+        remember_recent_file(kind, os.path.abspath(file_path))
+    return file_path
 
-        root.destroy()
 
-        if file_path:
-            file_path = file_path.strip()
+# ---------------
+# Input Functions
+# ---------------
+
+def get_description():
+    while True:
+        file_path = pick_file('description')
 
         if not file_path:
             print(f"{RED}No description file was selected.{RESET}")
@@ -200,7 +890,7 @@ def get_description():
 
         filename = os.path.basename(file_path)
         if not filename:
-            print(f"{RED}Invalid file selected. Must be a .txt or .bbcode file.{RESET}")
+            print(f"{RED}Invalid file selected. Must be a .txt, .bbcode or .tmpl file.{RESET}")
             continue
 
         print(f"Selected description file: {YELLOW}{filename}{RESET} ({file_path})")
@@ -225,25 +915,7 @@ def get_description():
 
 
 def get_description_file():
-    if SETTINGS.get('DEFAULT_DESCRIPTION_PATH'):
-        initial_dir = SETTINGS['DEFAULT_DESCRIPTION_PATH']
-    else:
-        initial_dir = os.path.expanduser("~")
-
-    root = tk.Tk()
-    root.withdraw()
-    root.attributes("-topmost", True)
-
-    file_path = filedialog.askopenfilename(
-        title="Select Description file",
-        filetypes=[("Text Files", "*.txt *.bbcode")],
-        initialdir=initial_dir
-    )
-
-    root.destroy()
-
-    if file_path:
-        file_path = file_path.strip()
+    file_path = pick_file('description')
 
     if not file_path:
         print(f"{RED}No description file was selected.{RESET}")
@@ -330,25 +1002,7 @@ def get_tags():
 
 def get_preview():
     while True:
-        if SETTINGS.get('DEFAULT_PREVIEW_PATH'):
-            initial_dir = SETTINGS['DEFAULT_PREVIEW_PATH']
-        else:
-            initial_dir = os.path.expanduser("~")
-
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes("-topmost", True)
-
-        file_path = filedialog.askopenfilename(
-            title="Select Preview image",
-            filetypes=[("Image Files", "*.jpg *.png *.gif")],
-            initialdir=initial_dir
-        )
-
-        root.destroy()
-
-        if file_path:
-            file_path = file_path.strip()
+        file_path = pick_file('preview')
 
         if not file_path:
             print(f"{RED}No image was selected.{RESET}")
@@ -359,9 +1013,6 @@ def get_preview():
         if not os.path.isfile(file_path):
             print(f"{RED}File not found: {file_path}{RESET}")
             continue
-        if os.path.getsize(file_path) > 1 * 1024 * 1024:
-            print(f"{RED}File too large (>1MB): {file_path}{RESET}")
-            continue
 
         filename = os.path.basename(file_path)
         if not filename:
@@ -371,6 +1022,12 @@ def get_preview():
         print(f"Selected image: {YELLOW}{filename}{RESET} ({file_path})")
 
         SETTINGS['DEFAULT_PREVIEW_PATH'] = os.path.dirname(file_path)
+        file_path, message = optimize_preview(file_path)
+        if not file_path:
+            print(f"{RED}{message}{RESET}")
+            continue
+        if message:
+            print(f"{YELLOW}{message}{RESET}")
         save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
 
         while True:
@@ -389,25 +1046,7 @@ def get_preview():
 
 
 def get_preview_file():
-    if SETTINGS.get('DEFAULT_PREVIEW_PATH'):
-        initial_dir = SETTINGS['DEFAULT_PREVIEW_PATH']
-    else:
-        initial_dir = os.path.expanduser("~")
-
-    root = tk.Tk()
-    root.withdraw()
-    root.attributes("-topmost", True)
-
-    file_path = filedialog.askopenfilename(
-        title="Select Preview image",
-        filetypes=[("Image Files", "*.jpg *.png *.gif")],
-        initialdir=initial_dir
-    )
-
-    root.destroy()
-
-    if file_path:
-        file_path = file_path.strip()
+    file_path = pick_file('preview')
 
     if not file_path:
         print(f"{RED}No image was selected.{RESET}")
@@ -418,9 +1057,6 @@ def get_preview_file():
     if not os.path.isfile(file_path):
         print(f"{RED}File not found: {file_path}{RESET}")
         return None
-    if os.path.getsize(file_path) > 1 * 1024 * 1024:
-        print(f"{RED}File too large (>1MB): {file_path}{RESET}")
-        return None
 
     filename = os.path.basename(file_path)
     if not filename:
@@ -430,6 +1066,13 @@ def get_preview_file():
     SETTINGS['DEFAULT_PREVIEW_PATH'] = os.path.dirname(file_path)
     save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
 
+    file_path, message = optimize_preview(file_path)
+    if not file_path:
+        print(f"{RED}{message}{RESET}")
+        return None
+    if message:
+        print(f"{YELLOW}{message}{RESET}")
+
     return file_path
 
 
@@ -453,6 +1096,369 @@ def get_workshop_id(mod_name):
         input("Press Enter to try again...")
 
 
+# -----------
+# Mod Catalog
+# -----------
+
+def mod_catalog():
+    """
+    Return the catalog indexes for MODS, rebuilt after invalidate_mod_catalog():
+    names in mods.txt order (O(1) selection by number), a sorted name list for prefix search,
+    and lookups by workshop ID and by tag.
+    """
+    if MOD_CATALOG['version'] is None:
+        by_id, by_tag = {}, {}
+        for name, wid in MODS.items():
+            if wid:
+                by_id.setdefault(wid, []).append(name)
+            for tag in MOD_TAGS.get(name, []):
+                by_tag.setdefault(tag.lower(), []).append(name)
+        MOD_CATALOG.update(
+            names=list(MODS.keys()),
+            sorted=sorted((name.lower(), name) for name in MODS),
+            by_id=by_id,
+            by_tag=by_tag,
+            version=len(MODS),
+        )
+    return MOD_CATALOG
+
+
+def invalidate_mod_catalog():
+    """Call after changing MODS or MOD_TAGS (save_mods_to_file and load_mods do)."""
+    MOD_CATALOG['version'] = None
+
+
+def prefix_search_mods(prefix):
+    entries = mod_catalog()['sorted']
+    prefix = prefix.lower()
+    start = bisect.bisect_left(entries, (prefix, ''))
+    matches = []
+    for lowered, name in entries[start:]:
+        if not lowered.startswith(prefix):
+            break
+        matches.append(name)
+    return matches
+
+
+def search_mods(query):
+    """
+    Search the catalog: 'id:<workshop id>', 'tag:<tag>', otherwise name prefix matches
+    followed by fuzzy name matches. Results keep mods.txt order within each group.
+    """
+    catalog = mod_catalog()
+    query = query.strip()
+    if not query:
+        return list(catalog['names'])
+    lowered = query.lower()
+    if lowered.startswith('id:'):
+        return list(catalog['by_id'].get(query[3:].strip(), []))
+    if lowered.startswith('tag:'):
+        return list(catalog['by_tag'].get(lowered[4:].strip(), []))
+    if query.isdigit() and query in catalog['by_id']:
+        return list(catalog['by_id'][query])
+
+    order = {name: i for i, name in enumerate(catalog['names'])}
+    prefix = sorted(prefix_search_mods(query), key=order.get)
+    seen = set(prefix)
+    fuzzy = [name for name in fuzzy_search(query, catalog['names'], limit=len(catalog['names'])) if name not in seen]
+    return prefix + fuzzy
+
+
+def print_mod_page(names, page):
+    """Print one page of numbered mods (numbers are positions in names). Returns the page count."""
+    pages = max(1, (len(names) + MOD_PAGE_SIZE - 1) // MOD_PAGE_SIZE)
+    start = page * MOD_PAGE_SIZE
+    for i in range(start, min(start + MOD_PAGE_SIZE, len(names))):
+        name = names[i]
+        tags = MOD_TAGS.get(name)
+        tag_display = f" ({', '.join(tags)})" if tags else ""
+        print(f"{i+1}) {name} [{MODS.get(name) or 'MISSING ID'}]{tag_display}")
+    if pages > 1:
+        print(f"\nPage {page + 1}/{pages} - {len(names)} mods")
+    return pages
+
+
+def paged_mod_menu(heading, prompt):
+    """
+    Paged mod picker with search. Returns the chosen mod name or None.
+    Commands: a number selects, N/P change page, text searches (prefix, fuzzy, id:, tag:), '*' clears the search.
+    """
+    names = mod_catalog()['names']
+    query, page = '', 0
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== {heading} ==={RESET}")
+        if query:
+            print(f"Search: {YELLOW}{query}{RESET} ({len(names)} found)\n")
+        if names:
+            pages = print_mod_page(names, page)
+        else:
+            pages = 1
+            print(f"{YELLOW}No mods match.{RESET}")
+        nav = []
+        if page + 1 < pages:
+            nav.append("N) Next page")
+        if page > 0:
+            nav.append("P) Previous page")
+        if query:
+            nav.append("*) Clear search")
+        if nav:
+            print("  ".join(nav))
+        print("Q) Go back\n")
+
+        choice = input(f"{prompt} (or type to search): ").strip()
+        upper = choice.upper()
+        if upper == 'Q':
+            clear_screen()
+            return None
+        if upper == 'N' and page + 1 < pages:
+            page += 1
+        elif upper == 'P' and page > 0:
+            page -= 1
+        elif choice == '*':
+            query, page, names = '', 0, mod_catalog()['names']
+        elif choice.isdigit() and 1 <= int(choice) <= len(names):
+            clear_screen()
+            return names[int(choice) - 1]
+        elif choice:
+            query, page = choice, 0
+            names = search_mods(query)
+
+
+# -------------
+# Mod Discovery
+# -------------
+
+def parse_key_value_file(path):
+    """Parse a Project Zomboid key=value file (workshop.txt, mod.info). Keys are lower-cased."""
+    values = {}
+    with open(path, 'r', encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                values.setdefault(key.strip().lower(), value.strip())
+    return values
+
+
+def find_mod_info_files(mods_dir):
+    """mod.info files of every mod in Contents/mods, including Build 42 version folders (mods/<id>/42/mod.info)."""
+    found = []
+    if not os.path.isdir(mods_dir):
+        return found
+    with os.scandir(mods_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            direct = os.path.join(entry.path, 'mod.info')
+            if os.path.isfile(direct):
+                found.append(direct)
+            with os.scandir(entry.path) as sub:
+                for version_dir in sub:
+                    nested = os.path.join(version_dir.path, 'mod.info')
+                    if version_dir.is_dir() and os.path.isfile(nested):
+                        found.append(nested)
+    return sorted(found)
+
+
+def path_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def mod_folder_signature(folder, info_files):
+    """Cheap change detection: mtimes of the folder, workshop.txt, Contents/mods and the known mod.info files."""
+    mods_dir = os.path.join(folder, 'Contents', 'mods')
+    paths = [folder, os.path.join(folder, 'workshop.txt'), os.path.join(folder, 'Contents'), mods_dir]
+    if os.path.isdir(mods_dir):
+        with os.scandir(mods_dir) as it:
+            paths.extend(entry.path for entry in it if entry.is_dir())
+    paths.extend(info_files)
+    return [[path, path_mtime(path)] for path in sorted(paths)]
+
+
+def read_mod_folder(folder):
+    """Read workshop.txt and every mod.info of one mod folder."""
+    info = {'workshop_id': '', 'title': '', 'tags': [], 'visibility': '', 'mods': [], 'errors': []}
+    workshop_file = os.path.join(folder, 'workshop.txt')
+    if os.path.isfile(workshop_file):
+        try:
+            workshop = parse_key_value_file(workshop_file)
+            wid = workshop.get('id', '').lstrip('+')
+            info['workshop_id'] = wid if wid.isdigit() else ''
+            info['title'] = workshop.get('title', '')
+            info['visibility'] = workshop.get('visibility', '')
+            info['tags'] = [tag.strip() for tag in workshop.get('tags', '').split(';') if tag.strip()]
+        except Exception as e:
+            info['errors'].append(f"workshop.txt: {e}")
+
+    info_files = find_mod_info_files(os.path.join(folder, 'Contents', 'mods'))
+    for path in info_files:
+        try:
+            values = parse_key_value_file(path)
+        except Exception as e:
+            info['errors'].append(f"{path}: {e}")
+            continue
+        if not values.get('id') or not values.get('name'):
+            info['errors'].append(f"{path}: missing id= or name=")
+        info['mods'].append({
+            'id': values.get('id', ''),
+            'name': values.get('name', ''),
+            'version': values.get('modversion') or values.get('version', ''),
+            'path': path,
+        })
+    return info, info_files
+
+
+def load_discovery_cache(base_path):
+    if not os.path.exists(DISCOVERY_FILE):
+        return {}
+    try:
+        with open(DISCOVERY_FILE, 'r', encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get('version') == DISCOVERY_VERSION and cache.get('base_path') == base_path:
+            return cache.get('mods', {})
+    except Exception:
+        pass
+    return {}
+
+
+def save_discovery_cache(base_path, mods):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = DISCOVERY_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump({'version': DISCOVERY_VERSION, 'base_path': base_path, 'mods': mods}, f, indent=1)
+        os.replace(tmp_path, DISCOVERY_FILE)
+    except Exception as e:
+        print(f"{RED}ERROR writing to {DISCOVERY_FILE}: {e}{RESET}")
+
+
+def discover_mods(base_path):
+    """
+    Scan base_path for mod folders (<mod>/Contents or <mod>/workshop.txt).
+    Folders whose signature matches the cache are not re-read.
+    Returns ({folder name: info}, number of folders read from disk).
+    """
+    resolved = os.path.expandvars(base_path)
+    if not os.path.isdir(resolved):
+        return {}, 0
+    cached = load_discovery_cache(resolved)
+    discovered, rescanned = {}, 0
+    with os.scandir(resolved) as it:
+        for entry in it:
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            if not (os.path.isdir(os.path.join(entry.path, 'Contents')) or os.path.isfile(os.path.join(entry.path, 'workshop.txt'))):
+                continue
+            previous = cached.get(entry.name)
+            if previous:
+                known_files = [mod['path'] for mod in previous['info']['mods']]
+                if previous['signature'] == mod_folder_signature(entry.path, known_files):
+                    discovered[entry.name] = previous
+                    continue
+            info, info_files = read_mod_folder(entry.path)
+            discovered[entry.name] = {'signature': mod_folder_signature(entry.path, info_files), 'info': info}
+            rescanned += 1
+    if rescanned or discovered.keys() != cached.keys():
+        save_discovery_cache(resolved, discovered)
+    return {name: entry['info'] for name, entry in discovered.items()}, rescanned
+
+
+def discover_ignore_list():
+    return [name.strip() for name in SETTINGS.get('DEFAULT_DISCOVER_IGNORE', '').split(',') if name.strip()]
+
+
+def ignore_discovered_mods(names):
+    """Add names to DEFAULT_DISCOVER_IGNORE so discovery stops offering them for mods.txt."""
+    ignored = discover_ignore_list()
+    SETTINGS['DEFAULT_DISCOVER_IGNORE'] = ",".join(ignored + [name for name in names if name not in ignored])
+    flush_settings()
+
+
+def discovered_mod_changes(discovered):
+    """
+    Compare discovery results with MODS / MOD_TAGS. mods.txt wins: existing IDs and tags are kept,
+    only new mods and missing IDs or tags are proposed. Mods in DEFAULT_DISCOVER_IGNORE are skipped.
+    Returns {name: [what would change]}.
+    """
+    ignored = set(discover_ignore_list())
+    changes = {}
+    for name in sorted(discovered, key=str.lower):
+        info = discovered[name]
+        if name in ignored:
+            continue
+        what = []
+        if name not in MODS:
+            what.append('new')
+        elif not MODS[name] and info['workshop_id']:
+            what.append('Workshop ID')
+        if info['tags'] and not MOD_TAGS.get(name):
+            what.append('tags')
+        if what:
+            changes[name] = what
+    return changes
+
+
+def merge_discovered_mods(discovered, names):
+    """Apply discovery results for the given names (see discovered_mod_changes) and save mods.txt."""
+    for name in names:
+        info = discovered[name]
+        if not MODS.get(name):
+            MODS[name] = info['workshop_id']
+        if info['tags'] and not MOD_TAGS.get(name):
+            MOD_TAGS[name] = list(info['tags'])
+    if names:
+        save_mods_to_file()
+    return list(names)
+
+
+def run_mod_discovery(base_path, verbose=False, interactive=True):
+    """
+    Scan the Workshop folder and offer the mods that mods.txt lacks (or lacks an ID or tags for).
+    mods.txt is only written after the user agrees; declined mods go to DEFAULT_DISCOVER_IGNORE.
+    Without interactive, the proposed changes are only listed. Returns (discovered, names written).
+    """
+    start = time.perf_counter()
+    discovered, rescanned = discover_mods(base_path)
+    MOD_INFO.update(discovered)
+    changes = discovered_mod_changes(discovered)
+    if verbose:
+        print(f"Found {YELLOW}{len(discovered)}{RESET} mod folders in {base_path} "
+              f"({rescanned} rescanned, {len(discovered) - rescanned} from cache) in {time.perf_counter() - start:.2f}s")
+        for name, info in discovered.items():
+            for error in info['errors']:
+                print(f"{RED}{name}: {error}{RESET}")
+    if not changes:
+        if verbose:
+            print(f"{GREEN}{MODS_FILE} is up to date.{RESET}")
+        return discovered, []
+
+    if not interactive:
+        print(f"{YELLOW}{len(changes)} mod folder(s) not fully in {MODS_FILE}: {', '.join(changes)} "
+              f"(Manage Mods -> Scan Workshop folder adds them, DEFAULT_DISCOVER_IGNORE hides them).{RESET}")
+        return discovered, []
+    print(f"{YELLOW}Mod folders in {base_path} that {MODS_FILE} does not fully list:{RESET}")
+    for name, what in changes.items():
+        print(f"  {YELLOW}{name}{RESET} [{discovered[name]['workshop_id'] or 'MISSING ID'}]: {', '.join(what)}")
+    while True:
+        choice = input(f"Update {MODS_FILE}? (y = yes, n = no and stop asking, Enter = ask again next time): ").strip().lower()
+        if choice == 'y':
+            changed = merge_discovered_mods(discovered, list(changes))
+            for name in changed:
+                print(f"Added/Updated: {YELLOW}{name}{RESET} [{MODS[name] or 'MISSING ID'}]")
+            return discovered, changed
+        if choice == 'n':
+            ignore_discovered_mods(list(changes))
+            print(f"{YELLOW}Added to DEFAULT_DISCOVER_IGNORE in {SETTINGS_FILE}.{RESET}")
+            return discovered, []
+        if not choice:
+            return discovered, []
+        print(f"{RED}Invalid input. Please enter y, n or nothing.{RESET}")
+
+
 # ------------------
 # Mod Selection Menu
 # ------------------
@@ -464,25 +1470,12 @@ def select_mod_from_menu():
         input("Press Enter to continue...")
         clear_screen()
         return None, None
+    mod_name = paged_mod_menu("SELECT MOD FOR UPLOAD", "Select Mod number")
+    if not mod_name:
+        return None, None
+    wid = get_workshop_id(mod_name)
     clear_screen()
-    print(f"{CYAN}=== SELECT MOD FOR UPLOAD ==={RESET}")
-    for i, name in enumerate(MODS.keys()):
-        mod_id_display = MODS[name] if MODS[name] else "MISSING ID"
-        print(f"{i+1}) {name} [{mod_id_display}]")
-    print("Q) Go back\n")
-    while True:
-        choice = input("Select Mod number: ").strip().upper()
-        if choice == 'Q':
-            clear_screen()
-            return None, None
-        if choice.isdigit():
-            idx = int(choice) - 1
-            if 0 <= idx < len(MODS):
-                mod_name = list(MODS.keys())[idx]
-                wid = get_workshop_id(mod_name)
-                clear_screen()
-                return wid, mod_name
-        print(f"{RED}Invalid choice.{RESET}")
+    return wid, mod_name
 
 
 # -------------------
@@ -499,167 +1492,2023 @@ def confirm_action(action_type):
 
 
 # ---------------
-# Execution Logic
+# Content Staging
 # ---------------
 
-def execute_upload(command_template, workshop_id, content_path=None, desc_path=None, title=None, visibility=None, tags=None, preview=None):
+def translate_ignore_pattern(pattern):
+    """Translate one gitignore-style glob into a regex body ('**' crosses folders, '*' does not)."""
+    parts, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            parts.append('[' + pattern[i + 1:end].replace('!', '^', 1) + ']')
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+
+def compile_ignore_rules(lines):
+    """Compile gitignore-style lines into (regex, negate, dir_only) rules. Later rules win."""
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if not line:
+            continue
+        body = translate_ignore_pattern(line)
+        regex = re.compile(('^' if anchored else '^(?:.*/)?') + body + '$')
+        rules.append((regex, negate, dir_only))
+    return rules
+
+
+def load_ignore_rules(content_path):
+    """Default rules plus the mod's own .uploadignore (next to its Contents folder)."""
+    lines = list(DEFAULT_IGNORE_PATTERNS)
+    ignore_file = os.path.join(os.path.dirname(content_path), IGNORE_FILE_NAME)
+    if os.path.isfile(ignore_file):
+        try:
+            with open(ignore_file, 'r', encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        except Exception as e:
+            print(f"{RED}ERROR reading {ignore_file}: {e}{RESET}")
+    return compile_ignore_rules(lines)
+
+
+def is_ignored(rel_path, is_dir, rules):
+    ignored = False
+    for regex, negate, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if regex.match(rel_path):
+            ignored = not negate
+    return ignored
+
+
+def clone_or_link(src, dst):
+    """Mirror a file with a hardlink, a copy-on-write clone or, as a last resort, a copy. Returns the method used."""
+    try:
+        os.link(src, dst)
+        return 'link'
+    except OSError:
+        pass
+    if sys.platform.startswith('linux'):
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return 'clone'
+        except (OSError, ImportError):
+            if os.path.exists(dst):
+                os.remove(dst)
+    shutil.copy2(src, dst)
+    return 'copy'
+
+
+def collect_staged_files(content_path, rules):
+    """Return ({relative_path: source_path}, ignored_count) for the files that should be uploaded."""
+    files, ignored = {}, 0
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(content_path, rel_dir)) as it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_ignored(rel, is_dir, rules):
+                    ignored += 1
+                elif is_dir:
+                    stack.append(rel)
+                elif entry.is_file():
+                    files[rel] = entry.path
+    return files, ignored
+
+
+def sync_staging_tree(content_path, staging_path, rules):
     """
-    Handles commands with placeholders:
-    Replaces {WORKSHOP_ID} with workshop_id
-    Replaces {CONTENT}, {DESC}, {TITLE}, {VISIBILITY}, {TAGS}, {PREVIEW} with given values or strips them out if not provided.
+    Bring staging_path in line with the filtered content tree.
+    Files already linked (same inode) or copied (same size and mtime) are left alone,
+    so repeated uploads only touch what changed.
     """
-    if not workshop_id:
-        return False, f"{RED}ERROR: missing Workshop ID{RESET}"
-
-    cmd = command_template.replace('{WORKSHOP_ID}', workshop_id)
-
-    resolved_content   = os.path.expandvars(content_path) if content_path else None
-    resolved_desc      = os.path.expandvars(desc_path) if desc_path else None
-    resolved_title     = title if title else None
-    resolved_visibility= visibility if visibility is not None else None
-    resolved_tags      = tags if tags else None
-    resolved_preview   = os.path.expandvars(preview) if preview else None
-
-    replacements = {
-        '{CONTENT}':    (resolved_content,   '-c {CONTENT}'),
-        '{DESC}':       (resolved_desc,      '-d {DESC}'),
-        '{TITLE}':      (resolved_title,     '-t {TITLE}'),
-        '{VISIBILITY}': (resolved_visibility,'-v {VISIBILITY}'),
-        '{TAGS}':       (resolved_tags,      '-T {TAGS}'),
-        '{PREVIEW}':    (resolved_preview,   '-p {PREVIEW}')
-    }
+    wanted, ignored = collect_staged_files(content_path, rules)
+    stats = {'files': len(wanted), 'ignored': ignored, 'link': 0, 'clone': 0, 'copy': 0, 'removed': 0}
+
+    for root, dirs, files in os.walk(staging_path, topdown=False):
+        for name in files:
+            dst = os.path.join(root, name)
+            rel = os.path.relpath(dst, staging_path).replace(os.sep, '/')
+            src = wanted.get(rel)
+            if src:
+                src_st, dst_st = os.stat(src), os.stat(dst)
+                if (src_st.st_ino, src_st.st_dev) == (dst_st.st_ino, dst_st.st_dev) and src_st.st_ino:
+                    continue
+                if src_st.st_size == dst_st.st_size and src_st.st_mtime_ns == dst_st.st_mtime_ns:
+                    continue
+            os.remove(dst)
+            stats['removed'] += 1
+        for name in dirs:
+            path = os.path.join(root, name)
+            if not os.listdir(path):
+                os.rmdir(path)
+
+    for rel, src in wanted.items():
+        dst = os.path.join(staging_path, *rel.split('/'))
+        if os.path.exists(dst):
+            continue
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        stats[clone_or_link(src, dst)] += 1
+    return stats
 
-    for placeholder, (value, flag_pattern) in replacements.items():
-        if placeholder in cmd:
-            if value == "__CLEAR__":
-                cmd = cmd.replace(placeholder, '""')
-            elif value:
-                cmd = cmd.replace(placeholder, f'"{value}"')
-            else:
-                cmd = cmd.replace(flag_pattern, '')
 
-    cmd = " ".join(cmd.split())
+def stage_content(content_path):
+    """
+    Build the filtered mirror of a mod's Contents folder in <mod>/.upload_staging/Contents.
+    Returns (path to upload, stats). Falls back to the original folder if staging fails.
+    """
+    resolved = os.path.expandvars(content_path)
+    if not os.path.isdir(resolved):
+        return content_path, None
+    staging_path = os.path.join(os.path.dirname(resolved), STAGING_DIR_NAME, os.path.basename(resolved))
+    try:
+        os.makedirs(staging_path, exist_ok=True)
+        return staging_path, sync_staging_tree(resolved, staging_path, load_ignore_rules(resolved))
+    except Exception as e:
+        print(f"{RED}ERROR staging {resolved}: {e}{RESET}")
+        return content_path, None
+
+
+# -----------------
+# Content Manifests
+# -----------------
+
+def manifest_path(workshop_id):
+    return os.path.join(MANIFESTS_DIR, f"{workshop_id}.json")
 
-    if '{' in cmd and '}' in cmd:
-        return False, f"{RED}ERROR: Unresolved placeholder in command{RESET}\nTemplate: {command_template}\nFinal: {cmd}"
 
+def load_manifest(workshop_id):
+    path = manifest_path(workshop_id)
+    if not os.path.exists(path):
+        return None
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            check=True,
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
-        )
-        out = result.stdout or ""
-        return True, f"{CYAN}[Command]{RESET}\n{cmd}\n\n{YELLOW}[Logs]{RESET}\n{out}"
-    except subprocess.CalledProcessError as e:
-        return False, (
-            f"{RED}Failed with code {e.returncode}{RESET}\n"
-            f"{CYAN}[Command]{RESET} {cmd}\n\n"
-            f"{YELLOW}[Logs]{RESET}\n{e.stdout or ''}"
-        )
-    except FileNotFoundError:
-        return False, f"{RED}ERROR: app.exe not found.{RESET}"
+        with open(path, 'r', encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"{RED}ERROR reading {path}: {e}{RESET}")
+        return None
 
 
-def show_execution_results(execution_logs, success, canceled=False):
-    if execution_logs:
-        print("\n".join(execution_logs))
-    if canceled:
-        print(f"{YELLOW}=== ACTION CANCELED ==={RESET}")
-    elif success:
-        save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
-        print(f"{GREEN}=== ACTION COMPLETE ==={RESET}")
-    else:
-        print(f"{RED}=== ACTION FAILED ==={RESET}")
-    input("Press Enter to continue...")
-    clear_screen()
+def save_manifest(workshop_id, manifest):
+    path = manifest_path(workshop_id)
+    try:
+        os.makedirs(MANIFESTS_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"{RED}ERROR writing to {path}: {e}{RESET}")
 
 
-# --------------
-# Mod Management
-# --------------
+def hash_file(path, size):
+    """Hash a file with BLAKE2b. Large files are read through mmap, smaller ones in chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        if size >= MMAP_HASH_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
 
-def add_mod():
-    while True:
-        clear_screen()
-        print(f"{CYAN}=== ADD / UPDATE MOD ==={RESET}")
-        mod_name = input("Enter Mod name: ").strip()
-        if not mod_name:
-            clear_screen()
-            print(f"{RED}Mod name cannot be empty.{RESET}")
-            input("Press Enter to try again...")
-            clear_screen()
-            continue
-        while True:
-            clear_screen()
-            mod_id = input(f"Enter Workshop ID for {YELLOW}{mod_name}{RESET} (or blank to clear): ").strip()
-            if not mod_id:
-                break
-            if mod_id.isdigit():
-                break
-            print(f"{RED}Workshop ID must be a numeric value or blank.{RESET}")
-            input("Press Enter to try again...")
-        clear_screen()
-        print(f"Added/Updated mod: {YELLOW}{mod_name}{RESET} with ID ({YELLOW}{mod_id or 'MISSING ID'}{RESET})")
-        update_mods_file(mod_name, mod_id)
-        input("Press Enter to continue...")
-        clear_screen()
-        return
 
+def scan_content_tree(content_path, rules=None):
+    """
+    Return {relative_path: (absolute_path, size, mtime_ns)} for every file under content_path,
+    leaving out what the ignore rules (see load_ignore_rules) exclude when they are given.
+    """
+    files = {}
+    stack = [content_path]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                rel = os.path.relpath(entry.path, content_path).replace(os.sep, '/')
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if rules and is_ignored(rel, is_dir, rules):
+                    continue
+                if is_dir:
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    st = entry.stat()
+                    files[rel] = (entry.path, st.st_size, st.st_mtime_ns)
+    return files
 
-def remove_mod():
-    if not MODS:
-        print(f"{YELLOW}No mods to remove.{RESET}")
-        input("Press Enter to continue...")
+
+def build_content_manifest(content_path, previous=None, rules=None):
+    """
+    Build a manifest (relative path, size, mtime, hash) for a content tree, filtered by rules if given.
+    Files whose size and mtime match an entry in a previous manifest reuse its hash,
+    everything else is hashed in parallel (hashlib releases the GIL on large buffers).
+    """
+    scanned_at = time.time_ns()
+    known = {}
+    for old in (previous, CONTENT_SCANS.get(content_path)):
+        if not old:
+            continue
+        trusted_before = old.get('scanned_at', 0) - MTIME_SAFETY_NS
+        for rel, entry in old.get('files', {}).items():
+            if entry['mtime_ns'] < trusted_before:
+                known[rel] = entry
+
+    entries, to_hash = {}, []
+    for rel, (path, size, mtime_ns) in scan_content_tree(content_path, rules).items():
+        old = known.get(rel)
+        if old and old['size'] == size and old['mtime_ns'] == mtime_ns:
+            entries[rel] = {'size': size, 'mtime_ns': mtime_ns, 'hash': old['hash']}
+        else:
+            entries[rel] = {'size': size, 'mtime_ns': mtime_ns, 'hash': None}
+            to_hash.append((rel, path, size))
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+            hashes = pool.map(lambda item: hash_file(item[1], item[2]), to_hash)
+            for (rel, _, _), digest in zip(to_hash, hashes):
+                entries[rel]['hash'] = digest
+
+    manifest = {'version': 1, 'content_path': content_path, 'scanned_at': scanned_at, 'files': entries}
+    CONTENT_SCANS[content_path] = manifest
+    return manifest
+
+
+def manifests_match(old, new):
+    if not old or old.get('version') != new.get('version'):
+        return False
+    old_files, new_files = old.get('files', {}), new['files']
+    if old_files.keys() != new_files.keys():
+        return False
+    return all(
+        old_files[rel]['size'] == entry['size'] and old_files[rel]['hash'] == entry['hash']
+        for rel, entry in new_files.items()
+    )
+
+
+def check_content_changes(workshop_id, content_path, rules=None):
+    """
+    Compare a content tree against the manifest stored after its last successful upload.
+    Passing the ignore rules checks an unstaged Contents folder the way stage_content would filter it.
+    Returns (changed, manifest). A missing folder counts as changed so the uploader reports it.
+    """
+    resolved = os.path.expandvars(content_path)
+    if not os.path.isdir(resolved):
+        return True, None
+    previous = load_manifest(workshop_id)
+    manifest = build_content_manifest(resolved, previous, rules)
+    return not manifests_match(previous, manifest), manifest
+
+
+# --------------
+# Metadata State
+# --------------
+
+# execute_upload keyword -> (flag, label) of the metadata fields remembered per Workshop ID
+METADATA_FIELDS = {
+    'desc_path': ('-d', 'description'),
+    'title': ('-t', 'title'),
+    'visibility': ('-v', 'visibility'),
+    'tags': ('-T', 'tags'),
+    'preview': ('-p', 'preview'),
+}
+
+
+def metadata_path(workshop_id):
+    return os.path.join(METADATA_DIR, f"{workshop_id}.json")
+
+
+def load_metadata_state(workshop_id):
+    """Fingerprints of the metadata last pushed successfully for a Workshop ID ({} if unknown)."""
+    path = metadata_path(workshop_id)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"{RED}ERROR reading {path}: {e}{RESET}")
+        return {}
+
+
+def save_metadata_state(workshop_id, fingerprints):
+    """Merge freshly pushed fingerprints into the stored state of a Workshop ID."""
+    if not fingerprints:
+        return
+    path = metadata_path(workshop_id)
+    state = load_metadata_state(workshop_id)
+    state.update(fingerprints)
+    try:
+        os.makedirs(METADATA_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"{RED}ERROR writing to {path}: {e}{RESET}")
+
+
+def metadata_fingerprint(key, value):
+    """Title, tags and visibility are stored as sent; description and preview files by content hash."""
+    if value == "__CLEAR__" or key not in ('desc_path', 'preview'):
+        return str(value)
+    path = os.path.expandvars(value)
+    try:
+        return 'blake2b:' + hash_file(path, os.path.getsize(path))
+    except OSError:
+        return None
+
+
+def changed_metadata(workshop_id, fingerprints):
+    """
+    Split metadata fingerprints ({keyword: fingerprint}) into those that differ from the last
+    successful push and those that are unchanged. Returns (changed fingerprints, unchanged keywords).
+    """
+    pushed = load_metadata_state(workshop_id)
+    changed, unchanged = {}, []
+    for key, fingerprint in fingerprints.items():
+        if fingerprint is not None and pushed.get(key) == fingerprint:
+            unchanged.append(key)
+        else:
+            changed[key] = fingerprint
+    return changed, unchanged
+
+
+# ---------------------
+# Description Templates
+# ---------------------
+
+def is_description_template(path):
+    return bool(path) and path.lower().endswith(DESCRIPTION_TEMPLATE_EXT)
+
+
+def find_description_template(mod_name):
+    """The template of a mod in DEFAULT_DESCRIPTION_PATH (see DESCRIPTION_TEMPLATE_NAMES), or None."""
+    folder = os.path.expandvars(SETTINGS.get('DEFAULT_DESCRIPTION_PATH') or '.')
+    for name in DESCRIPTION_TEMPLATE_NAMES:
+        path = os.path.join(folder, name.format(mod=mod_name))
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def description_variables(mod_name, workshop_id, base_path=None):
+    """Template variables of a mod, read from its workshop.txt and mod.info files."""
+    base_path = os.path.expandvars(base_path or SETTINGS.get('DEFAULT_BASE_PATH') or '')
+    folder = os.path.join(base_path, mod_name)
+    info = read_mod_folder(folder)[0] if base_path and os.path.isdir(folder) else {'title': '', 'mods': []}
+    mods = info['mods']
+    return {
+        'mod_name': mod_name,
+        'workshop_id': workshop_id or '',
+        'title': info['title'] or (mods[0]['name'] if mods else mod_name),
+        'version': next((mod['version'] for mod in mods if mod['version']), ''),
+        'mod_id': mods[0]['id'] if mods else '',
+        'mod_ids': ", ".join(mod['id'] for mod in mods if mod['id']),
+    }
+
+
+def render_template_file(path, variables, deps, stack=()):
+    """
+    Render one template or partial. {{name}} is replaced by a variable, {{> file}} by the rendered
+    file (relative to the including file, one trailing newline dropped). Every file read is added
+    to deps as {path: {'size', 'mtime_ns', 'hash'}}. Raises ValueError on unknown variables,
+    missing partials and include cycles.
+    """
+    path = os.path.abspath(path)
+    if path in stack:
+        raise ValueError(f"Include cycle: {' -> '.join(os.path.basename(item) for item in stack + (path,))}")
+    if len(stack) >= DESCRIPTION_MAX_INCLUDE_DEPTH:
+        raise ValueError(f"Includes nested deeper than {DESCRIPTION_MAX_INCLUDE_DEPTH} levels at {path}")
+    try:
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(f"Not valid UTF-8: {path}")
+    except OSError:
+        raise ValueError(f"Template not found: {path}" if not stack else f"Partial not found: {path} (included from {stack[-1]})")
+    deps[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': hashlib.blake2b(data, digest_size=20).hexdigest()}
+
+    def replace(match):
+        include, name = match.group(1), match.group(2)
+        if include:
+            rendered = render_template_file(os.path.join(os.path.dirname(path), name), variables, deps, stack + (path,))
+            return rendered[:-1] if rendered.endswith('\n') else rendered
+        if name not in variables:
+            raise ValueError(f"Unknown variable {{{{{name}}}}} in {path} (known: {', '.join(sorted(variables))})")
+        return str(variables[name])
+
+    return DESCRIPTION_TAG.sub(replace, text)
+
+
+def description_input_hash(variables, deps):
+    payload = json.dumps({
+        'version': DESCRIPTION_RENDER_VERSION,
+        'vars': variables,
+        'deps': sorted((path, dep['hash']) for path, dep in deps.items()),
+    }, sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+
+def load_description_state():
+    if DESCRIPTIONS['state'] is None:
+        state = {}
+        if os.path.exists(DESCRIPTIONS_STATE_FILE):
+            try:
+                with open(DESCRIPTIONS_STATE_FILE, 'r', encoding="utf-8") as f:
+                    state = json.load(f)
+            except Exception as e:
+                print(f"{RED}ERROR reading {DESCRIPTIONS_STATE_FILE}: {e}{RESET}")
+        DESCRIPTIONS['state'] = state
+    return DESCRIPTIONS['state']
+
+
+def deps_unchanged(deps, rehash=False):
+    """True if every dependency still has its recorded size and mtime (rehash: its recorded content hash)."""
+    for path, dep in deps.items():
+        try:
+            st = os.stat(path)
+            if rehash:
+                with open(path, 'rb') as f:
+                    if hashlib.blake2b(f.read(), digest_size=20).hexdigest() != dep['hash']:
+                        return False
+                dep.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            elif (st.st_size, st.st_mtime_ns) != (dep['size'], dep['mtime_ns']):
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def render_description(template_path, mod_name, workshop_id, base_path=None):
+    """
+    Render a description template for one mod into DESCRIPTIONS_DIR, named by the hash of its inputs
+    (template, partials and variables). Nothing is re-rendered while the files it read are untouched and
+    the variables are the same; touched but identical files only cost a re-hash.
+    Returns {'path', 'status' (cached, reused or rendered), 'length', 'error'}; the error is also set
+    when the result is longer than Steam allows (DESCRIPTION_MAX_LENGTH).
+    """
+    template_path = os.path.abspath(os.path.expandvars(template_path))
+    key = f"{mod_name}|{template_path}"
+    variables = description_variables(mod_name, workshop_id, base_path)
+    result = {'path': None, 'status': 'cached', 'length': None, 'error': None}
+
+    with DESCRIPTIONS['lock']:
+        state = load_description_state()
+        entry = state.get(key)
+        reusable = entry and entry['vars'] == variables and os.path.isfile(entry['output'])
+        if reusable and deps_unchanged(entry['deps']):
+            pass
+        elif reusable and deps_unchanged(entry['deps'], rehash=True):
+            result['status'] = 'reused'
+        else:
+            deps = {}
+            try:
+                text = render_template_file(template_path, variables, deps)
+            except ValueError as e:
+                result['error'] = str(e)
+                return result
+            input_hash = description_input_hash(variables, deps)
+            ext = os.path.splitext(template_path[:-len(DESCRIPTION_TEMPLATE_EXT)])[1] or '.txt'
+            output = os.path.abspath(os.path.join(DESCRIPTIONS_DIR, input_hash + ext))
+            if not os.path.isfile(output):
+                os.makedirs(DESCRIPTIONS_DIR, exist_ok=True)
+                write_file_atomic(output, text)
+            entry = {'vars': variables, 'deps': deps, 'input_hash': input_hash, 'output': output, 'length': len(text)}
+            state[key] = entry
+            result['status'] = 'rendered'
+        if result['status'] != 'cached':
+            try:
+                os.makedirs(DESCRIPTIONS_DIR, exist_ok=True)
+                write_file_atomic(DESCRIPTIONS_STATE_FILE, json.dumps(state, indent=1, sort_keys=True))
+            except OSError as e:
+                print(f"{RED}ERROR writing to {DESCRIPTIONS_STATE_FILE}: {e}{RESET}")
+
+    result['path'], result['length'] = entry['output'], entry['length']
+    if entry['length'] > DESCRIPTION_MAX_LENGTH:
+        result['error'] = f"Rendered description is {entry['length']} characters (Steam limit {DESCRIPTION_MAX_LENGTH})"
+    return result
+
+
+# --------
+# Job Logs
+# --------
+
+def job_log_path(name):
+    safe = re.sub(r'[^\w.-]+', '_', str(name)).strip('._') or 'upload'
+    return os.path.join(LOGS_DIR, f"{safe}.log")
+
+
+def rotate_job_log(path):
+    """<mod>.log -> <mod>.log.1 -> ... -> <mod>.log.LOG_BACKUPS (the oldest is dropped)."""
+    for i in range(LOG_BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    if os.path.exists(path):
+        os.replace(path, f"{path}.1")
+
+
+def open_job_log(name):
+    """Open the log file of a job for appending. Returns None if it cannot be written (uploads go on without it)."""
+    path = job_log_path(name)
+    try:
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size >= LOG_MAX_BYTES:
+            rotate_job_log(path)
+            size = 0
+        return {'path': path, 'file': open(path, 'a', encoding="utf-8", errors='replace'), 'size': size}
+    except OSError as e:
+        print(f"{RED}ERROR opening log {path}: {e}{RESET}")
+        return None
+
+
+def write_job_log(log, text):
+    """Append to a job log, rotating it when it would grow past LOG_MAX_BYTES."""
+    if not log:
+        return
+    try:
+        if log['size'] and log['size'] + len(text) > LOG_MAX_BYTES:
+            log['file'].close()
+            rotate_job_log(log['path'])
+            log['file'] = open(log['path'], 'a', encoding="utf-8", errors='replace')
+            log['size'] = 0
+        log['file'].write(text)
+        log['size'] += len(text)
+    except (OSError, ValueError):
+        pass
+
+
+def close_job_log(log):
+    if log:
+        try:
+            log['file'].close()
+        except OSError:
+            pass
+
+
+def format_output_tail(lines, total, log):
+    """Join the kept output lines, noting how many earlier lines only the log file has."""
+    text = "\n".join(lines)
+    if total > len(lines):
+        where = f" in {log['path']}" if log else ""
+        text = f"{YELLOW}... {total - len(lines)} earlier lines{where}{RESET}\n" + text
+    return text
+
+
+# ----------------
+# Execution Engine
+# ----------------
+
+def engine_loop():
+    """The shared asyncio event loop that runs every uploader process; started on first use in a daemon thread."""
+    import asyncio
+    with ENGINE['lock']:
+        if ENGINE['loop'] is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='upload-engine', daemon=True)
+            thread.start()
+            ENGINE['loop'], ENGINE['thread'] = loop, thread
+        return ENGINE['loop']
+
+
+def setting_seconds(key):
+    try:
+        return max(0.0, float(SETTINGS.get(key) or 0))
+    except ValueError:
+        return 0.0
+
+
+def wait_on_engine(coro, cancel_event):
+    """
+    Run a coroutine on the execution engine and wait for its result from this thread.
+    Ctrl+C sets cancel_event (and wakes calls waiting for an upload slot) instead of abandoning the coroutine.
+    """
+    import asyncio
+    future = asyncio.run_coroutine_threadsafe(coro, engine_loop())
+    while True:
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            cancel_event.set()
+            wake_upload_waiters()
+
+
+async def stop_process(process):
+    """Terminate a process, and kill it if it is still alive KILL_GRACE seconds later."""
+    import asyncio
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), KILL_GRACE)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+async def stream_command_async(cmd, on_event=None, timings=None, timeout=None, stall_timeout=None, cancel_event=None, on_line=None):
+    """
+    Run an argv list with asyncio.create_subprocess_exec and read stdout and stderr as they arrive
+    (lines end at \\n or \\r, so progress updates are seen immediately). Each line is parsed into an
+    event and passed to on_event. A watchdog stops the process when it runs longer than timeout, prints
+    nothing for stall_timeout seconds or cancel_event (a threading.Event) is set.
+    Every line also goes to on_line(stream, line), e.g. a job log; only the last OUTPUT_TAIL_LINES lines and
+    events are kept in memory, timings receives the total line counts ('stdout_lines', 'stderr_lines').
+    Returns (returncode, stdout_lines, stderr_lines, events, stopped); stopped is None or a STOP_REASONS key.
+    """
+    import asyncio
+    stdout_lines, stderr_lines = deque(maxlen=OUTPUT_TAIL_LINES), deque(maxlen=OUTPUT_TAIL_LINES)
+    events = deque(maxlen=OUTPUT_TAIL_LINES)
+    state = {'phase': None, 'last_output': time.monotonic()}
+    timings = timings if timings is not None else {}
+    encoding = locale.getpreferredencoding(False)
+    start = time.perf_counter()
+
+    def handle(raw, stream, target):
+        line = raw.decode(encoding, errors='replace')
+        state['last_output'] = time.monotonic()
+        if 'first_output' not in timings:
+            timings['first_output'] = time.perf_counter() - start
+        timings[f"{stream}_lines"] = timings.get(f"{stream}_lines", 0) + 1
+        target.append(line)
+        if on_line:
+            on_line(stream, line)
+        event = parse_output_line(line, stream, state['phase'])
+        state['phase'] = event['phase']
+        events.append(event)
+        if on_event:
+            on_event(event)
+
+    async def pump(reader, stream, target):
+        buffer = b''
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            # A trailing \r may be the first half of \r\n, keep it for the next chunk
+            held = b'\r' if buffer.endswith(b'\r') else b''
+            lines = OUTPUT_SPLIT.split(buffer[:-1] if held else buffer)
+            buffer = lines.pop() + held
+            for line in lines:
+                handle(line, stream, target)
+        if buffer.rstrip(b'\r'):
+            handle(buffer.rstrip(b'\r'), stream, target)
+
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    timings['spawn'] = time.perf_counter() - start
+    readers = asyncio.gather(pump(process.stdout, 'stdout', stdout_lines), pump(process.stderr, 'stderr', stderr_lines))
+
+    stopped = None
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(asyncio.shield(readers), ENGINE_POLL)
+                break
+            except asyncio.TimeoutError:
+                pass
+            if cancel_event is not None and cancel_event.is_set():
+                stopped = 'canceled'
+            elif timeout and time.perf_counter() - start > timeout:
+                stopped = 'timeout'
+            elif stall_timeout and time.monotonic() - state['last_output'] > stall_timeout:
+                stopped = 'stalled'
+            if stopped:
+                await stop_process(process)
+                try:
+                    await asyncio.wait_for(readers, KILL_GRACE)
+                except asyncio.TimeoutError:
+                    readers.cancel()
+                break
+        returncode = await process.wait()
+    except asyncio.CancelledError:
+        await stop_process(process)
+        readers.cancel()
+        raise
+    return returncode, stdout_lines, stderr_lines, events, stopped
+
+
+# ----------------
+# Output Streaming
+# ----------------
+
+def parse_output_line(line, stream='stdout', phase=None):
+    """Turn one line of SteamUploader output into a structured event."""
+    event = {
+        'stream': stream,
+        'line': line,
+        'phase': phase,
+        'percent': None,
+        'item_id': None,
+        'error_code': None,
+        'bytes_done': None,
+        'bytes_total': None,
+    }
+    lowered = line.lower()
+    for name, keywords in PHASE_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            event['phase'] = name
+            break
+
+    match = PROGRESS_PATTERNS['bytes'].search(line)
+    if match:
+        done, total = int(match.group(1)), int(match.group(2))
+        event['bytes_done'], event['bytes_total'] = done, total
+        if total:
+            event['percent'] = min(100.0, done * 100.0 / total)
+    match = PROGRESS_PATTERNS['percent'].search(line)
+    if match and event['percent'] is None:
+        event['percent'] = min(100.0, float(match.group(1)))
+    match = PROGRESS_PATTERNS['item_id'].search(line)
+    if match:
+        event['item_id'] = match.group(1)
+    match = PROGRESS_PATTERNS['error_code'].search(line)
+    if match and event['phase'] == 'error':
+        event['error_code'] = match.group(1)
+    return event
+
+
+def stream_command(cmd, on_event=None, timings=None, timeout=None, stall_timeout=None, cancel_event=None, on_line=None):
+    """
+    Run a command (an argv list, started without a shell) on the execution engine and wait for it.
+    See stream_command_async for the arguments. on_event is called from the engine thread.
+    If a timings dict is given it receives 'spawn' (seconds to start the process) and
+    'first_output' (seconds until the first line).
+    Ctrl+C stops only this process; the call then returns with stopped == 'canceled'.
+    Returns (returncode, stdout_lines, stderr_lines, events, stopped).
+    """
+    cancel_event = cancel_event if cancel_event is not None else threading.Event()
+    result = wait_on_engine(stream_command_async(cmd, on_event, timings, timeout, stall_timeout, cancel_event, on_line), cancel_event)
+    # Ctrl+C also reaches the uploader itself, which may exit before the watchdog stops it
+    if cancel_event.is_set() and result[4] is None and result[0] != 0:
+        result = result[:4] + ('canceled',)
+    return result
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f"{int(size)} B"
+    for unit in ('KB', 'MB', 'GB'):
+        size /= 1024.0
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}"
+
+
+def make_progress_printer():
+    """
+    Return an on_event callback that echoes output lines and keeps a live progress bar
+    (percent, bytes sent and bytes/second) on the last console line.
+    When stdout is not a terminal (CI logs, pipes) lines are echoed as they are.
+    """
+    state = {'start': time.perf_counter(), 'total': None, 'bar': ''}
+    live = sys.stdout.isatty()
+
+    def render(event):
+        percent = event['percent']
+        filled = int(PROGRESS_BAR_WIDTH * percent / 100)
+        bar = f"[{'#' * filled}{'.' * (PROGRESS_BAR_WIDTH - filled)}] {percent:5.1f}%"
+        total = event['bytes_total'] or state['total']
+        if total:
+            done = event['bytes_done'] if event['bytes_done'] is not None else total * percent / 100
+            elapsed = max(time.perf_counter() - state['start'], 1e-6)
+            bar += f"  {format_bytes(done)} / {format_bytes(total)}  {format_bytes(done / elapsed)}/s"
+        if event['phase']:
+            bar += f"  ({event['phase']})"
+        return bar
+
+    def on_event(event):
+        if event.get('content_bytes') is not None:
+            state['total'] = event['content_bytes']
+            return
+        if event.get('waiting'):
+            sys.stdout.write(f"{YELLOW}{event['waiting']}{RESET}\n")
+            return
+        if not live:
+            sys.stdout.write(event['line'] + "\n")
+        elif event['percent'] is not None:
+            state['bar'] = render(event)
+            sys.stdout.write(f"\r\033[K{CYAN}{state['bar']}{RESET}")
+        else:
+            color = RED if event['stream'] == 'stderr' else ''
+            sys.stdout.write(f"\r\033[K{color}{event['line']}{RESET if color else ''}\n")
+            if state['bar']:
+                sys.stdout.write(f"{CYAN}{state['bar']}{RESET}")
+        sys.stdout.flush()
+
+    return on_event
+
+
+def execute_upload_live(command_template, workshop_id, **kwargs):
+    """Pre-flight check, then run execute_upload with live console output and clear it for the results screen."""
+    report = preflight_job({'mod_name': SETTINGS.get('DEFAULT_MOD_NAME', ''), 'workshop_id': workshop_id,
+                            'template': command_template, 'kwargs': kwargs})
+    if report['errors']:
         clear_screen()
+        return False, format_preflight_errors(report)
+    clear_screen()
+    print(f"{CYAN}=== UPLOADING ==={RESET}")
+    result = execute_upload(command_template, workshop_id, on_event=make_progress_printer(), **kwargs)
+    print()
+    clear_screen()
+    return result
+
+
+# -----------------
+# Pre-flight Checks
+# -----------------
+
+def walk_content_stats(content_path):
+    """Count files and bytes under content_path without keeping the file list (only pending folders are held)."""
+    files, total = 0, 0
+    stack = [content_path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    files += 1
+                    total += entry.stat().st_size
+    return files, total
+
+
+def check_content(job, report):
+    content_path = os.path.expandvars(job['kwargs']['content_path'])
+    if not os.path.isdir(content_path):
+        report['errors'].append(f"Content folder not found: {content_path}")
+        return
+    try:
+        files, total = walk_content_stats(content_path)
+    except OSError as e:
+        report['errors'].append(f"Cannot read content folder: {e}")
+        return
+    report['content_files'], report['content_bytes'] = files, total
+    if not files:
+        report['errors'].append(f"Content folder is empty: {content_path}")
+    info = MOD_INFO.get(job['mod_name'])
+    if info:
+        report['errors'].extend(f"Broken mod.info - {error}" for error in info['errors'])
+        if not info['mods']:
+            report['warnings'].append("No mod.info found under Contents/mods")
+
+
+def check_description(desc_path, report):
+    desc_path = os.path.expandvars(desc_path)
+    if not os.path.isfile(desc_path):
+        report['errors'].append(f"Description file not found: {desc_path}")
+        return
+    try:
+        with open(desc_path, 'r', encoding="utf-8") as f:
+            text = f.read()
+    except UnicodeDecodeError:
+        report['errors'].append(f"Description is not valid UTF-8: {desc_path}")
+        return
+    except OSError as e:
+        report['errors'].append(f"Cannot read description: {e}")
+        return
+    if not text.strip():
+        report['errors'].append(f"Description file is empty: {desc_path}")
+    elif len(text) > DESCRIPTION_MAX_LENGTH:
+        report['errors'].append(f"Description is {len(text)} characters (Steam limit {DESCRIPTION_MAX_LENGTH})")
+
+
+def check_preview(preview_path, report):
+    preview_path = os.path.expandvars(preview_path)
+    if not os.path.isfile(preview_path):
+        report['errors'].append(f"Preview image not found: {preview_path}")
+        return
+    ext = os.path.splitext(preview_path)[1].lower()
+    if ext not in IMAGE_SIGNATURES:
+        report['errors'].append(f"Preview must be .jpg, .png or .gif: {preview_path}")
+        return
+    size = os.path.getsize(preview_path)
+    if size > PREVIEW_MAX_BYTES:
+        report['errors'].append(f"Preview is {format_bytes(size)} (limit {format_bytes(PREVIEW_MAX_BYTES)})")
+    with open(preview_path, 'rb') as f:
+        header = f.read(8)
+    if not header.startswith(IMAGE_SIGNATURES[ext]):
+        report['errors'].append(f"Preview content does not match its {ext} extension")
+
+
+def preflight_job(job):
+    """
+    Check one upload job without launching anything: Workshop ID, template, content tree,
+    description, preview and title. Returns a report with errors, warnings and content stats.
+    """
+    start = time.perf_counter()
+    report = {'errors': [], 'warnings': [], 'content_files': None, 'content_bytes': None}
+    kwargs = job['kwargs']
+    wid = job['workshop_id']
+    if not wid:
+        report['errors'].append("Missing Workshop ID")
+    elif not str(wid).isdigit():
+        report['errors'].append(f"Workshop ID must be numeric: {wid}")
+
+    if job['template'] is None:
+        report['errors'].append(f"No combined template available in {COMMANDS_FILE}")
+    else:
+        values = {key: value for key, value in kwargs.items() if key not in EXECUTION_OPTIONS}
+        try:
+            # Fill the template the way execute_upload will, so a command that cannot be built fails here
+            build_command(job['template'], str(wid or '0'), **values)
+            unresolved = compile_command_template(job['template'])['unresolved']
+        except Exception as e:
+            report['errors'].append(f"Cannot build the command from template {job['template']}: {e}")
+            unresolved = []
+        if unresolved:
+            report['errors'].append(f"Unresolved placeholder(s) {', '.join(unresolved)} in template: {job['template']}")
+
+    try:
+        if kwargs.get('content_path'):
+            check_content(job, report)
+        desc_path = kwargs.get('desc_path')
+        if is_description_template(desc_path):
+            rendered = render_description(desc_path, job['mod_name'], wid)
+            desc_path = None if rendered['error'] else rendered['path']
+            if rendered['error']:
+                report['errors'].append(rendered['error'])
+        if desc_path:
+            check_description(desc_path, report)
+        if kwargs.get('preview'):
+            check_preview(kwargs['preview'], report)
+    except Exception as e:
+        report['errors'].append(f"Pre-flight check failed: {e}")
+    if 'title' in kwargs:
+        title = kwargs['title'] or ''
+        if not title.strip():
+            report['errors'].append("Title is empty")
+        elif len(title) > TITLE_MAX_LENGTH:
+            report['errors'].append(f"Title is {len(title)} characters (Steam limit {TITLE_MAX_LENGTH})")
+
+    report['elapsed'] = time.perf_counter() - start
+    return report
+
+
+def preflight_jobs(jobs, max_workers=None):
+    """Run preflight_job for every job in parallel. Returns the reports in job order."""
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 4) * 2)) as pool:
+        return list(pool.map(preflight_job, jobs))
+
+
+def format_preflight_errors(report):
+    lines = [f"{RED}Pre-flight check failed, upload not started:{RESET}"]
+    lines.extend(f"{RED} - {error}{RESET}" for error in report['errors'])
+    lines.extend(f"{YELLOW} - {warning}{RESET}" for warning in report['warnings'])
+    return "\n".join(lines)
+
+
+# ---------------
+# Instrumentation
+# ---------------
+
+def upload_fields(content_path=None, desc_path=None, title=None, visibility=None, tags=None, preview=None):
+    fields = []
+    for name, value in (('content', content_path), ('description', desc_path), ('title', title),
+                        ('visibility', visibility), ('tags', tags), ('preview', preview)):
+        if value is not None and value != '':
+            fields.append(name)
+    return fields
+
+
+def metrics_dir():
+    return os.path.expandvars(SETTINGS.get('DEFAULT_METRICS_DIR') or os.path.join(CACHE_DIR, 'metrics'))
+
+
+def load_metrics_state():
+    if not METRICS_STATE:
+        state = {'uploads': {}, 'duration': {}, 'spawn': {'sum': 0.0, 'count': 0}, 'retries': {}, 'last': {}}
+        if os.path.exists(METRICS_STATE_FILE):
+            try:
+                with open(METRICS_STATE_FILE, 'r', encoding="utf-8") as f:
+                    state.update(json.load(f))
+            except Exception:
+                pass
+        METRICS_STATE.update(state)
+    return METRICS_STATE
+
+
+def prom_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prom_labels(**labels):
+    return "{" + ",".join(f'{key}="{prom_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(state):
+    lines = [
+        "# HELP steam_uploader_uploads_total SteamUploader invocations by mod, operation and status.",
+        "# TYPE steam_uploader_uploads_total counter",
+    ]
+    for key, count in sorted(state['uploads'].items()):
+        mod, operation, status = key.split('|')
+        lines.append(f"steam_uploader_uploads_total{prom_labels(mod=mod, operation=operation, status=status)} {count}")
+
+    lines += [
+        "# HELP steam_uploader_upload_duration_seconds Wall time of upload calls that launched SteamUploader.",
+        "# TYPE steam_uploader_upload_duration_seconds histogram",
+    ]
+    for operation, hist in sorted(state['duration'].items()):
+        for bound, count in zip(DURATION_BUCKETS, hist['buckets']):
+            lines.append(f"steam_uploader_upload_duration_seconds_bucket{prom_labels(operation=operation, le=bound)} {count}")
+        lines.append(f"steam_uploader_upload_duration_seconds_bucket{prom_labels(operation=operation, le='+Inf')} {hist['count']}")
+        lines.append(f"steam_uploader_upload_duration_seconds_sum{prom_labels(operation=operation)} {hist['sum']:.3f}")
+        lines.append(f"steam_uploader_upload_duration_seconds_count{prom_labels(operation=operation)} {hist['count']}")
+
+    lines += [
+        "# HELP steam_uploader_spawn_latency_seconds Time to start the SteamUploader process.",
+        "# TYPE steam_uploader_spawn_latency_seconds summary",
+        f"steam_uploader_spawn_latency_seconds_sum {state['spawn']['sum']:.6f}",
+        f"steam_uploader_spawn_latency_seconds_count {state['spawn']['count']}",
+        "# HELP steam_uploader_retries_total Retried upload attempts by mod.",
+        "# TYPE steam_uploader_retries_total counter",
+    ]
+    for mod, count in sorted(state['retries'].items()):
+        lines.append(f"steam_uploader_retries_total{prom_labels(mod=mod)} {count}")
+
+    gauges = [
+        ('last_exit_code', 'Exit code of the last SteamUploader run.', 'exit_code'),
+        ('last_duration_seconds', 'Wall time of the last upload call.', 'wall_time'),
+        ('content_bytes', 'Size of the content tree at the last content upload.', 'content_bytes'),
+        ('content_files', 'Files in the content tree at the last content upload.', 'content_files'),
+        ('last_success_timestamp_seconds', 'Unix time of the last successful upload.', 'success_ts'),
+    ]
+    for name, help_text, key in gauges:
+        lines += [f"# HELP steam_uploader_{name} {help_text}", f"# TYPE steam_uploader_{name} gauge"]
+        for mod, last in sorted(state['last'].items()):
+            if last.get(key) is not None:
+                lines.append(f"steam_uploader_{name}{prom_labels(mod=mod)} {last[key]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file_atomic(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def describe_upload(record):
+    """(mod name, operation) of an upload record: the mod is looked up by Workshop ID when not given."""
+    mods = mod_catalog()['by_id'].get(record.get('workshop_id') or '', [])
+    mod = record.get('mod_name') or (mods[0] if mods else record.get('workshop_id') or 'unknown')
+    fields = record.get('fields', [])
+    return mod, fields[0] if len(fields) == 1 else ('multi' if fields else 'none')
+
+
+def record_upload_metrics(record):
+    """
+    Record one execute_upload call: append it to uploads.jsonl, update the cumulative
+    counters and rewrite the Prometheus textfile atomically.
+    """
+    mod, operation = describe_upload(record)
+    record = dict(record, mod_name=mod, operation=operation, timestamp=time.time())
+
+    with METRICS_LOCK:
+        try:
+            directory = metrics_dir()
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, METRICS_JSONL_FILE), 'a', encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+            state = load_metrics_state()
+            key = f"{mod}|{operation}|{record['status']}"
+            state['uploads'][key] = state['uploads'].get(key, 0) + 1
+            if record.get('attempt', 1) > 1:
+                state['retries'][mod] = state['retries'].get(mod, 0) + 1
+            last = state['last'].setdefault(mod, {})
+            last['wall_time'] = round(record['wall_time'], 3)
+            if record.get('spawn_latency') is not None:
+                state['spawn']['sum'] += record['spawn_latency']
+                state['spawn']['count'] += 1
+                hist = state['duration'].setdefault(operation, {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0.0, 'count': 0})
+                for i, bound in enumerate(DURATION_BUCKETS):
+                    if record['wall_time'] <= bound:
+                        hist['buckets'][i] += 1
+                hist['sum'] += record['wall_time']
+                hist['count'] += 1
+                last['exit_code'] = record.get('exit_code')
+            if record.get('content_bytes') is not None:
+                last['content_bytes'] = record['content_bytes']
+                last['content_files'] = record.get('content_files')
+            if record['ok']:
+                last['success_ts'] = int(record['timestamp'])
+
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            write_file_atomic(METRICS_STATE_FILE, json.dumps(state))
+            write_file_atomic(os.path.join(directory, METRICS_PROM_FILE), render_prometheus(state))
+        except Exception as e:
+            print(f"{RED}ERROR writing metrics: {e}{RESET}")
+
+
+# --------------
+# Upload History
+# --------------
+
+def history_db():
+    """Shared SQLite connection to HISTORY_FILE, created with its schema on first use. Use under HISTORY_LOCK."""
+    import sqlite3
+    if HISTORY['db'] is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        db = sqlite3.connect(HISTORY_FILE, timeout=10, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(HISTORY_SCHEMA)
+        HISTORY['db'] = db
+    return HISTORY['db']
+
+
+def record_upload_history(record):
+    """Insert one execute_upload call (see record_upload_metrics for the record fields) into the history."""
+    import sqlite3
+    mod, operation = describe_upload(record)
+    fields = record.get('fields', [])
+    row = (
+        mod, record.get('workshop_id') or '', ",".join(fields), operation, record.get('command'),
+        record.get('started_at'), record.get('ended_at'), record.get('wall_time'),
+        record.get('status'), record.get('exit_code'), record.get('error_code'),
+        'content' in fields and not record.get('content_skipped'),
+        record.get('content_bytes'), record.get('content_files'),
+        record.get('attempt', 1), record.get('queue_wait'), record.get('log_path'),
+    )
+    with HISTORY_LOCK:
+        try:
+            db = history_db()
+            with db:
+                db.execute(
+                    "INSERT INTO uploads (mod_name, workshop_id, fields, operation, command, started_at, ended_at,"
+                    " duration, status, exit_code, error_code, content_sent, content_bytes, content_files,"
+                    " attempt, queue_wait, log_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.Error as e:
+            print(f"{RED}ERROR writing {HISTORY_FILE}: {e}{RESET}")
+
+
+def query_history(sql, params=()):
+    import sqlite3
+    with HISTORY_LOCK:
+        db = history_db()
+        db.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in db.execute(sql, params)]
+        finally:
+            db.row_factory = None
+
+
+def week_start():
+    """Unix time of this week's Monday 00:00 (local time)."""
+    now = time.localtime()
+    midnight = time.mktime((now.tm_year, now.tm_mon, now.tm_mday, 0, 0, 0, 0, 0, -1))
+    return midnight - now.tm_wday * 86400
+
+
+def history_recent(limit=20, mod_name=None):
+    where, params = ("WHERE mod_name = ?", [mod_name]) if mod_name else ("", [])
+    return query_history(f"SELECT * FROM uploads {where} ORDER BY started_at DESC LIMIT ?", params + [limit])
+
+
+def history_slowest(limit=20, mod_name=None):
+    """Slowest calls that launched SteamUploader."""
+    where, params = ("AND mod_name = ?", [mod_name]) if mod_name else ("", [])
+    return query_history(
+        f"SELECT * FROM uploads WHERE exit_code IS NOT NULL {where} ORDER BY duration DESC LIMIT ?", params + [limit])
+
+
+def history_failure_rates(since=None):
+    """Per mod since `since` (default: start of the week): calls, failures and failure rate. Calls that never launched are left out."""
+    rows = query_history(
+        "SELECT mod_name, COUNT(*) AS calls, SUM(status NOT IN ('success', 'canceled')) AS failures"
+        " FROM uploads WHERE started_at >= ? AND status NOT IN ('skipped', 'unavailable') GROUP BY mod_name",
+        (week_start() if since is None else since,))
+    for row in rows:
+        row['failure_rate'] = row['failures'] / row['calls']
+    return sorted(rows, key=lambda row: (-row['failure_rate'], -row['calls'], row['mod_name']))
+
+
+def history_duration_by_size():
+    """Median duration of successful content uploads per HISTORY_SIZE_BUCKETS bucket."""
+    rows = query_history(
+        "SELECT content_bytes, duration FROM uploads"
+        " WHERE content_sent = 1 AND status = 'success' AND content_bytes IS NOT NULL")
+    bounds = [bound for bound, _ in HISTORY_SIZE_BUCKETS[:-1]]
+    durations = [[] for _ in HISTORY_SIZE_BUCKETS]
+    for row in rows:
+        durations[bisect.bisect_right(bounds, row['content_bytes'])].append(row['duration'])
+    return [
+        {'bucket': label, 'uploads': len(values), 'median': statistics.median(values), 'max': max(values)}
+        for (_, label), values in zip(HISTORY_SIZE_BUCKETS, durations) if values
+    ]
+
+
+def format_timestamp(value):
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(value)) if value else '-'
+
+
+def print_history_table(rows, columns):
+    """Print rows as a table. columns: [(header, key, formatter)]."""
+    if not rows:
+        print(f"{YELLOW}No uploads recorded yet.{RESET}")
         return
+    cells = [[formatter(row[key]) for _, key, formatter in columns] for row in rows]
+    widths = [max(len(header), *(len(line[i]) for line in cells)) for i, (header, _, _) in enumerate(columns)]
+    header = " | ".join(header.ljust(width) for (header, _, _), width in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+    for line in cells:
+        print(" | ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def print_history_report(report, limit=20, mod_name=None):
+    """Print one history report: recent, slowest, failures or sizes."""
+    seconds = lambda value: '-' if value is None else f"{value:.1f}s"
+    size = lambda value: '-' if value is None else format_bytes(value)
+    plain = lambda value: '-' if value is None else str(value)
+    call_columns = [
+        ('STARTED', 'started_at', format_timestamp), ('MOD_NAME', 'mod_name', plain),
+        ('FIELDS', 'fields', plain), ('STATUS', 'status', plain), ('EXIT', 'exit_code', plain),
+        ('DURATION', 'duration', seconds), ('CONTENT', 'content_bytes', size),
+    ]
+    if report == 'recent':
+        print(f"{CYAN}=== LAST {limit} UPLOADS ==={RESET}")
+        print_history_table(history_recent(limit, mod_name), call_columns)
+    elif report == 'slowest':
+        print(f"{CYAN}=== SLOWEST {limit} UPLOADS ==={RESET}")
+        print_history_table(history_slowest(limit, mod_name), call_columns)
+    elif report == 'failures':
+        print(f"{CYAN}=== FAILURE RATE PER MOD SINCE {format_timestamp(week_start())} ==={RESET}")
+        print_history_table(history_failure_rates(), [
+            ('MOD_NAME', 'mod_name', plain), ('CALLS', 'calls', plain), ('FAILED', 'failures', plain),
+            ('RATE', 'failure_rate', lambda value: f"{value * 100:.0f}%"),
+        ])
+    elif report == 'sizes':
+        print(f"{CYAN}=== CONTENT UPLOAD DURATION BY SIZE ==={RESET}")
+        print_history_table(history_duration_by_size(), [
+            ('SIZE', 'bucket', plain), ('UPLOADS', 'uploads', plain),
+            ('MEDIAN', 'median', seconds), ('MAX', 'max', seconds),
+        ])
+
+
+def history_flow():
+    reports = dict(zip('1234', HISTORY_REPORTS))
     while True:
         clear_screen()
-        print(f"{CYAN}=== REMOVE MOD ==={RESET}")
-        for i, name in enumerate(MODS.keys()):
-            print(f"{i+1}) {name} [{MODS[name] or 'MISSING ID'}]")
+        print(f"{CYAN}=== UPLOAD HISTORY ==={RESET}")
+        print("1) Last 20 uploads")
+        print("2) Slowest 20 uploads")
+        print("3) Failure rate per mod this week")
+        print("4) Content upload duration by size")
         print("Q) Go back\n")
-        choice = input("Select Mod to remove: ").strip().upper()
+        choice = input("Select Option: ").strip().upper()
         if choice == 'Q':
             clear_screen()
             return
-        if choice.isdigit():
+        if choice in reports:
             clear_screen()
-            idx = int(choice) - 1
-            if 0 <= idx < len(MODS):
-                mod_to_remove = list(MODS.keys())[idx]
-                confirm = input(f"Selected mod: {YELLOW}{mod_to_remove}{RESET}\nRemove mod? (y/n): ").strip().lower()
-                if confirm == 'y':
-                    clear_screen()
-                    print(f"Removed mod: {YELLOW}{mod_to_remove}{RESET}")
-                    del MODS[mod_to_remove]
-                    save_mods_to_file()
-                    input("Press Enter to continue...")
-                    clear_screen()
-                    return
+            print_history_report(reports[choice])
+            input("\nPress Enter to continue...")
 
 
-def show_mod_list():
-    clear_screen()
-    print(f"{CYAN}=== CURRENT MODS ==={RESET}")
-    if not MODS:
-        print(f"{YELLOW}No mods loaded.{RESET}")
+# ------------
+# Steam Health
+# ------------
+
+def probe_steam():
+    """
+    Look for a running Steam client. Returns (running, detail); running is None when this
+    platform cannot be checked.
+    """
+    if sys.platform == 'win32':
+        try:
+            out = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq steam.exe', '/NH'], capture_output=True,
+                                 text=True, timeout=5, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            return None, f"tasklist failed: {e}"
+        return 'steam.exe' in out.lower(), "steam.exe process"
+
+    if sys.platform.startswith('linux'):
+        for pid_file in STEAM_PID_FILES:
+            pid_file = os.path.expanduser(pid_file)
+            try:
+                with open(pid_file, 'r') as f:
+                    pid = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                continue
+            if pid <= 0:
+                continue
+            try:
+                os.kill(pid, 0)
+            except PermissionError:
+                pass
+            except (OSError, OverflowError):
+                continue
+            return True, f"pid {pid} from {pid_file}"
+        try:
+            for pid in os.listdir('/proc'):
+                if pid.isdigit():
+                    try:
+                        with open(f'/proc/{pid}/comm', 'r') as f:
+                            if f.read().strip() in STEAM_PROCESS_NAMES:
+                                return True, f"steam process {pid}"
+                    except OSError:
+                        pass
+        except OSError:
+            return None, "/proc not readable"
+        return False, "no steam process or steam.pid"
+
+    if sys.platform == 'darwin':
+        try:
+            result = subprocess.run(['pgrep', '-x', 'steam_osx'], capture_output=True, timeout=5)
+        except (OSError, subprocess.SubprocessError) as e:
+            return None, f"pgrep failed: {e}"
+        return result.returncode == 0, "steam_osx process"
+
+    return None, f"no probe for {sys.platform}"
+
+
+def steam_running():
+    """probe_steam, cached for STEAM_PROBE_TTL seconds. Always (True, ...) when DEFAULT_STEAM_CHECK=0."""
+    if SETTINGS.get('DEFAULT_STEAM_CHECK', '1') == '0':
+        return True, "check disabled"
+    with STEAM['lock']:
+        if STEAM['probe'] is None or time.monotonic() - STEAM['probed_at'] >= STEAM_PROBE_TTL:
+            STEAM['probe'] = probe_steam()
+            STEAM['probed_at'] = time.monotonic()
+        running, detail = STEAM['probe']
+    return running is not False, detail
+
+
+def breaker_remaining():
+    """
+    Seconds until the circuit breaker lets uploads through again (0 when closed). Once the cool-down
+    is over the breaker is half-open: uploads run again, and one more init failure reopens it.
+    Call with STEAM['lock'] held.
+    """
+    if STEAM['opened_at'] is None:
+        return 0
+    remaining = setting_seconds('DEFAULT_BREAKER_COOLDOWN') - (time.monotonic() - STEAM['opened_at'])
+    if remaining > 0:
+        return remaining
+    STEAM['opened_at'] = None
+    STEAM['failures'] = max(0, setting_int('DEFAULT_BREAKER_THRESHOLD', 3) - 1)
+    return 0
+
+
+def steam_gate():
+    """None when an upload may start, otherwise why not (circuit breaker open or Steam not running)."""
+    with STEAM['lock']:
+        remaining = breaker_remaining()
+        failures = STEAM['failures']
+    if remaining:
+        return (f"Steam API init failed {failures}x in a row, uploads paused for "
+                f"{remaining:.0f}s more (DEFAULT_BREAKER_COOLDOWN).")
+    running, detail = steam_running()
+    if not running:
+        return f"Steam is not running ({detail}). Start Steam and try again."
+    return None
+
+
+def record_steam_init(failed):
+    """Feed the circuit breaker: failed=True after a Steam API init failure, False once Steam initialized."""
+    with STEAM['lock']:
+        if not failed:
+            STEAM['failures'] = 0
+            STEAM['opened_at'] = None
+            return
+        STEAM['failures'] += 1
+        STEAM['probe'] = None
+        threshold = setting_int('DEFAULT_BREAKER_THRESHOLD', 3)
+        if threshold > 0 and STEAM['failures'] >= threshold and STEAM['opened_at'] is None:
+            STEAM['opened_at'] = time.monotonic()
+            print(f"{RED}Steam API init failed {STEAM['failures']}x in a row, pausing uploads for "
+                  f"{setting_seconds('DEFAULT_BREAKER_COOLDOWN'):.0f}s.{RESET}")
+
+
+def steam_status():
+    running, detail = steam_running()
+    with STEAM['lock']:
+        remaining = breaker_remaining()
+        failures = STEAM['failures']
+    return {'steam_running': running, 'detail': detail, 'breaker': 'open' if remaining else 'closed',
+            'init_failures': failures, 'reopens_in': round(remaining, 1)}
+
+
+# ----------------
+# Upload Scheduler
+# ----------------
+
+def job_lane(job):
+    return 'content' if job['kwargs'].get('content_path') else 'metadata'
+
+
+def setting_int(key, default):
+    try:
+        return int(SETTINGS.get(key) or default)
+    except ValueError:
+        return default
+
+
+def refill_upload_tokens():
+    """Add the tokens earned since the last refill. Call on the engine loop; returns the rate per second."""
+    rate = setting_int('DEFAULT_UPLOADS_PER_MINUTE', 30) / 60.0
+    now = time.monotonic()
+    if rate <= 0:
+        SCHEDULER['tokens'] = float(SCHEDULER_BURST)
     else:
-        mod_name_width = max(len("MOD_NAME"), max((len(name) for name in MODS.keys()), default=0))
-        wid_width = max(len("WORKSHOP_ID"), max((len(wid or 'MISSING ID') for wid in MODS.values()), default=0))
+        SCHEDULER['tokens'] = min(float(SCHEDULER_BURST), SCHEDULER['tokens'] + (now - SCHEDULER['updated']) * rate)
+    SCHEDULER['updated'] = now
+    return rate
 
-        header = f"{'MOD_NAME'.ljust(mod_name_width)} | {'WORKSHOP_ID'.ljust(wid_width)}"
-        print(header)
-        print("-" * (len(header)))
 
-        for name, wid in MODS.items():
-            display_id = wid or 'MISSING ID'
-            print(f"{name.ljust(mod_name_width)} | {display_id.ljust(wid_width)}")
+async def acquire_upload_slot(lane, cancel_event=None, stop_event=None):
+    """
+    Wait on the engine loop until this call may launch SteamUploader: it is the highest-priority waiting call
+    that can run (metadata before content, then first come first served; content waits while
+    DEFAULT_CONTENT_UPLOADS are running) and a rate token is available. Waiting holds no thread.
+    Returns False if cancel_event or stop_event is set while waiting (checked at least every ENGINE_POLL seconds).
+    """
+    import asyncio
+    SCHEDULER['seq'] += 1
+    ticket = (LANE_PRIORITY[lane], SCHEDULER['seq'])
+    SCHEDULER['waiting'].append(ticket)
+    try:
+        while True:
+            if any(event is not None and event.is_set() for event in (cancel_event, stop_event)):
+                return False
+            rate = refill_upload_tokens()
+            content_free = SCHEDULER['content_running'] < max(1, setting_int('DEFAULT_CONTENT_UPLOADS', 2))
+            runnable = [t for t in sorted(SCHEDULER['waiting']) if t[0] == LANE_PRIORITY['metadata'] or content_free]
+            if runnable and runnable[0] == ticket and SCHEDULER['tokens'] >= 1:
+                SCHEDULER['tokens'] -= 1
+                if lane == 'content':
+                    SCHEDULER['content_running'] += 1
+                return True
+            delay = (1 - SCHEDULER['tokens']) / rate if rate > 0 and SCHEDULER['tokens'] < 1 else ENGINE_POLL
+            if SCHEDULER['wakeup'] is None:
+                SCHEDULER['wakeup'] = asyncio.Event()
+            try:
+                await asyncio.wait_for(SCHEDULER['wakeup'].wait(), min(max(delay, 0.05), ENGINE_POLL))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        SCHEDULER['waiting'].remove(ticket)
+        notify_upload_waiters()
+
+
+def notify_upload_waiters():
+    """Wake every acquire_upload_slot call so it checks again. Engine loop only."""
+    wakeup, SCHEDULER['wakeup'] = SCHEDULER['wakeup'], None
+    if wakeup is not None:
+        wakeup.set()
+
+
+def wake_upload_waiters():
+    """Make calls waiting in acquire_upload_slot check their events now (after setting a stop_event); any thread."""
+    loop = ENGINE['loop']
+    if loop is not None:
+        loop.call_soon_threadsafe(notify_upload_waiters)
+
+
+def release_upload_slot(lane):
+    """Give back a slot granted by acquire_upload_slot. Engine loop only."""
+    if lane == 'content':
+        SCHEDULER['content_running'] -= 1
+    notify_upload_waiters()
+
+
+def try_mod_lock(workshop_id):
+    """
+    Take the upload lock of a Workshop item without waiting: an exclusive lock on LOCKS_DIR/<id>.lock that
+    every process sees (menu, watch mode, batch, daemon), so its staging folder, manifest and log have one writer.
+    Returns the locked file descriptor, None if another upload holds it, or False if the lock file cannot
+    be used here (the upload goes on without it).
+    """
+    try:
+        os.makedirs(LOCKS_DIR, exist_ok=True)
+        fd = os.open(os.path.join(LOCKS_DIR, f"{workshop_id}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return False
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except (BlockingIOError, PermissionError):
+        os.close(fd)
+        return None
+    except OSError:
+        os.close(fd)
+        return False
+
+
+async def acquire_mod_lock(workshop_id, on_wait=None, cancel_event=None, stop_event=None):
+    """
+    Wait on the engine loop until no other upload of this Workshop item runs, in this process or another
+    one, and take its lock (see try_mod_lock). on_wait is called once if the lock is busy.
+    Returns the lock for release_mod_lock, or None if cancel_event or stop_event is set while waiting.
+    """
+    import asyncio
+    lock = try_mod_lock(workshop_id)
+    if lock is None and on_wait:
+        on_wait()
+    while lock is None:
+        if any(event is not None and event.is_set() for event in (cancel_event, stop_event)):
+            return None
+        await asyncio.sleep(ENGINE_POLL)
+        lock = try_mod_lock(workshop_id)
+    return lock
+
+
+def release_mod_lock(lock):
+    """Release a lock taken by acquire_mod_lock (closing the descriptor drops it)."""
+    if lock is False:
+        return
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            os.lseek(lock, 0, os.SEEK_SET)
+            msvcrt.locking(lock, msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    os.close(lock)
+
+
+# ---------------
+# Execution Logic
+# ---------------
+
+def compile_command_template(command_template):
+    """
+    Parse a commands.txt line once into {'source', 'executable', 'args', 'unresolved'}.
+    args is a list of parts: ('fixed', text), ('id', text) for text holding {WORKSHOP_ID},
+    ('option', flag, key) for a flag followed by an optional placeholder and ('value', key)
+    for a placeholder without a flag. key is the execute_upload keyword of the placeholder.
+    Double quotes group words; environment variables in fixed arguments are expanded here.
+    """
+    compiled = COMPILED_COMMANDS.get(command_template)
+    if compiled:
+        return compiled
+
+    tokens = [token.replace('"', '') for token in TEMPLATE_TOKEN.findall(command_template)]
+    args, unresolved = [], []
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token.startswith('-') and following in TEMPLATE_PLACEHOLDERS:
+            args.append(('option', token, TEMPLATE_PLACEHOLDERS[following]))
+            i += 2
+            continue
+        if token in TEMPLATE_PLACEHOLDERS:
+            args.append(('value', TEMPLATE_PLACEHOLDERS[token]))
+        elif '{WORKSHOP_ID}' in token:
+            args.append(('id', os.path.expandvars(token)))
+        else:
+            args.append(('fixed', os.path.expandvars(token)))
+        unresolved += [name for name in PLACEHOLDER_PATTERN.findall(token) if name != '{WORKSHOP_ID}']
+        i += 1
+
+    compiled = {
+        'source': command_template,
+        'executable': os.path.expandvars(tokens[0]) if tokens else '',
+        'args': args,
+        'unresolved': unresolved,
+    }
+    COMPILED_COMMANDS[command_template] = compiled
+    return compiled
+
+
+def build_command(command_template, workshop_id, content_path=None, desc_path=None, title=None, visibility=None, tags=None, preview=None):
+    """
+    Fill a command template and return the argv list to run (no shell involved).
+    Placeholders without a value are dropped together with their flag; "__CLEAR__" sends an empty value.
+    """
+    compiled = compile_command_template(command_template)
+    values = {
+        'content_path': os.path.expandvars(content_path) if content_path else None,
+        'desc_path':    os.path.expandvars(desc_path) if desc_path else None,
+        'title':        title if title else None,
+        'visibility':   visibility if visibility is not None else None,
+        'tags':         tags if tags else None,
+        'preview':      os.path.expandvars(preview) if preview else None,
+    }
+
+    argv = [compiled['executable']]
+    for part in compiled['args']:
+        kind = part[0]
+        if kind == 'fixed':
+            argv.append(part[1])
+        elif kind == 'id':
+            argv.append(part[1].replace('{WORKSHOP_ID}', workshop_id))
+        else:
+            value = values[part[-1]]
+            if value == "__CLEAR__":
+                value = ''
+            elif not value:
+                continue
+            if kind == 'option':
+                argv.append(part[1])
+            argv.append(str(value))
+    return argv
+
+
+def format_command(argv):
+    """Render an argv list the way the current platform's shell would quote it, for logs."""
+    if os.name == 'nt':
+        return subprocess.list2cmdline(argv)
+    return " ".join(shlex.quote(arg) for arg in argv)
+
+
+def execute_upload(command_template, workshop_id, content_path=None, desc_path=None, title=None, visibility=None, tags=None, preview=None, force=False, on_event=None, metrics=None, timeout=None, stall_timeout=None, cancel_event=None, stop_event=None):
+    """
+    Handles commands with placeholders:
+    Replaces {WORKSHOP_ID} with workshop_id
+    Replaces {CONTENT}, {DESC}, {TITLE}, {VISIBILITY}, {TAGS}, {PREVIEW} with given values or strips them out if not provided.
+    Content that matches the manifest of its last successful upload is skipped unless force is set.
+    Calls with several fields also drop metadata that matches the last successful push (see changed_metadata).
+    A description template (*.tmpl) is rendered for the mod first (see render_description).
+    Output is streamed line by line; on_event receives each parsed line (see parse_output_line).
+    The uploader is stopped after timeout seconds, after stall_timeout seconds without output (both default
+    to the settings, 0 = no limit) or when cancel_event is set. stop_event only makes a call that is still
+    waiting for an upload slot give up; a running uploader is left to finish.
+    SteamUploader is only launched while Steam is running and the circuit breaker is closed (see steam_gate),
+    and once the upload scheduler grants a slot (see acquire_upload_slot). A call waits while another upload
+    of the same Workshop item runs, in this or another process (see acquire_mod_lock).
+    Every call is recorded by record_upload_metrics and record_upload_history; metrics may carry extra
+    context (mod_name, attempt) and receives the final 'status' (success, skipped, failed, unavailable or error).
+    This runs execute_upload_async on the execution engine and waits for it; Ctrl+C cancels the call.
+    """
+    cancel_event = cancel_event if cancel_event is not None else threading.Event()
+    return wait_on_engine(execute_upload_async(
+        command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview, force,
+        on_event, metrics, timeout, stall_timeout, cancel_event, stop_event), cancel_event)
+
+
+async def execute_upload_async(command_template, workshop_id, content_path=None, desc_path=None, title=None, visibility=None, tags=None, preview=None, force=False, on_event=None, metrics=None, timeout=None, stall_timeout=None, cancel_event=None, stop_event=None):
+    """
+    execute_upload as a coroutine on the execution engine. The file work (prepare_upload, the Steam
+    check, complete_upload) runs in worker threads; waiting for an upload slot or for SteamUploader holds none.
+    """
+    import asyncio
+    cancel_event = cancel_event if cancel_event is not None else threading.Event()
+    call = new_upload_call(workshop_id, upload_fields(content_path, desc_path, title, visibility, tags, preview), metrics)
+    if not workshop_id:
+        return await asyncio.to_thread(finish_upload, call, False, f"{RED}ERROR: missing Workshop ID{RESET}", 'error')
+
+    # Staging, the manifest and the job log of a mod are shared by every upload of it
+    message = f"Waiting for another upload of Workshop ID {workshop_id} to finish..."
+    waited = time.perf_counter()
+    lock = await acquire_mod_lock(workshop_id, on_event and (lambda: on_event({'waiting': message})), cancel_event, stop_event)
+    if lock is None:
+        return await asyncio.to_thread(
+            finish_upload, call, False, f"{YELLOW}Canceled while waiting for another upload of this mod.{RESET}", 'canceled')
+    try:
+        waited = time.perf_counter() - waited
+        if waited >= 1:
+            call['notes'] += f"{YELLOW}Waited {waited:.1f}s for another upload of Workshop ID {workshop_id}.{RESET}\n"
+        return await run_locked_upload(
+            call, command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview, force,
+            on_event, timeout, stall_timeout, cancel_event, stop_event)
+    finally:
+        release_mod_lock(lock)
+
+
+async def run_locked_upload(call, command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview, force, on_event, timeout, stall_timeout, cancel_event, stop_event):
+    """The part of execute_upload_async that runs under the mod's upload lock."""
+    import asyncio
+    done = await asyncio.to_thread(
+        prepare_upload, call, command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview, force)
+    if done:
+        return done
+    record = call['record']
+    if on_event and call['content_manifest']:
+        on_event({'content_bytes': record['content_bytes']})
+
+    blocked = await asyncio.to_thread(steam_gate)
+    if blocked:
+        return await asyncio.to_thread(finish_upload, call, False, f"{call['notes']}{RED}{blocked}{RESET}", 'unavailable')
+
+    timeout = setting_seconds('DEFAULT_UPLOAD_TIMEOUT') if timeout is None else timeout
+    stall_timeout = setting_seconds('DEFAULT_STALL_TIMEOUT') if stall_timeout is None else stall_timeout
+    lane = call['lane']
+    waited = time.perf_counter()
+    granted = await acquire_upload_slot(lane, cancel_event, stop_event)
+    record['queue_wait'] = time.perf_counter() - waited
+    if not granted:
+        return await asyncio.to_thread(
+            finish_upload, call, False, f"{call['notes']}{YELLOW}Canceled while waiting for an upload slot.{RESET}", 'canceled')
+    if record['queue_wait'] >= 1:
+        call['notes'] += f"{YELLOW}Waited {record['queue_wait']:.1f}s for an upload slot ({lane}).{RESET}\n"
+
+    timings = {}
+    argv = call['argv']
+    log = open_job_log(describe_upload(record)[0])
+    write_job_log(log, f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} Workshop ID {workshop_id} ({', '.join(record['fields'])}) ===\n$ {call['cmd']}\n")
+    try:
+        returncode, stdout_lines, stderr_lines, events, stopped = await stream_command_async(
+            argv, on_event, timings, timeout, stall_timeout, cancel_event,
+            lambda stream, line: write_job_log(log, f"[stderr] {line}\n" if stream == 'stderr' else f"{line}\n"))
+    except OSError as e:
+        # Not found, not executable, not a valid executable (ENOEXEC), ...
+        reason = e.strerror or str(e)
+        write_job_log(log, f"=== cannot run {argv[0]}: {reason} ===\n\n")
+        close_job_log(log)
+        record['log_path'] = log['path'] if log else None
+        return await asyncio.to_thread(
+            finish_upload, call, False, f"{call['notes']}{RED}ERROR: cannot run {argv[0]}: {reason}{RESET}", 'failed', None)
+    finally:
+        release_upload_slot(lane)
+    # Ctrl+C also reaches the uploader itself, which may exit before the watchdog stops it
+    if cancel_event.is_set() and stopped is None and returncode != 0:
+        stopped = 'canceled'
+    return await asyncio.to_thread(
+        complete_upload, call, returncode, stdout_lines, stderr_lines, events, stopped, timings, log, timeout, stall_timeout)
+
+
+def new_upload_call(workshop_id, fields, metrics):
+    """The state one execute_upload call carries from prepare_upload to finish_upload."""
+    record = dict(metrics or {})
+    record.update(workshop_id=workshop_id, fields=fields, started_at=time.time())
+    return {'start': time.perf_counter(), 'record': record, 'metrics': metrics, 'notes': ""}
+
+
+def finish_upload(call, ok, text, status, exit_code=None):
+    """Record the end of an execute_upload call (metrics and history) and return (ok, text)."""
+    record, metrics = call['record'], call['metrics']
+    record.update(ok=ok, status=status, exit_code=exit_code, wall_time=time.perf_counter() - call['start'], ended_at=time.time())
+    record_upload_metrics(record)
+    record_upload_history(record)
+    if metrics is not None:
+        metrics.update(status=status, exit_code=exit_code, error_code=record.get('error_code'),
+                       steam_init_failed=record.get('steam_init_failed', False))
+    return ok, text
+
+
+def prepare_upload(call, command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview, force):
+    """
+    The file work before SteamUploader can be launched: render the description template, stage and diff the
+    content, leave out unchanged metadata and build the command. Returns (ok, text) if the call already ended,
+    otherwise None with 'argv', 'cmd', 'lane', 'content_manifest' and 'metadata' added to call.
+    """
+    record = call['record']
+    notes = call['notes']
+    if is_description_template(desc_path):
+        rendered = render_description(desc_path, describe_upload(record)[0], workshop_id)
+        if rendered['error']:
+            return finish_upload(call, False, f"{RED}ERROR: {rendered['error']}{RESET}", 'error')
+        desc_path = rendered['path']
+        notes += f"{GREEN}Description {rendered['status']} from {os.path.basename(rendered['path'])} ({rendered['length']} characters).{RESET}\n"
+    content_manifest = None
+    if content_path:
+        content_path, stats = stage_content(content_path)
+        if stats and stats['ignored']:
+            notes += f"{YELLOW}Staged {stats['files']} files, {stats['ignored']} ignored by {IGNORE_FILE_NAME} rules.{RESET}\n"
+        changed, content_manifest = check_content_changes(workshop_id, content_path)
+        if content_manifest:
+            record['content_files'] = len(content_manifest['files'])
+            record['content_bytes'] = sum(entry['size'] for entry in content_manifest['files'].values())
+        if not changed and not force:
+            notes += f"{GREEN}Content unchanged since last upload, skipped -c.{RESET}\n"
+            record['content_skipped'] = True
+            content_path = content_manifest = None
+
+    sent = {'desc_path': desc_path, 'title': title, 'visibility': visibility, 'tags': tags, 'preview': preview}
+    metadata = {key: metadata_fingerprint(key, value) for key, value in sent.items() if value is not None and value != ''}
+    if len(record['fields']) > 1 and not force:
+        metadata, unchanged = changed_metadata(workshop_id, metadata)
+        if unchanged:
+            skipped = ", ".join(f"{METADATA_FIELDS[key][0]} ({METADATA_FIELDS[key][1]})" for key in unchanged)
+            notes += f"{GREEN}Unchanged since last upload, skipped {skipped}.{RESET}\n"
+            record['metadata_skipped'] = unchanged
+            desc_path = None if 'desc_path' in unchanged else desc_path
+            title = None if 'title' in unchanged else title
+            visibility = None if 'visibility' in unchanged else visibility
+            tags = None if 'tags' in unchanged else tags
+            preview = None if 'preview' in unchanged else preview
+
+    if not any([content_path, desc_path, title, visibility is not None, tags, preview]):
+        return finish_upload(call, True, notes, 'skipped')
+
+    argv = build_command(command_template, workshop_id, content_path, desc_path, title, visibility, tags, preview)
+    cmd = format_command(argv)
+    record['command'] = cmd
+
+    unresolved = compile_command_template(command_template)['unresolved']
+    if unresolved:
+        return finish_upload(call, False, f"{RED}ERROR: Unresolved placeholder(s) {', '.join(unresolved)} in command{RESET}\nTemplate: {command_template}\nFinal: {cmd}", 'error')
+
+    call.update(notes=notes, argv=argv, cmd=cmd, lane='content' if content_path else 'metadata',
+                content_manifest=content_manifest, metadata=metadata)
+    return None
+
+
+def complete_upload(call, returncode, stdout_lines, stderr_lines, events, stopped, timings, log, timeout, stall_timeout):
+    """Log and report a finished SteamUploader run; the manifest and metadata state are saved when it succeeded."""
+    record, metrics, notes, cmd = call['record'], call['metrics'], call['notes'], call['cmd']
+    workshop_id = record['workshop_id']
+    write_job_log(log, f"=== exit code {returncode}{f' ({stopped})' if stopped else ''} after {time.perf_counter() - call['start']:.1f}s ===\n\n")
+    close_job_log(log)
+    if not stopped:
+        record['steam_init_failed'] = returncode != 0 and any(
+            STEAM_INIT_FAILURE.search(line) for lines in (stderr_lines, stdout_lines) for line in lines)
+        record_steam_init(record['steam_init_failed'])
+    record['spawn_latency'] = timings.get('spawn')
+    record['first_output_latency'] = timings.get('first_output')
+    record['log_path'] = log['path'] if log else None
+    if metrics is not None:
+        metrics['log_path'] = record['log_path']
+
+    out = format_output_tail(stdout_lines, timings.get('stdout_lines', 0), log)
+    if stderr_lines:
+        out += f"\n\n{RED}[Errors]{RESET}\n" + format_output_tail(stderr_lines, timings.get('stderr_lines', 0), log)
+    if log:
+        out += f"\n\n{CYAN}[Log file]{RESET} {log['path']}"
+
+    if returncode == 0:
+        if call['content_manifest']:
+            save_manifest(workshop_id, call['content_manifest'])
+        save_metadata_state(workshop_id, {key: value for key, value in call['metadata'].items() if value is not None})
+        return finish_upload(call, True, f"{notes}{CYAN}[Command]{RESET}\n{cmd}\n\n{YELLOW}[Logs]{RESET}\n{out}", 'success', returncode)
+
+    if stopped == 'canceled':
+        return finish_upload(call, False, (
+            f"{notes}{YELLOW}Canceled, SteamUploader was stopped.{RESET}\n"
+            f"{CYAN}[Command]{RESET} {cmd}\n\n"
+            f"{YELLOW}[Logs]{RESET}\n{out}"
+        ), 'canceled', returncode)
+
+    error_codes = [event['error_code'] for event in events if event['error_code']]
+    error_info = f" (error code {error_codes[-1]})" if error_codes else ""
+    if stopped:
+        error_info += f" ({STOP_REASONS[stopped].format(timeout=timeout, stall_timeout=stall_timeout)})"
+    record['error_code'] = error_codes[-1] if error_codes else None
+    return finish_upload(call, False, (
+        f"{notes}{RED}Failed with code {returncode}{error_info}{RESET}\n"
+        f"{CYAN}[Command]{RESET} {cmd}\n\n"
+        f"{YELLOW}[Logs]{RESET}\n{out}"
+    ), stopped or 'failed', returncode)
+
+
+def build_upload_call(selected, values):
+    """
+    Pick the command template for the selected menu options ('1'..'6').
+    A single option uses its own template, several options use the combined one (COMMAND_TEMPLATES[6]).
+    Returns (template, kwargs for execute_upload), or (None, None) if no template is available.
+    """
+    if len(selected) == 1:
+        idx, key = UPLOAD_OPTIONS[selected[0]]
+        if idx >= len(COMMAND_TEMPLATES):
+            return None, None
+        return COMMAND_TEMPLATES[idx], {key: values.get(key)}
+    if len(COMMAND_TEMPLATES) >= 7:
+        keys = [UPLOAD_OPTIONS[opt][1] for opt in selected]
+        return COMMAND_TEMPLATES[6], {key: values.get(key) for key in keys}
+    return None, None
+
+
+def show_execution_results(execution_logs, success, canceled=False):
+    if execution_logs:
+        print("\n".join(execution_logs))
+    if canceled:
+        print(f"{YELLOW}=== ACTION CANCELED ==={RESET}")
+    elif success:
+        save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
+        print(f"{GREEN}=== ACTION COMPLETE ==={RESET}")
+    else:
+        print(f"{RED}=== ACTION FAILED ==={RESET}")
+    input("Press Enter to continue...")
+    clear_screen()
+
+
+# --------------
+# Mod Management
+# --------------
 
-    input("\nPress Enter to go back...")
+def add_mod():
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== ADD / UPDATE MOD ==={RESET}")
+        mod_name = input("Enter Mod name: ").strip()
+        if not mod_name:
+            clear_screen()
+            print(f"{RED}Mod name cannot be empty.{RESET}")
+            input("Press Enter to try again...")
+            clear_screen()
+            continue
+        while True:
+            clear_screen()
+            mod_id = input(f"Enter Workshop ID for {YELLOW}{mod_name}{RESET} (or blank to clear): ").strip()
+            if not mod_id:
+                break
+            if mod_id.isdigit():
+                break
+            print(f"{RED}Workshop ID must be a numeric value or blank.{RESET}")
+            input("Press Enter to try again...")
+        clear_screen()
+        print(f"Added/Updated mod: {YELLOW}{mod_name}{RESET} with ID ({YELLOW}{mod_id or 'MISSING ID'}{RESET})")
+        update_mods_file(mod_name, mod_id)
+        input("Press Enter to continue...")
+        clear_screen()
+        return
+
+
+def remove_mod():
+    if not MODS:
+        print(f"{YELLOW}No mods to remove.{RESET}")
+        input("Press Enter to continue...")
+        clear_screen()
+        return
+    while True:
+        mod_to_remove = paged_mod_menu("REMOVE MOD", "Select Mod to remove")
+        if not mod_to_remove:
+            return
+        confirm = input(f"Selected mod: {YELLOW}{mod_to_remove}{RESET}\nRemove mod? (y/n): ").strip().lower()
+        if confirm == 'y':
+            clear_screen()
+            print(f"Removed mod: {YELLOW}{mod_to_remove}{RESET}")
+            del MODS[mod_to_remove]
+            MOD_TAGS.pop(mod_to_remove, None)
+            save_mods_to_file()
+            if mod_to_remove in MOD_INFO:
+                # Keep the Workshop folder scan from offering it again
+                ignore_discovered_mods([mod_to_remove])
+            input("Press Enter to continue...")
+            clear_screen()
+            return
+
+
+def show_mod_list():
+    page = 0
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== CURRENT MODS ==={RESET}")
+        pages = 1
+        if not MODS:
+            print(f"{YELLOW}No mods loaded.{RESET}")
+        else:
+            names = mod_catalog()['names']
+            pages = max(1, (len(names) + MOD_PAGE_SIZE - 1) // MOD_PAGE_SIZE)
+            shown = names[page * MOD_PAGE_SIZE:(page + 1) * MOD_PAGE_SIZE]
+            mod_name_width = max(len("MOD_NAME"), max((len(name) for name in shown), default=0))
+            wid_width = max(len("WORKSHOP_ID"), max((len(MODS[name] or 'MISSING ID') for name in shown), default=0))
+
+            header = f"{'MOD_NAME'.ljust(mod_name_width)} | {'WORKSHOP_ID'.ljust(wid_width)} | TAGS"
+            print(header)
+            print("-" * (len(header)))
+
+            for name in shown:
+                display_id = MODS[name] or 'MISSING ID'
+                print(f"{name.ljust(mod_name_width)} | {display_id.ljust(wid_width)} | {', '.join(MOD_TAGS.get(name, []))}")
+            if pages > 1:
+                print(f"\nPage {page + 1}/{pages} - {len(names)} mods (N/P to change page)")
+
+        choice = input("\nPress Enter to go back...").strip().upper()
+        if choice == 'N' and page + 1 < pages:
+            page += 1
+        elif choice == 'P' and page > 0:
+            page -= 1
+        else:
+            break
     clear_screen()
 
 
@@ -670,14 +3519,21 @@ def mod_management_menu():
         print("1) Add / Update Mod")
         print("2) Remove Mod")
         print("3) Show Mod List")
+        print("4) Scan Workshop folder for mods")
         print("Q) Go Back\n")
-        choice = input("Select (1,2,3,Q): ").strip().upper()
+        choice = input("Select (1,2,3,4,Q): ").strip().upper()
         if choice == '1':
             add_mod()
         elif choice == '2':
             remove_mod()
         elif choice == '3':
             show_mod_list()
+        elif choice == '4':
+            clear_screen()
+            print(f"{CYAN}=== SCAN WORKSHOP FOLDER ==={RESET}")
+            run_mod_discovery(SETTINGS.get('DEFAULT_BASE_PATH'), verbose=True)
+            input("\nPress Enter to continue...")
+            clear_screen()
         elif choice == 'Q':
             clear_screen()
             return
@@ -777,41 +3633,1242 @@ def multiple_options_flow(base_path, desc_base_path):
                 return [], False, True
 
             execution_logs = []
-            if len(selected) == 1:
-                opt = selected[0]
-                if opt == '1':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[0], workshop_id, content_path=content_path)
-                elif opt == '2':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[1], workshop_id, desc_path=desc_path)
-                elif opt == '3':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[2], workshop_id, title=title)
-                elif opt == '4':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[3], workshop_id, visibility=visibility)
-                elif opt == '5':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[4], workshop_id, tags=tags)
-                elif opt == '6':
-                    ok, out = execute_upload(COMMAND_TEMPLATES[5], workshop_id, preview=preview_path)
-                else:
-                    ok, out = False, f"{RED}ERROR: Unsupported option {opt}{RESET}"
-                execution_logs.append(out)
-                return execution_logs, ok, False
-
-            if len(selected) > 1 and len(COMMAND_TEMPLATES) >= 7:
-                ok, out = execute_upload(
-                    COMMAND_TEMPLATES[6],
-                    workshop_id,
-                    content_path=content_path,
-                    desc_path=desc_path,
-                    title=title,
-                    visibility=visibility,
-                    tags=tags,
-                    preview=preview_path
-                )
-                execution_logs.append(out)
-                return execution_logs, ok, False
+            values = {
+                'content_path': content_path,
+                'desc_path': desc_path,
+                'title': title,
+                'visibility': visibility,
+                'tags': tags,
+                'preview': preview_path,
+            }
+            template, kwargs = build_upload_call(selected, values)
+            if template is None:
+                execution_logs.append(f"{RED}ERROR: No combined template available in {COMMANDS_FILE}{RESET}")
+                return execution_logs, False, False
+
+            ok, out = execute_upload_live(template, workshop_id, **kwargs)
+            execution_logs.append(out)
+            return execution_logs, ok, False
+
+# -----------
+# Job Journal
+# -----------
+
+def journal_append(record, path=JOURNAL_FILE):
+    """
+    Append one record to a job journal and force it to disk. Menu and CLI batches use JOURNAL_FILE,
+    the upload daemon DAEMON_JOURNAL_FILE, so neither resumes jobs the other is still running.
+    """
+    record['at'] = time.time()
+    line = json.dumps(record) + "\n"
+    with JOURNAL_LOCK:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path, 'a', encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"{RED}ERROR writing to {path}: {e}{RESET}")
+
+
+def load_journal(path=JOURNAL_FILE):
+    """Replay a journal into {job_id: {'job', 'attempts', 'status'}}. A torn last line is ignored."""
+    jobs = {}
+    if not os.path.exists(path):
+        return jobs
+    try:
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                job_id = record.get('id')
+                if record.get('event') == 'queued':
+                    jobs[job_id] = {'job': record['job'], 'attempts': 0, 'status': 'pending'}
+                elif job_id in jobs and record.get('event') == 'attempt':
+                    jobs[job_id]['attempts'] = record['attempt']
+                elif job_id in jobs and record.get('event') == 'finished':
+                    jobs[job_id]['status'] = record['status']
+    except Exception as e:
+        print(f"{RED}ERROR reading {path}: {e}{RESET}")
+    return jobs
+
+
+def pending_journal_jobs(path=JOURNAL_FILE):
+    """Jobs queued in an earlier session that never finished, with their attempt counts."""
+    pending = []
+    for job_id, entry in load_journal(path).items():
+        if entry['status'] == 'pending':
+            job = dict(entry['job'], id=job_id, attempts=entry['attempts'], journal=path)
+            pending.append(job)
+    return pending
+
+
+def compact_journal(path=JOURNAL_FILE):
+    """Rewrite a journal keeping only unfinished jobs; remove it when nothing is left."""
+    pending = pending_journal_jobs(path)
+    with JOURNAL_LOCK:
+        try:
+            if not pending:
+                if os.path.exists(path):
+                    os.remove(path)
+                return
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                for job in pending:
+                    queued = {k: v for k, v in job.items() if k not in JOURNAL_RUNTIME_KEYS}
+                    f.write(json.dumps({'event': 'queued', 'id': job['id'], 'job': queued, 'at': time.time()}) + "\n")
+                    if job['attempts']:
+                        f.write(json.dumps({'event': 'attempt', 'id': job['id'], 'attempt': job['attempts'], 'ok': False, 'at': time.time()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"{RED}ERROR writing to {path}: {e}{RESET}")
+
+
+def journal_jobs(jobs, path=JOURNAL_FILE):
+    """Give each job an id and record it as queued in the journal at path."""
+    for job in jobs:
+        job['id'] = uuid.uuid4().hex
+        job['journal'] = path
+        job.setdefault('attempts', 0)
+        queued = {k: v for k, v in job.items() if k not in JOURNAL_RUNTIME_KEYS}
+        journal_append({'event': 'queued', 'id': job['id'], 'job': queued}, path)
+    return jobs
+
+
+def abandon_journal_jobs(jobs):
+    for job in jobs:
+        journal_append({'event': 'finished', 'id': job['id'], 'status': 'abandoned'})
+    compact_journal()
+
+
+def retry_delay(attempt):
+    """Exponential backoff with jitter: half the capped delay plus a random share of the other half."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_retryable(result):
+    """Whether a failed run_upload_job result is transient (see RETRYABLE_ERESULTS) and worth another attempt."""
+    if result['status'] in RETRYABLE_STATUSES:
+        return True
+    if result['status'] != 'failed':
+        return False
+    exit_code = result.get('exit_code')
+    return bool(result.get('steam_init_failed') or result.get('error_code') in RETRYABLE_ERESULTS
+                or (exit_code is not None and exit_code < 0))
+
+
+async def run_journaled_job(job, stop_event, cancel_event=None):
+    """
+    Run a job on the execution engine until it succeeds, fails permanently or runs out of attempts,
+    journaling every attempt. Only transient failures (see is_retryable) are retried; a stop request,
+    or Steam being unavailable (see steam_gate), leaves the job pending.
+    cancel_event also stops a running uploader process (see stream_command_async).
+    """
+    import asyncio
+    attempts = job.get('attempts', 0)
+    while True:
+        attempts += 1
+        result = await run_upload_job_async(job, attempts, cancel_event, stop_event)
+        result['attempts'] = attempts
+        # journal_append fsyncs, which must not stall the engine loop
+        await asyncio.to_thread(journal_append, {'event': 'attempt', 'id': job['id'], 'attempt': attempts, 'ok': result['ok']}, job['journal'])
+        if result['ok']:
+            status = 'succeeded'
+            break
+        if result['status'] == 'unavailable':
+            result['canceled'] = result['unavailable'] = True
+            return result
+        if stop_event.is_set():
+            result['canceled'] = True
+            return result
+        if not is_retryable(result) or attempts >= RETRY_ATTEMPTS:
+            status = 'failed'
+            break
+        retry_at = time.monotonic() + retry_delay(attempts)
+        while not stop_event.is_set() and time.monotonic() < retry_at:
+            await asyncio.sleep(min(ENGINE_POLL, max(0.0, retry_at - time.monotonic())))
+        if stop_event.is_set():
+            result['canceled'] = True
+            return result
+    await asyncio.to_thread(journal_append, {'event': 'finished', 'id': job['id'], 'status': status}, job['journal'])
+    return result
+
+
+# ------------
+# Batch Upload
+# ------------
+
+def resolve_mod_selection(raw):
+    """
+    Resolve a batch selection to mod names, in the order they were selected.
+    Accepts 'all', a comma-separated list of numbers and/or names, name patterns such as 'Zed*',
+    'tag:<tag>' or 'id:<workshop id>'.
+    """
+    names = mod_catalog()['names']
+    raw = raw.strip()
+    if raw.upper() in ('A', 'ALL', '*'):
+        return list(names)
+
+    selected = []
+    for part in [p.strip() for p in raw.split(',') if p.strip()]:
+        if part.isdigit() and 1 <= int(part) <= len(names):
+            matches = [names[int(part) - 1]]
+        elif part.lower().startswith(('tag:', 'id:')):
+            matches = search_mods(part)
+        elif part in MODS:
+            matches = [part]
+        else:
+            matches = [name for name in names if fnmatch.fnmatch(name.lower(), part.lower())]
+        for name in matches:
+            if name not in selected:
+                selected.append(name)
+    return selected
+
+
+def get_batch_workers():
+    default = SETTINGS.get('DEFAULT_BATCH_WORKERS') or '4'
+    while True:
+        raw = input(f"Parallel uploads [{YELLOW}{default}{RESET}]: ").strip()
+        if not raw:
+            raw = default
+        if raw.isdigit() and int(raw) > 0:
+            SETTINGS['DEFAULT_BATCH_WORKERS'] = raw
+            clear_screen()
+            return int(raw)
+        print(f"{RED}Invalid value. Please enter a number greater than 0.{RESET}")
+
+
+def build_batch_jobs(mod_names, selected, values, base_path):
+    """Create one upload job per mod. The content path is resolved per mod, other values are shared."""
+    jobs = []
+    for mod_name in mod_names:
+        job_values = dict(values)
+        if '1' in selected:
+            job_values['content_path'] = os.path.join(base_path, mod_name, 'Contents')
+        template, kwargs = build_upload_call(selected, job_values)
+        jobs.append({
+            'mod_name': mod_name,
+            'workshop_id': MODS.get(mod_name, ''),
+            'template': template,
+            'kwargs': kwargs or {},
+        })
+    return jobs
+
+
+def run_upload_job(job, attempt=1, cancel_event=None, stop_event=None, on_event=None):
+    cancel_event = cancel_event if cancel_event is not None else threading.Event()
+    return wait_on_engine(run_upload_job_async(job, attempt, cancel_event, stop_event, on_event), cancel_event)
+
+
+async def run_upload_job_async(job, attempt=1, cancel_event=None, stop_event=None, on_event=None):
+    start = time.perf_counter()
+    metrics = {'mod_name': job['mod_name'], 'attempt': attempt, 'status': 'error'}
+    if job['template'] is None:
+        ok, out = False, f"{RED}ERROR: No combined template available in {COMMANDS_FILE}{RESET}"
+    else:
+        ok, out = await execute_upload_async(job['template'], job['workshop_id'], on_event=on_event, metrics=metrics,
+                                             cancel_event=cancel_event, stop_event=stop_event, **job['kwargs'])
+    return {
+        'mod_name': job['mod_name'],
+        'workshop_id': job['workshop_id'],
+        'ok': ok,
+        'status': metrics['status'],
+        'exit_code': metrics.get('exit_code'),
+        'error_code': metrics.get('error_code'),
+        'steam_init_failed': metrics.get('steam_init_failed', False),
+        'log_path': metrics.get('log_path'),
+        'output': out,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def run_batch(jobs, max_workers, on_result=None):
+    """
+    Run upload jobs as coroutines on the execution engine, at most max_workers at a time (an asyncio.Semaphore),
+    journaling and retrying each one. A job waiting for an upload slot or for SteamUploader holds no thread.
+    on_result(result, done_count, total) is called from the main thread as each job finishes.
+    Every job is pre-flight checked first (in parallel); rejected jobs are never launched and come
+    first in the results, the others follow in job order. Jobs not finished before Ctrl+C are
+    reported as canceled and stay in the journal so the next session can resume them.
+    """
+    import asyncio
+    rejected = []
+    reports = preflight_jobs(jobs)
+    accepted = []
+    for job, report in zip(jobs, reports):
+        if report['errors']:
+            if job.get('id'):
+                journal_append({'event': 'finished', 'id': job['id'], 'status': 'rejected'}, job.get('journal', JOURNAL_FILE))
+            rejected.append({
+                'mod_name': job['mod_name'],
+                'workshop_id': job['workshop_id'],
+                'ok': False,
+                'rejected': True,
+                'output': format_preflight_errors(report),
+                'elapsed': report['elapsed'],
+                'attempts': 0,
+            })
+        else:
+            accepted.append(job)
+    if rejected:
+        print(f"{YELLOW}{len(rejected)} job(s) rejected by pre-flight checks.{RESET}")
+        if on_result:
+            for i, result in enumerate(rejected):
+                on_result(result, i + 1, len(jobs))
+    jobs = [job if job.get('id') else journal_jobs([job])[0] for job in accepted]
+    stop_event = threading.Event()
+    results = [None] * len(jobs)
+    limit = asyncio.Semaphore(max(1, max_workers))
+
+    async def run_limited(job):
+        async with limit:
+            if stop_event.is_set():
+                return None
+            return await run_journaled_job(job, stop_event)
+
+    # Metadata-only jobs are submitted first so they are not stuck behind content uploads
+    submit_order = sorted(range(len(jobs)), key=lambda i: LANE_PRIORITY[job_lane(jobs[i])])
+    loop = engine_loop()
+    futures = {asyncio.run_coroutine_threadsafe(run_limited(jobs[i]), loop): i for i in submit_order}
+    done = 0
+    try:
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            done += 1
+            if on_result:
+                on_result(results[i], done + len(rejected), len(jobs) + len(rejected))
+    except KeyboardInterrupt:
+        stop_event.set()
+        wake_upload_waiters()
+        print(f"{YELLOW}Batch interrupted, waiting for running uploads to finish...{RESET}")
+    finally:
+        wait_futures(futures)
+        compact_journal()
+
+    for future, i in futures.items():
+        if results[i] is None:
+            results[i] = future.result()
+            if results[i] is None:
+                results[i] = {
+                    'mod_name': jobs[i]['mod_name'],
+                    'workshop_id': jobs[i]['workshop_id'],
+                    'ok': False,
+                    'canceled': True,
+                    'output': f"{YELLOW}Canceled before start{RESET}",
+                    'elapsed': 0.0,
+                    'attempts': jobs[i].get('attempts', 0),
+                }
+    return rejected + results
+
+
+def print_batch_progress(result, done, total):
+    if result.get('rejected'):
+        status = f"{RED}REJECTED{RESET}"
+    elif result.get('canceled'):
+        status = f"{YELLOW}CANCELED{RESET}"
+    else:
+        status = f"{GREEN}OK{RESET}" if result['ok'] else f"{RED}FAILED{RESET}"
+    print(f"[{done}/{total}] {result['mod_name']} - {status} ({result['elapsed']:.1f}s)")
+
+
+def print_batch_report(results, elapsed):
+    """Print the per-job table, the logs of failed jobs and the totals. Returns (ok, failed, canceled) counts."""
+    print(f"{CYAN}=== BATCH SUMMARY ==={RESET}")
+    if results:
+        name_width = max(len("MOD_NAME"), max(len(r['mod_name']) for r in results))
+        wid_width = max(len("WORKSHOP_ID"), max(len(r['workshop_id'] or 'MISSING ID') for r in results))
+        header = f"{'MOD_NAME'.ljust(name_width)} | {'WORKSHOP_ID'.ljust(wid_width)} | STATUS   | TRIES | TIME"
+        print(header)
+        print("-" * len(header))
+        for r in results:
+            if r.get('canceled'):
+                status = f"{YELLOW}CANCELED{RESET}"
+            elif r.get('rejected'):
+                status = f"{RED}REJECTED{RESET}"
+            elif r['ok']:
+                status = f"{GREEN}OK      {RESET}"
+            else:
+                status = f"{RED}FAILED  {RESET}"
+            tries = str(r.get('attempts', 1)).ljust(5)
+            print(f"{r['mod_name'].ljust(name_width)} | {(r['workshop_id'] or 'MISSING ID').ljust(wid_width)} | {status} | {tries} | {r['elapsed']:.1f}s")
+
+    failed = [r for r in results if not r['ok'] and not r.get('canceled')]
+    for r in failed:
+        print(f"\n{RED}--- {r['mod_name']} ---{RESET}")
+        print(r['output'])
+
+    ok_count = sum(1 for r in results if r['ok'])
+    canceled_count = sum(1 for r in results if r.get('canceled'))
+    log_paths = [r['log_path'] for r in results if r.get('log_path')]
+    if log_paths:
+        print(f"\n{CYAN}Log files:{RESET}")
+        for path in dict.fromkeys(log_paths):
+            print(f"  {os.path.abspath(path)}")
+    unavailable = [r for r in results if r.get('unavailable')]
+    if unavailable:
+        print(f"\n{YELLOW}{len(unavailable)} job(s) not started:{RESET} {unavailable[0]['output'].strip()}")
+    print(f"\nTotal time: {elapsed:.1f}s")
+    if canceled_count:
+        print(f"{YELLOW}Canceled jobs stay in the job journal and can be resumed from Batch Upload.{RESET}")
+    color = GREEN if not failed and not canceled_count else (YELLOW if ok_count else RED)
+    print(f"{color}=== BATCH COMPLETE: {ok_count} ok, {len(failed)} failed, {canceled_count} canceled ==={RESET}")
+    return ok_count, len(failed), canceled_count
+
+
+def show_batch_summary(results, elapsed):
+    clear_screen()
+    ok_count, _, _ = print_batch_report(results, elapsed)
+    if ok_count:
+        save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
+    input("Press Enter to continue...")
+    clear_screen()
+
+
+def resume_batch_flow():
+    """Offer to resume jobs left unfinished by an earlier session. Returns True if they were handled."""
+    pending = pending_journal_jobs()
+    if not pending:
+        return False
+    clear_screen()
+    print(f"{CYAN}=== UNFINISHED BATCH ==={RESET}")
+    for job in pending:
+        print(f"{job['mod_name']} [{job['workshop_id'] or 'MISSING ID'}] - {job['attempts']} attempt(s) so far")
+    print()
+    while True:
+        choice = input("Resume these jobs? (y/n or d to discard them): ").strip().lower()
+        if choice in ('y', 'n', 'd'):
+            break
+        print(f"{RED}Invalid input. Please enter y, n, or d.{RESET}")
+    clear_screen()
+    if choice == 'n':
+        return False
+    if choice == 'd':
+        abandon_journal_jobs(pending)
+        return False
+
+    workers = get_batch_workers()
+    print(f"{CYAN}=== RESUMING BATCH ==={RESET}")
+    start = time.perf_counter()
+    results = run_batch(pending, workers, on_result=print_batch_progress)
+    show_batch_summary(results, time.perf_counter() - start)
+    return True
+
+
+def batch_upload_flow(base_path):
+    if resume_batch_flow():
+        return
+
+    if not MODS:
+        clear_screen()
+        print(f"{YELLOW}No mods found in mods.txt{RESET}")
+        input("Press Enter to continue...")
+        clear_screen()
+        return
+
+    page = 0
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== BATCH UPLOAD: SELECT MODS ==={RESET}")
+        pages = print_mod_page(mod_catalog()['names'], page)
+        if pages > 1:
+            print("N/P) Next / previous page")
+        print("Q) Go back\n")
+        raw = input(f"All, numbers/names (comma-separated), a pattern like Zed*, tag:<tag> or id:<id>\nSelect Mods [{YELLOW}all{RESET}]: ").strip()
+        if raw.upper() == 'Q':
+            clear_screen()
+            return
+        if raw.upper() in ('N', 'P'):
+            page = min(pages - 1, page + 1) if raw.upper() == 'N' else max(0, page - 1)
+            continue
+        mod_names = resolve_mod_selection(raw or 'all')
+        if mod_names:
+            break
+        input(f"{RED}No mods matched. Press Enter to try again...{RESET}")
+
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== BATCH UPLOAD: OPTIONS ==={RESET}")
+        print(f"Mods selected: {YELLOW}{len(mod_names)}{RESET}")
+        print("1) Content")
+        print("2) Description")
+        print("4) Visibility")
+        print("5) Tags")
+        print("6) Preview")
+        print("Q) Go back\n")
+        raw = input(f"Single or multiple (comma-separated).\nSelect Options [{YELLOW}1{RESET}]: ").strip().upper() or '1'
+        if raw == 'Q':
+            clear_screen()
+            return
+        parts = [p.strip() for p in raw.split(',')]
+        selected = [p for p in ('1', '2', '4', '5', '6') if p in parts]
+        if selected:
+            break
+        input(f"{RED}No valid option selected. Press Enter to try again...{RESET}")
+
+    values = {}
+    if '2' in selected:
+        clear_screen()
+        values['desc_path'] = get_description_file()
+        if not values['desc_path']:
+            show_execution_results([], False, canceled=True)
+            return
+    if '4' in selected:
+        clear_screen()
+        values['visibility'] = get_visibility()
+        if values['visibility'] is None:
+            show_execution_results([], False, canceled=True)
+            return
+        SETTINGS['DEFAULT_VISIBILITY'] = values['visibility']
+    if '5' in selected:
+        clear_screen()
+        values['tags'] = get_tags()
+    if '6' in selected:
+        clear_screen()
+        values['preview'] = get_preview_file()
+        if not values['preview']:
+            show_execution_results([], False, canceled=True)
+            return
+
+    clear_screen()
+    workers = get_batch_workers()
+    jobs = build_batch_jobs(mod_names, selected, values, base_path)
+
+    print(f"{CYAN}=== BATCH SUMMARY ==={RESET}")
+    print(f"Mods: {YELLOW}{', '.join(mod_names)}{RESET}")
+    if '1' in selected:
+        print(f"Content path: {YELLOW}{os.path.join(base_path, '<mod>', 'Contents')}{RESET}")
+    if values.get('desc_path'):
+        print(f"Description file: {YELLOW}{os.path.basename(values['desc_path'])}{RESET} ({values['desc_path']})")
+    if values.get('visibility') is not None:
+        print(f"Visibility: {YELLOW}{VISIBILITY_MAP.get(values['visibility'], values['visibility'])}{RESET}")
+    if values.get('tags') == "__CLEAR__":
+        print(f"Tags: {YELLOW}\"\"{RESET} (will clear all tags)")
+    elif values.get('tags'):
+        print(f"Tags: {YELLOW}{values['tags']}{RESET}")
+    if values.get('preview'):
+        print(f"Preview image: {YELLOW}{os.path.basename(values['preview'])}{RESET} ({values['preview']})")
+    print(f"Parallel uploads: {YELLOW}{workers}{RESET}")
+
+    if not confirm_action(f"batch upload of {len(jobs)} mods"):
+        show_execution_results([], False, canceled=True)
+        return
+
+    if daemon_available():
+        status, response = daemon_request('POST', '/jobs', daemon_payload(mod_names, selected, values))
+        clear_screen()
+        if status == 202:
+            print(f"{GREEN}Upload daemon is running, queued {len(response['jobs'])} job(s) there:{RESET}")
+            print_daemon_jobs(response['jobs'])
+        for rejected in (response.get('rejected', []) if isinstance(response, dict) else []):
+            print(f"{RED}{rejected['mod_name']}: {'; '.join(rejected['errors'])}{RESET}")
+        if status != 202:
+            print(f"{RED}ERROR: {response.get('error') if isinstance(response, dict) else response}{RESET}")
+        input("Press Enter to continue...")
+        clear_screen()
+        return
+
+    print(f"{CYAN}=== RUNNING BATCH ==={RESET}")
+    start = time.perf_counter()
+    results = run_batch(jobs, workers, on_result=print_batch_progress)
+    show_batch_summary(results, time.perf_counter() - start)
+
+
+# -----------------
+# Workshop Manifest
+# -----------------
+
+def load_workshop_manifest(path):
+    """
+    Read a workshop manifest ({"mods": {"<ModName>": {"content": true, "title": ..., ...}}}).
+    Returns (entries, None) or (None, error message). Relative file paths are resolved against
+    the folder of the manifest.
+    """
+    try:
+        with open(path, 'r', encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return None, f"Cannot read {path}: {e}"
+    mods = data.get('mods') if isinstance(data, dict) else None
+    if not isinstance(mods, dict):
+        return None, f"{path}: expected an object with a \"mods\" section"
+
+    root = os.path.dirname(os.path.abspath(path))
+    entries = {}
+    for mod_name, entry in mods.items():
+        if not isinstance(entry, dict):
+            return None, f"{path}: mods.{mod_name} must be an object"
+        unknown = [key for key in entry if key not in WORKSHOP_MANIFEST_FIELDS]
+        if unknown:
+            return None, f"{path}: unknown field(s) {', '.join(unknown)} in mods.{mod_name}"
+        entry = dict(entry)
+        for key in ('content', 'description', 'preview'):
+            if isinstance(entry.get(key), str) and entry[key]:
+                entry[key] = os.path.join(root, os.path.expandvars(entry[key]))
+        entries[mod_name] = entry
+    return entries, None
+
+
+def changed_content_stats(previous, manifest):
+    """(files, bytes) in manifest that are new or differ from the previous manifest."""
+    old_files = (previous or {}).get('files', {})
+    sizes = [
+        entry['size'] for rel, entry in manifest['files'].items()
+        if rel not in old_files or old_files[rel]['hash'] != entry['hash']
+    ]
+    return len(sizes), sum(sizes)
+
+
+def metadata_bytes(key, value):
+    if value == '__CLEAR__':
+        return 0
+    if key in ('desc_path', 'preview'):
+        return os.path.getsize(os.path.expandvars(value))
+    return len(str(value).encode('utf-8'))
+
+
+def plan_mod(mod_name, entry, base_path):
+    """
+    Diff one manifest entry against the content manifest and metadata state stored for its
+    Workshop ID. Nothing is uploaded. Returns {'mod_name', 'workshop_id', 'job' (None when the
+    mod is in sync), 'changed', 'unchanged', 'files', 'bytes', 'error'}.
+    """
+    wid = str(entry.get('workshop_id') or MODS.get(mod_name) or '')
+    plan = {'mod_name': mod_name, 'workshop_id': wid, 'job': None, 'changed': [], 'unchanged': [],
+            'files': 0, 'bytes': 0, 'error': None}
+    if not wid:
+        plan['error'] = f"No Workshop ID (add the mod to {MODS_FILE} or set workshop_id)"
+        return plan
+
+    visibility = entry.get('visibility')
+    if visibility is not None:
+        visibility = VISIBILITY_NAMES.get(str(visibility).lower(), str(visibility))
+    tags = entry.get('tags')
+    if isinstance(tags, list):
+        tags = ",".join(str(tag) for tag in tags)
+    title = entry.get('title')
+    selected, values, message = parse_upload_fields(
+        bool(entry.get('content')), entry.get('description'),
+        None if title is None else str(title), visibility, tags, entry.get('preview'))
+    if selected is None:
+        plan['error'] = message
+        return plan
+
+    if '1' in selected:
+        content = entry['content']
+        values['content_path'] = content if isinstance(content, str) else os.path.join(base_path, mod_name, 'Contents')
+        if not os.path.isdir(os.path.expandvars(values['content_path'])):
+            plan['error'] = f"Content folder not found: {values['content_path']}"
+            return plan
+        # Filter the Contents folder in memory; staging it would change the disk during a dry run
+        resolved = os.path.expandvars(values['content_path'])
+        changed, manifest = check_content_changes(wid, resolved, load_ignore_rules(resolved))
+        if changed:
+            plan['files'], content_bytes = changed_content_stats(load_manifest(wid), manifest)
+            plan['bytes'] += content_bytes
+            plan['changed'].append('content_path')
+        else:
+            plan['unchanged'].append('content_path')
+
+    if is_description_template(values.get('desc_path')):
+        rendered = render_description(values['desc_path'], mod_name, wid, base_path)
+        if rendered['error']:
+            plan['error'] = rendered['error']
+            return plan
+        values['desc_path'] = rendered['path']
+    fingerprints = {key: metadata_fingerprint(key, values[key]) for key in METADATA_FIELDS if key in values}
+    changed, unchanged = changed_metadata(wid, fingerprints)
+    plan['unchanged'].extend(unchanged)
+    for key in changed:
+        plan['changed'].append(key)
+        plan['bytes'] += metadata_bytes(key, values[key])
+
+    if plan['changed']:
+        options = sorted(opt for opt, (_, key) in UPLOAD_OPTIONS.items() if key in plan['changed'])
+        template, kwargs = build_upload_call(options, values)
+        plan['job'] = {'mod_name': mod_name, 'workshop_id': wid, 'template': template, 'kwargs': kwargs or {}}
+        if template is None:
+            plan['error'] = f"No combined template available in {COMMANDS_FILE}"
+    return plan
+
+
+def plan_workshop(entries, base_path, max_workers=None):
+    """Run plan_mod for every manifest entry in parallel. Returns the plans in manifest order."""
+    def safe_plan(item):
+        try:
+            return plan_mod(item[0], item[1], base_path)
+        except Exception as e:
+            return {'mod_name': item[0], 'workshop_id': str(item[1].get('workshop_id') or MODS.get(item[0]) or ''),
+                    'job': None, 'changed': [], 'unchanged': [], 'files': 0, 'bytes': 0, 'error': str(e)}
+
+    if not entries:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 4) * 2)) as pool:
+        return list(pool.map(safe_plan, entries.items()))
+
+
+def print_workshop_plan(plans):
+    """Print the calls a plan would make. Returns the jobs to run (plans without errors that have changes)."""
+    jobs, in_sync, errors, total_bytes = [], 0, 0, 0
+    for plan in plans:
+        if plan['error']:
+            errors += 1
+            print(f"{RED}! {plan['mod_name']} ({plan['workshop_id'] or 'MISSING ID'}): {plan['error']}{RESET}")
+            continue
+        if not plan['job']:
+            in_sync += 1
+            continue
+        job = plan['job']
+        jobs.append(job)
+        total_bytes += plan['bytes']
+        fields = []
+        for key in plan['changed']:
+            if key == 'content_path':
+                fields.append(f"content ({plan['files']} file(s))")
+            else:
+                fields.append(METADATA_FIELDS[key][1])
+        print(f"{YELLOW}~ {plan['mod_name']}{RESET} ({job['workshop_id']}): {', '.join(fields)}, ~{format_bytes(plan['bytes'])}")
+        if plan['unchanged']:
+            unchanged = ", ".join('content' if key == 'content_path' else METADATA_FIELDS[key][1] for key in plan['unchanged'])
+            print(f"    unchanged: {unchanged}")
+        argv = build_command(job['template'], job['workshop_id'], **job['kwargs'])
+        print(f"    {CYAN}COMMAND_TEMPLATES[{COMMAND_TEMPLATES.index(job['template'])}]{RESET} {format_command(argv)}")
+
+    color = RED if errors else (YELLOW if jobs else GREEN)
+    print(f"{color}Plan: {len(jobs)} call(s), ~{format_bytes(total_bytes)} to upload, {in_sync} mod(s) in sync, {errors} error(s).{RESET}")
+    return jobs
+
+
+# ----------
+# Watch Mode
+# ----------
+
+def snapshot_contents(content_path, rules):
+    """Cheap polling snapshot: {relative_path: (size, mtime_ns)} of the files not ignored by the rules, None if missing."""
+    if not os.path.isdir(content_path):
+        return None
+    files = {}
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(content_path, rel_dir)) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_ignored(rel, is_dir, rules):
+                        continue
+                    if is_dir:
+                        stack.append(rel)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[rel] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            continue
+    return files
+
+
+def watch_upload(mod_name, base_path):
+    """Pre-flight and run one content upload for a watched mod, printing a one-line result."""
+    job = build_batch_jobs([mod_name], ['1'], {}, base_path)[0]
+    stamp = time.strftime('%H:%M:%S')
+    report = preflight_job(job)
+    if report['errors']:
+        output = format_preflight_errors(report)
+        print(f"[{stamp}] {RED}{mod_name}: not uploaded{RESET}")
+        print(output)
+        return {'mod_name': mod_name, 'workshop_id': job['workshop_id'], 'ok': False, 'rejected': True,
+                'output': output, 'elapsed': report['elapsed']}
+
+    print(f"[{stamp}] {CYAN}{mod_name}: uploading content...{RESET}")
+
+    def on_event(event):
+        # The mod's upload lock is held elsewhere (menu, batch or daemon); execute_upload waits for it
+        if event.get('waiting'):
+            print(f"[{time.strftime('%H:%M:%S')}] {YELLOW}{mod_name}: another upload of this mod is running, waiting for it...{RESET}")
+
+    result = run_upload_job(job, on_event=on_event)
+    if not result['ok']:
+        print(f"[{time.strftime('%H:%M:%S')}] {RED}{mod_name}: upload failed ({result['elapsed']:.1f}s){RESET}")
+        print(result['output'])
+    elif result['status'] == 'skipped':
+        print(f"[{time.strftime('%H:%M:%S')}] {YELLOW}{mod_name}: content unchanged, nothing uploaded{RESET}")
+    else:
+        print(f"[{time.strftime('%H:%M:%S')}] {GREEN}{mod_name}: uploaded ({result['elapsed']:.1f}s){RESET}")
+    return result
+
+
+def watch_mods(mod_names, base_path, interval=WATCH_INTERVAL, quiet=WATCH_QUIET, stop_event=None):
+    """
+    Poll the Contents folders of the given mods and upload a folder (through execute_upload) once its
+    changes have been quiet for `quiet` seconds. An upload started elsewhere for the same mod is waited for
+    (see acquire_mod_lock), never run alongside. A burst of saves coalesces into one upload; a folder
+    that never settles is uploaded WATCH_MAX_DELAY seconds after its first change. Changes made during
+    an upload are picked up by the next poll. Runs until Ctrl+C or stop_event; returns the upload results.
+    """
+    watched = {}
+    for name in mod_names:
+        content_path = os.path.join(base_path, name, 'Contents')
+        ignore_file = os.path.join(base_path, name, IGNORE_FILE_NAME)
+        rules = load_ignore_rules(content_path)
+        watched[name] = {
+            'path': content_path, 'ignore_file': ignore_file, 'ignore_mtime': path_mtime(ignore_file),
+            'rules': rules, 'snapshot': snapshot_contents(content_path, rules),
+            'first_change': None, 'last_change': None,
+        }
+
+    print(f"{CYAN}Watching {len(watched)} mod(s), polling every {interval:g}s, uploading after {quiet:g}s without changes.{RESET}")
+    print(f"{YELLOW}Press Ctrl+C to stop.{RESET}")
+    results = []
+    try:
+        while not (stop_event and stop_event.is_set()):
+            for name, state in watched.items():
+                ignore_mtime = path_mtime(state['ignore_file'])
+                if ignore_mtime != state['ignore_mtime']:
+                    state['ignore_mtime'] = ignore_mtime
+                    state['rules'] = load_ignore_rules(state['path'])
+                snapshot = snapshot_contents(state['path'], state['rules'])
+                now = time.monotonic()
+                if snapshot != state['snapshot']:
+                    state['snapshot'] = snapshot
+                    if state['first_change'] is None:
+                        state['first_change'] = now
+                        print(f"[{time.strftime('%H:%M:%S')}] {name}: change detected, waiting for it to settle...")
+                    state['last_change'] = now
+                if state['last_change'] is None:
+                    continue
+                if now - state['last_change'] >= quiet or now - state['first_change'] >= WATCH_MAX_DELAY:
+                    state['first_change'] = state['last_change'] = None
+                    results.append(watch_upload(name, base_path))
+                    if results[-1].get('status') == 'canceled':
+                        raise KeyboardInterrupt
+            if stop_event:
+                stop_event.wait(interval)
+            else:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}Watch mode stopped.{RESET}")
+    return results
+
+
+def watch_mode_flow(base_path):
+    if not MODS:
+        clear_screen()
+        print(f"{YELLOW}No mods found in mods.txt{RESET}")
+        input("Press Enter to continue...")
+        clear_screen()
+        return
+
+    page = 0
+    while True:
+        clear_screen()
+        print(f"{CYAN}=== WATCH MODE: SELECT MODS ==={RESET}")
+        pages = print_mod_page(mod_catalog()['names'], page)
+        if pages > 1:
+            print("N/P) Next / previous page")
+        print("Q) Go back\n")
+        raw = input("Numbers/names (comma-separated), a pattern like Zed*, tag:<tag> or id:<id>\nSelect Mods: ").strip()
+        if raw.upper() == 'Q':
+            clear_screen()
+            return
+        if raw.upper() in ('N', 'P'):
+            page = min(pages - 1, page + 1) if raw.upper() == 'N' else max(0, page - 1)
+            continue
+        mod_names = resolve_mod_selection(raw) if raw else []
+        if mod_names:
+            break
+        input(f"{RED}No mods matched. Press Enter to try again...{RESET}")
+
+    clear_screen()
+    print(f"{CYAN}=== WATCH MODE ==={RESET}")
+    print(f"Mods: {YELLOW}{', '.join(mod_names)}{RESET}")
+    results = watch_mods(mod_names, base_path)
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"\nUploads: {len(results)}, failed: {RED if failed else GREEN}{failed}{RESET}")
+    input("Press Enter to continue...")
+    clear_screen()
+
+
+# -------------
+# Upload Daemon
+# -------------
+
+def daemon_job_view(entry, with_output=False):
+    view = {key: entry[key] for key in ('id', 'mod_name', 'workshop_id', 'fields', 'status', 'attempts',
+                                         'submitted_at', 'started_at', 'finished_at', 'log_path')}
+    if with_output:
+        view['output'] = ANSI_ESCAPE.sub('', entry['output'])
+    return view
+
+
+def daemon_submit(payload):
+    """
+    Queue one job per selected mod. payload: {"mods": [...] or "mod": "...", "content": bool, "desc",
+    "title", "visibility", "tags", "preview", "force": bool, "timeout", "stall_timeout"}.
+    Returns (http status, response).
+    Jobs are pre-flight checked here; rejected jobs are reported but never queued.
+    """
+    raw_mods = payload.get('mods') or ([payload['mod']] if payload.get('mod') else [])
+    if isinstance(raw_mods, str):
+        raw_mods = [raw_mods]
+    if not isinstance(raw_mods, list) or not all(isinstance(part, str) for part in raw_mods):
+        return 400, {'error': "'mods' must be a name or a list of names"}
+    for key in ('desc', 'title', 'tags', 'preview', 'base_path'):
+        if payload.get(key) is not None and not isinstance(payload[key], str):
+            return 400, {'error': f"'{key}' must be a string"}
+    if payload.get('visibility') is not None and not isinstance(payload['visibility'], (str, int)):
+        return 400, {'error': "'visibility' must be 0, 1, 2 or 3"}
+    limits = {}
+    for key in ('timeout', 'stall_timeout'):
+        if payload.get(key) is not None:
+            value = payload[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                return 400, {'error': f"'{key}' must be a number of seconds (0 = no limit)"}
+            limits[key] = float(value)
+    mod_names = []
+    for part in raw_mods:
+        for name in ([part] if part in MODS else resolve_mod_selection(str(part))):
+            if name not in mod_names:
+                mod_names.append(name)
+    if not mod_names:
+        return 400, {'error': "No mods selected. Pass 'mods' (names, patterns, tag:, id: or 'all')."}
+
+    selected, values, message = parse_upload_fields(
+        bool(payload.get('content')), payload.get('desc'), payload.get('title'),
+        payload.get('visibility'), payload.get('tags'), payload.get('preview'))
+    if selected is None:
+        return 400, {'error': message}
+
+    jobs = build_batch_jobs(mod_names, selected, values, payload.get('base_path') or SETTINGS.get('DEFAULT_BASE_PATH'))
+    queued, rejected = [], []
+    for job, report in zip(jobs, preflight_jobs(jobs)):
+        job['kwargs']['force'] = bool(payload.get('force'))
+        job['kwargs'].update(limits)
+        if report['errors']:
+            rejected.append({'mod_name': job['mod_name'], 'errors': report['errors']})
+        else:
+            queued.append(job)
+
+    entries = daemon_enqueue(journal_jobs(queued, DAEMON_JOURNAL_FILE))
+    return (202 if entries else 400), {'jobs': entries, 'rejected': rejected, 'notes': message}
+
+
+def daemon_enqueue(jobs):
+    """Add journaled jobs to the daemon queue. Returns their job views."""
+    entries = []
+    with DAEMON['cond']:
+        for job in jobs:
+            entry = {
+                'id': job['id'], 'mod_name': job['mod_name'], 'workshop_id': job['workshop_id'],
+                'fields': [key for key in job['kwargs'] if key not in EXECUTION_OPTIONS],
+                'status': 'queued', 'attempts': job.get('attempts', 0),
+                'submitted_at': time.time(), 'started_at': None, 'finished_at': None, 'output': "", 'log_path': None,
+                'job': job, 'stop': threading.Event(), 'cancel': threading.Event(),
+            }
+            DAEMON['jobs'][job['id']] = entry
+            DAEMON['order'].append(job['id'])
+            entries.append(daemon_job_view(entry))
+        DAEMON['cond'].notify_all()
+    return entries
+
+
+def daemon_cancel(job_id):
+    """Cancel a queued job, or stop a running one and its uploader process. Returns (http status, response)."""
+    with DAEMON['cond']:
+        entry = DAEMON['jobs'].get(job_id)
+        if not entry:
+            return 404, {'error': f"Unknown job {job_id}"}
+        if entry['status'] == 'queued':
+            entry['status'] = 'canceled'
+            entry['finished_at'] = time.time()
+            journal_append({'event': 'finished', 'id': job_id, 'status': 'canceled'}, DAEMON_JOURNAL_FILE)
+        elif entry['status'] == 'running':
+            entry['status'] = 'canceling'
+            entry['stop'].set()
+            entry['cancel'].set()
+            wake_upload_waiters()
+        else:
+            return 409, {'error': f"Job {job_id} already {entry['status']}"}
+        return 200, daemon_job_view(entry)
+
+
+def next_daemon_job():
+    """
+    The next queued job whose mod (and Workshop ID) is not uploading right now: the oldest metadata-only
+    job first, then the oldest content upload. Call with the lock held.
+    """
+    candidates = [DAEMON['jobs'][job_id] for job_id in DAEMON['order']]
+    candidates = [entry for entry in candidates
+                  if entry['status'] == 'queued' and not {entry['mod_name'], entry['workshop_id']} & DAEMON['busy']]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda entry: LANE_PRIORITY[job_lane(entry['job'])])
+
+
+def prune_daemon_jobs():
+    """Forget the oldest finished jobs beyond DAEMON_KEEP_FINISHED. Call with the lock held."""
+    finished = [job_id for job_id in DAEMON['order'] if DAEMON['jobs'][job_id]['finished_at']]
+    for job_id in finished[:max(0, len(finished) - DAEMON_KEEP_FINISHED)]:
+        DAEMON['order'].remove(job_id)
+        del DAEMON['jobs'][job_id]
+
+
+def daemon_dispatcher(workers):
+    """
+    Start queued jobs as coroutines on the execution engine, at most `workers` at a time, until DAEMON['stop']
+    is set. Their futures are kept in DAEMON['tasks'] so serve_daemon can wait for them.
+    """
+    import asyncio
+    cond = DAEMON['cond']
+    while not DAEMON['stop'].is_set():
+        # While Steam is down or the circuit breaker is open, queued jobs wait instead of failing one by one
+        blocked = steam_gate()
+        with cond:
+            entry = None if blocked or DAEMON['running'] >= workers else next_daemon_job()
+            if entry is None:
+                cond.wait(1.0)
+                continue
+            entry['status'] = 'running'
+            entry['started_at'] = time.time()
+            DAEMON['busy'].update({entry['mod_name'], entry['workshop_id']})
+            DAEMON['running'] += 1
+            DAEMON['tasks'] = [task for task in DAEMON['tasks'] if not task.done()]
+            DAEMON['tasks'].append(asyncio.run_coroutine_threadsafe(run_daemon_job(entry), engine_loop()))
+
+
+async def run_daemon_job(entry):
+    import asyncio
+    try:
+        result = await run_journaled_job(entry['job'], entry['stop'], entry['cancel'])
+    except Exception as e:
+        result = {'ok': False, 'output': f"{RED}ERROR: {e}{RESET}", 'attempts': entry['job'].get('attempts', 0)}
+        await asyncio.to_thread(journal_append, {'event': 'finished', 'id': entry['id'], 'status': 'failed'}, DAEMON_JOURNAL_FILE)
+    await asyncio.to_thread(finish_daemon_job, entry, result)
+
+
+def finish_daemon_job(entry, result):
+    cond = DAEMON['cond']
+    with cond:
+        entry['output'] = result['output']
+        entry['log_path'] = result.get('log_path')
+        entry['attempts'] = result.get('attempts', 0)
+        entry['finished_at'] = time.time()
+        if result['ok']:
+            entry['status'] = 'succeeded'
+        elif result.get('unavailable') and not entry['cancel'].is_set():
+            entry['status'] = 'queued'
+            entry['started_at'] = entry['finished_at'] = None
+        elif result.get('canceled') and DAEMON['stop'].is_set():
+            entry['status'] = 'interrupted'
+        elif result.get('canceled'):
+            entry['status'] = 'canceled'
+            journal_append({'event': 'finished', 'id': entry['id'], 'status': 'canceled'}, DAEMON_JOURNAL_FILE)
+        else:
+            entry['status'] = 'failed'
+        DAEMON['busy'].difference_update({entry['mod_name'], entry['workshop_id']})
+        DAEMON['running'] -= 1
+        prune_daemon_jobs()
+        cond.notify_all()
+
+
+def daemon_request_handler():
+    """Build the daemon's request handler class (http.server is only imported when the daemon starts)."""
+    from http.server import BaseHTTPRequestHandler
+
+    class DaemonRequestHandler(BaseHTTPRequestHandler):
+        """JSON API: GET /jobs, POST /jobs, GET /jobs/<id>, POST /jobs/<id>/cancel (or DELETE /jobs/<id>), GET /mods, GET /health."""
+
+        def send_json(self, status, data):
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if not length:
+                return {}
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+
+        def route(self):
+            return [part for part in self.path.split('?')[0].split('/') if part]
+
+        def check_host(self):
+            # A DNS-rebound page reaches 127.0.0.1 under its own host name; only answer requests addressed to us
+            port = self.server.server_address[1]
+            host = (self.headers.get('Host') or '').strip().lower()
+            if host in (f"{DAEMON_HOST}:{port}", f"localhost:{port}"):
+                return True
+            self.send_json(403, {'error': f"Host must be {DAEMON_HOST}:{port} or localhost:{port}"})
+            return False
+
+        def do_GET(self):
+            if not self.check_host():
+                return
+            parts = self.route()
+            if parts == ['jobs']:
+                with DAEMON['cond']:
+                    jobs = [daemon_job_view(DAEMON['jobs'][job_id]) for job_id in DAEMON['order']]
+                self.send_json(200, {'jobs': jobs})
+            elif len(parts) == 2 and parts[0] == 'jobs':
+                with DAEMON['cond']:
+                    entry = DAEMON['jobs'].get(parts[1])
+                    view = daemon_job_view(entry, with_output=True) if entry else None
+                self.send_json(200, view) if view else self.send_json(404, {'error': f"Unknown job {parts[1]}"})
+            elif parts == ['health']:
+                self.send_json(200, steam_status())
+            elif parts == ['mods']:
+                self.send_json(200, {'mods': [{'name': name, 'workshop_id': MODS[name], 'tags': MOD_TAGS.get(name, [])}
+                                              for name in mod_catalog()['names']]})
+            else:
+                self.send_json(404, {'error': "Not found"})
+
+        def do_POST(self):
+            if not self.check_host():
+                return
+            # Browsers can send "simple" cross-site POSTs (text/plain, forms) without a CORS preflight;
+            # requiring application/json keeps web pages from queueing or canceling uploads
+            content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type != 'application/json':
+                self.send_json(415, {'error': "Content-Type must be application/json"})
+                return
+            parts = self.route()
+            if parts == ['jobs']:
+                try:
+                    payload = self.read_json()
+                except ValueError:
+                    self.send_json(400, {'error': "Request body must be JSON"})
+                    return
+                if not isinstance(payload, dict):
+                    self.send_json(400, {'error': "Request body must be a JSON object"})
+                    return
+                try:
+                    self.send_json(*daemon_submit(payload))
+                except Exception as e:
+                    self.send_json(500, {'error': f"Could not queue the jobs: {e}"})
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+                self.send_json(*daemon_cancel(parts[1]))
+            else:
+                self.send_json(404, {'error': "Not found"})
+
+        def do_DELETE(self):
+            if not self.check_host():
+                return
+            parts = self.route()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                self.send_json(*daemon_cancel(parts[1]))
+            else:
+                self.send_json(404, {'error': "Not found"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return DaemonRequestHandler
+
+
+def daemon_port():
+    try:
+        return int(SETTINGS.get('DEFAULT_DAEMON_PORT') or 8765)
+    except ValueError:
+        return 8765
+
+
+def serve_daemon(port=None, workers=None):
+    """
+    Run the upload daemon until Ctrl+C: a localhost HTTP/JSON API in front of a queue. daemon_dispatcher runs
+    at most `workers` jobs at a time as coroutines on the execution engine, through run_journaled_job
+    (journal, retries); a mod is never uploaded by two jobs at once. Jobs still running at shutdown stay pending in DAEMON_JOURNAL_FILE
+    and are queued again on the next start.
+    """
+    port = port or daemon_port()
+    workers = max(1, workers or int(SETTINGS.get('DEFAULT_BATCH_WORKERS') or 4))
+    from http.server import ThreadingHTTPServer
+    try:
+        server = ThreadingHTTPServer((DAEMON_HOST, port), daemon_request_handler())
+    except OSError as e:
+        print(f"{RED}ERROR: cannot listen on {DAEMON_HOST}:{port}: {e}{RESET}")
+        return 1
+
+    DAEMON['stop'].clear()
+    resumed = daemon_enqueue(pending_journal_jobs(DAEMON_JOURNAL_FILE))
+    if resumed:
+        print(f"{YELLOW}Resuming {len(resumed)} unfinished job(s) from the last daemon run.{RESET}")
+    dispatcher = threading.Thread(target=daemon_dispatcher, args=(workers,), name='daemon-dispatcher', daemon=True)
+    dispatcher.start()
+    print(f"{CYAN}Upload daemon listening on http://{DAEMON_HOST}:{port} with {workers} worker(s).{RESET}")
+    print(f"{YELLOW}Press Ctrl+C to stop.{RESET}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}Stopping daemon, waiting for running uploads to finish...{RESET}")
+    finally:
+        DAEMON['stop'].set()
+        with DAEMON['cond']:
+            for entry in DAEMON['jobs'].values():
+                entry['stop'].set()
+            DAEMON['cond'].notify_all()
+        wake_upload_waiters()
+        dispatcher.join()
+        with DAEMON['cond']:
+            tasks = list(DAEMON['tasks'])
+        wait_futures(tasks)
+        server.server_close()
+        compact_journal(DAEMON_JOURNAL_FILE)
+    return 0
+
+
+def daemon_request(method, path, payload=None, port=None):
+    """Call a running daemon. Returns (http status, response), or (None, error message) if it is not reachable."""
+    import urllib.error
+    import urllib.request
+    url = f"http://{DAEMON_HOST}:{port or daemon_port()}{path}"
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        try:
+            return e.code, json.loads(e.read().decode('utf-8'))
+        except ValueError:
+            return e.code, {'error': str(e)}
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        return None, str(e)
+
+
+def daemon_available():
+    status, _ = daemon_request('GET', '/jobs')
+    return status == 200
+
+
+def daemon_payload(mod_names, selected, values, force=False, timeout=None, stall_timeout=None):
+    """Turn menu / CLI selections into a POST /jobs payload."""
+    payload = {'mods': mod_names, 'force': force, 'timeout': timeout, 'stall_timeout': stall_timeout}
+    names = {'1': 'content', '2': 'desc', '3': 'title', '4': 'visibility', '5': 'tags', '6': 'preview'}
+    for opt in selected:
+        key = UPLOAD_OPTIONS[opt][1]
+        payload[names[opt]] = True if opt == '1' else values.get(key)
+    return payload
+
+
+def print_daemon_jobs(jobs):
+    if not jobs:
+        print(f"{YELLOW}No jobs.{RESET}")
+        return
+    name_width = max(len("MOD_NAME"), max(len(job['mod_name']) for job in jobs))
+    print(f"{'JOB_ID'.ljust(32)} | {'MOD_NAME'.ljust(name_width)} | {'STATUS'.ljust(11)} | FIELDS")
+    print("-" * (52 + name_width))
+    for job in jobs:
+        print(f"{job['id'].ljust(32)} | {job['mod_name'].ljust(name_width)} | {job['status'].ljust(11)} | {', '.join(job['fields'])}")
 
-            execution_logs.append(f"{RED}ERROR: No combined template available in {COMMANDS_FILE}{RESET}")
-            return execution_logs, False, False
 
 # ---------
 # Main Menu
@@ -821,6 +4878,8 @@ def main():
     load_settings()
     load_commands()
     load_mods()
+    if SETTINGS.get('DEFAULT_DISCOVER_MODS') == '1':
+        run_mod_discovery(SETTINGS.get('DEFAULT_BASE_PATH'))
     base_path = SETTINGS.get('DEFAULT_BASE_PATH')
     desc_base_path = SETTINGS.get('DEFAULT_DESCRIPTION_PATH')
     if not base_path or not desc_base_path:
@@ -838,11 +4897,17 @@ def main():
         print("6) Preview (-p)")
         print("7) Multiple Options")
         print("8) Manage Mods")
+        pending = len(pending_journal_jobs())
+        print(f"9) Batch Upload{f' ({YELLOW}{pending} unfinished{RESET})' if pending else ''}")
+        print("W) Watch Mode")
+        print("H) Upload History")
         print("Q) Quit\n")
 
-        choice = input("Select (1,2,3,4,5,6,7,8,Q): ").strip().upper()
+        choice = input("Select (1,2,3,4,5,6,7,8,9,W,H,Q): ").strip().upper()
         if choice == 'Q':
+            close_tk_root()
             save_settings(SETTINGS['DEFAULT_MOD_NAME'], SETTINGS['DEFAULT_DESCRIPTION_FILE_NAME'])
+            flush_settings()
             print(f"{CYAN}\n█▀▀ █▀█ █▀█ █▀▄ █▀▄ █ █ █▀▀ █{RESET}")
             print(f"{CYAN}█ █ █ █ █ █ █ █ █▀▄  █  █▀▀ ▀{RESET}")
             print(f"{CYAN}▀▀▀ ▀▀▀ ▀▀▀ ▀▀  ▀▀   ▀  ▀▀▀ ▀{RESET}")
@@ -850,6 +4915,15 @@ def main():
         elif choice == '8':
             mod_management_menu()
             continue
+        elif choice == '9':
+            batch_upload_flow(base_path)
+            continue
+        elif choice == 'W':
+            watch_mode_flow(base_path)
+            continue
+        elif choice == 'H':
+            history_flow()
+            continue
 
         execution_logs, success = [], True
         workshop_id, mod_name = None, None
@@ -861,8 +4935,13 @@ def main():
                 continue
             SETTINGS['DEFAULT_MOD_NAME'] = mod_name
             content_path = os.path.join(base_path, mod_name, 'Contents')
-            if confirm_action("content upload"):
-                ok, out = execute_upload(COMMAND_TEMPLATES[0], workshop_id, content_path=content_path)
+            # Check the filtered Contents folder in memory; staging here would change the disk before the prompt
+            resolved = os.path.expandvars(content_path)
+            changed, _ = check_content_changes(workshop_id, resolved, load_ignore_rules(resolved))
+            if not changed:
+                print(f"{YELLOW}Content unchanged since last upload.{RESET}")
+            if confirm_action("content upload" if changed else "content upload anyway"):
+                ok, out = execute_upload_live(COMMAND_TEMPLATES[0], workshop_id, content_path=content_path, force=not changed)
                 execution_logs.append(out)
                 show_execution_results(execution_logs, ok)
             else:
@@ -878,7 +4957,7 @@ def main():
             if not desc_path:
                 show_execution_results([], False, canceled=True)
                 continue
-            ok, out = execute_upload(COMMAND_TEMPLATES[1], workshop_id, desc_path=desc_path)
+            ok, out = execute_upload_live(COMMAND_TEMPLATES[1], workshop_id, desc_path=desc_path)
             execution_logs.append(out)
             show_execution_results(execution_logs, ok)
             continue
@@ -892,7 +4971,7 @@ def main():
             SETTINGS['DEFAULT_TITLE'] = title
             print(f"Title: {YELLOW}{title}{RESET}")
             if confirm_action("title update"):
-                ok, out = execute_upload(COMMAND_TEMPLATES[2], workshop_id, title=title)
+                ok, out = execute_upload_live(COMMAND_TEMPLATES[2], workshop_id, title=title)
                 execution_logs.append(out)
                 show_execution_results(execution_logs, ok)
             else:
@@ -911,7 +4990,7 @@ def main():
                 SETTINGS['DEFAULT_VISIBILITY'] = visibility
                 print(f"Selected visibility: {YELLOW}{VISIBILITY_MAP.get(visibility, visibility)}{RESET}")
                 if confirm_action("visibility update"):
-                    ok, out = execute_upload(COMMAND_TEMPLATES[3], workshop_id, visibility=visibility)
+                    ok, out = execute_upload_live(COMMAND_TEMPLATES[3], workshop_id, visibility=visibility)
                     execution_logs.append(out)
                     show_execution_results(execution_logs, ok)
                 else:
@@ -932,7 +5011,7 @@ def main():
             else:
                 print(f"Tags: ({YELLOW}no tags{RESET})")
             if confirm_action("tags update"):
-                ok, out = execute_upload(COMMAND_TEMPLATES[4], workshop_id, tags=tags)
+                ok, out = execute_upload_live(COMMAND_TEMPLATES[4], workshop_id, tags=tags)
                 execution_logs.append(out)
                 show_execution_results(execution_logs, ok)
             else:
@@ -948,7 +5027,7 @@ def main():
             if not preview_path:
                 show_execution_results([], False, canceled=True)
                 continue
-            ok, out = execute_upload(COMMAND_TEMPLATES[5], workshop_id, preview=preview_path)
+            ok, out = execute_upload_live(COMMAND_TEMPLATES[5], workshop_id, preview=preview_path)
             execution_logs.append(out)
             show_execution_results(execution_logs, ok)
             continue
@@ -964,5 +5043,337 @@ def main():
             show_execution_results(execution_logs, success)
 
 
+# ------------
+# Command Line
+# ------------
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="steamuploader.py",
+        description="Steam Uploader Menu. Run without arguments for the interactive menu."
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    upload = subparsers.add_parser('upload', help="Upload / update one or more mods without the menu")
+    selection = upload.add_argument_group("mod selection (combine freely)")
+    selection.add_argument('-m', '--mod', action='append', default=[], help="Mod name from mods.txt (repeatable)")
+    selection.add_argument('--pattern', action='append', default=[], help="Mod name pattern, e.g. 'Zed*' (repeatable)")
+    selection.add_argument('--all', action='store_true', help="All mods in mods.txt")
+    fields = upload.add_argument_group("fields to upload")
+    fields.add_argument('-c', '--content', action='store_true', help="Upload <base path>/<mod>/Contents")
+    fields.add_argument('-d', '--desc', metavar='FILE', help="Description file (.txt | .bbcode)")
+    fields.add_argument('-t', '--title', help="Title")
+    fields.add_argument('-v', '--visibility', choices=sorted(VISIBILITY_MAP), help="0=Public, 1=Friends-only, 2=Private, 3=Unlisted")
+    fields.add_argument('-T', '--tags', help="Comma-separated tags, an empty value clears all tags")
+    fields.add_argument('-p', '--preview', metavar='FILE', help="Preview image (.jpg | .png | .gif)")
+    upload.add_argument('--base-path', help="Override DEFAULT_BASE_PATH from settings.txt")
+    upload.add_argument('--force', action='store_true', help="Upload content even if unchanged since the last upload")
+    upload.add_argument('-j', '--workers', type=int, help="Parallel uploads when several mods are selected")
+    upload.add_argument('-y', '--yes', action='store_true', help="Do not ask for confirmation")
+    upload.add_argument('--timeout', type=float, help="Stop an upload after this many seconds (default DEFAULT_UPLOAD_TIMEOUT, 0 = no limit)")
+    upload.add_argument('--stall-timeout', type=float, help="Stop an upload that prints nothing for this many seconds (default DEFAULT_STALL_TIMEOUT)")
+    upload.add_argument('--daemon', action='store_true', help="Queue the uploads on a running upload daemon instead of running them here")
+
+    watch = subparsers.add_parser('watch', help="Upload mods automatically whenever their Contents folder changes")
+    selection = watch.add_argument_group("mod selection (combine freely)")
+    selection.add_argument('-m', '--mod', action='append', default=[], help="Mod name from mods.txt (repeatable)")
+    selection.add_argument('--pattern', action='append', default=[], help="Mod name pattern, e.g. 'Zed*' (repeatable)")
+    selection.add_argument('--all', action='store_true', help="All mods in mods.txt")
+    watch.add_argument('--base-path', help="Override DEFAULT_BASE_PATH from settings.txt")
+    watch.add_argument('--interval', type=float, default=WATCH_INTERVAL, help=f"Seconds between polls (default {WATCH_INTERVAL:g})")
+    watch.add_argument('--quiet', type=float, default=WATCH_QUIET, help=f"Seconds without changes before uploading (default {WATCH_QUIET:g})")
+
+    daemon = subparsers.add_parser('daemon', help="Run the upload daemon (localhost JSON API and job queue)")
+    daemon.add_argument('--port', type=int, help="Port to listen on (default DEFAULT_DAEMON_PORT, 8765)")
+    daemon.add_argument('-j', '--workers', type=int, help="Parallel uploads (default DEFAULT_BATCH_WORKERS)")
+
+    jobs = subparsers.add_parser('jobs', help="List, inspect or cancel jobs on the upload daemon")
+    jobs.add_argument('job_id', nargs='?', help="Show one job with its log")
+    jobs.add_argument('--cancel', action='store_true', help="Cancel the given job")
+
+    for name, text in (('plan', "Show the uploads that would bring the Workshop in line with a manifest"),
+                       ('apply', "Run the uploads listed by plan")):
+        command = subparsers.add_parser(name, help=text)
+        command.add_argument('-f', '--file', default=WORKSHOP_MANIFEST_FILE, help=f"Workshop manifest (default {WORKSHOP_MANIFEST_FILE})")
+        command.add_argument('-m', '--mod', action='append', default=[], help="Only this mod from the manifest (repeatable)")
+        command.add_argument('--base-path', help="Override DEFAULT_BASE_PATH from settings.txt")
+        if name == 'apply':
+            command.add_argument('-j', '--workers', type=int, help="Parallel uploads (default DEFAULT_BATCH_WORKERS)")
+            command.add_argument('-y', '--yes', action='store_true', help="Do not ask for confirmation")
+
+    render = subparsers.add_parser('render', help="Render description templates (*.tmpl) for the selected mods")
+    selection = render.add_argument_group("mod selection (combine freely)")
+    selection.add_argument('-m', '--mod', action='append', default=[], help="Mod name from mods.txt (repeatable)")
+    selection.add_argument('--pattern', action='append', default=[], help="Mod name pattern, e.g. 'Zed*' (repeatable)")
+    selection.add_argument('--all', action='store_true', help="All mods in mods.txt")
+    render.add_argument('--template', metavar='FILE', help="Template to render for every mod (default: <mod>.bbcode.tmpl or description.bbcode.tmpl in DEFAULT_DESCRIPTION_PATH)")
+    render.add_argument('--base-path', help="Override DEFAULT_BASE_PATH from settings.txt (mod.info variables)")
+
+    history = subparsers.add_parser('history', help="Show the upload history")
+    history.add_argument('report', nargs='?', default='recent', choices=HISTORY_REPORTS,
+                         help="recent (default), slowest, failures (rate per mod this week) or sizes (median duration of content uploads by size)")
+    history.add_argument('-n', '--limit', type=int, default=20, help="Rows for recent and slowest (default 20)")
+    history.add_argument('-m', '--mod', help="Only this mod (recent and slowest)")
+
+    subparsers.add_parser('mods', help="List the mods in mods.txt")
+    return parser
+
+
+def cli_fail(message):
+    print(f"{RED}ERROR: {message}{RESET}", file=sys.stderr)
+    return 2
+
+
+def cli_selected_mods(args):
+    """Mod names picked with --mod / --pattern / --all, or (None, error message)."""
+    unknown = [name for name in args.mod if name not in MODS]
+    if unknown:
+        return None, f"Unknown mod(s): {', '.join(unknown)}"
+    mod_names = []
+    for part in args.mod + args.pattern + (['all'] if args.all else []):
+        for name in resolve_mod_selection(part):
+            if name not in mod_names:
+                mod_names.append(name)
+    if not mod_names:
+        return None, "No mods selected. Use --mod, --pattern or --all."
+    return mod_names, None
+
+
+def parse_upload_fields(content=False, desc=None, title=None, visibility=None, tags=None, preview=None):
+    """
+    Validate headless upload fields (CLI and daemon). Returns (selected options, values, note) or
+    (None, None, error message). Files must exist, tags are normalized and previews optimized.
+    """
+    values, selected, note = {}, [], ""
+    if content:
+        selected.append('1')
+    if desc is not None:
+        if not os.path.isfile(desc):
+            return None, None, f"File not found: {desc}"
+        values['desc_path'] = os.path.abspath(desc)
+        selected.append('2')
+    if title is not None:
+        values['title'] = title
+        selected.append('3')
+    if visibility is not None:
+        if str(visibility) not in VISIBILITY_MAP:
+            return None, None, f"Invalid visibility {visibility}. Use {', '.join(sorted(VISIBILITY_MAP))}."
+        values['visibility'] = str(visibility)
+        selected.append('4')
+    if tags is not None:
+        tags = tags.strip()
+        if not tags or tags in ('""', '__CLEAR__'):
+            values['tags'] = '__CLEAR__'
+        else:
+            tag_list = [tag.strip() for tag in tags.split(',')]
+            if not all(tag_list):
+                return None, None, "Invalid tags format. Tags must be separated by commas."
+            values['tags'] = ",".join(tag_list)
+        selected.append('5')
+    if preview is not None:
+        if not os.path.isfile(preview):
+            return None, None, f"File not found: {preview}"
+        optimized, message = optimize_preview(os.path.abspath(preview))
+        if not optimized:
+            return None, None, message
+        note = message or ""
+        values['preview'] = optimized
+        selected.append('6')
+    if not selected:
+        return None, None, "Nothing to upload. Use --content, --desc, --title, --visibility, --tags or --preview."
+    return selected, values, note
+
+
+def cli_upload(args):
+    mod_names, error = cli_selected_mods(args)
+    if error:
+        return cli_fail(error)
+
+    selected, values, message = parse_upload_fields(args.content, args.desc, args.title, args.visibility, args.tags, args.preview)
+    if selected is None:
+        return cli_fail(message)
+    if message:
+        print(f"{YELLOW}{message}{RESET}")
+
+    if args.daemon:
+        payload = daemon_payload(mod_names, selected, values, args.force, args.timeout, args.stall_timeout)
+        if args.base_path:
+            payload['base_path'] = os.path.abspath(args.base_path)
+        status, response = daemon_request('POST', '/jobs', payload)
+        if status is None:
+            return cli_fail(f"Upload daemon not reachable on port {daemon_port()}: {response}")
+        for rejected in response.get('rejected', []):
+            print(f"{RED}{rejected['mod_name']}: {'; '.join(rejected['errors'])}{RESET}")
+        if status != 202:
+            return cli_fail(response.get('error') or "No job was queued.")
+        print(f"{GREEN}Queued {len(response['jobs'])} job(s) on the upload daemon:{RESET}")
+        print_daemon_jobs(response['jobs'])
+        return 0
+
+    base_path = args.base_path or SETTINGS.get('DEFAULT_BASE_PATH')
+    jobs = build_batch_jobs(mod_names, selected, values, base_path)
+    for job in jobs:
+        job['kwargs']['force'] = args.force
+        if args.timeout is not None:
+            job['kwargs']['timeout'] = args.timeout
+        if args.stall_timeout is not None:
+            job['kwargs']['stall_timeout'] = args.stall_timeout
+
+    print(f"Mods: {YELLOW}{', '.join(mod_names)}{RESET}")
+    print(f"Fields: {YELLOW}{', '.join(UPLOAD_OPTIONS[opt][1] for opt in selected)}{RESET}")
+    if not args.yes:
+        if not sys.stdin.isatty():
+            return cli_fail("Refusing to upload without confirmation on a non-interactive terminal. Pass --yes.")
+        if input("Proceed? (y/n): ").strip().lower() != 'y':
+            print(f"{YELLOW}=== ACTION CANCELED ==={RESET}")
+            return 1
+
+    if len(jobs) == 1:
+        job = jobs[0]
+        report = preflight_job(job)
+        if report['errors']:
+            print(format_preflight_errors(report))
+            return 1
+        ok, out = execute_upload(job['template'], job['workshop_id'], on_event=make_progress_printer(), **job['kwargs'])
+        print()
+        print(out)
+        print(f"{GREEN}=== ACTION COMPLETE ==={RESET}" if ok else f"{RED}=== ACTION FAILED ==={RESET}")
+        return 0 if ok else 1
+
+    workers = args.workers or int(SETTINGS.get('DEFAULT_BATCH_WORKERS') or 4)
+    start = time.perf_counter()
+    results = run_batch(jobs, workers, on_result=print_batch_progress)
+    _, failed, canceled = print_batch_report(results, time.perf_counter() - start)
+    return 0 if not failed and not canceled else 1
+
+
+def cli_watch(args):
+    mod_names, error = cli_selected_mods(args)
+    if error:
+        return cli_fail(error)
+    print(f"Mods: {YELLOW}{', '.join(mod_names)}{RESET}")
+    results = watch_mods(mod_names, args.base_path or SETTINGS.get('DEFAULT_BASE_PATH'), args.interval, args.quiet)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+def cli_plan(args):
+    """plan and apply: diff the workshop manifest against local state, apply also runs the calls."""
+    entries, error = load_workshop_manifest(args.file)
+    if error:
+        return cli_fail(error)
+    unknown = [name for name in args.mod if name not in entries]
+    if unknown:
+        return cli_fail(f"Not in {args.file}: {', '.join(unknown)}")
+    if args.mod:
+        entries = {name: entries[name] for name in args.mod}
+
+    plans = plan_workshop(entries, args.base_path or SETTINGS.get('DEFAULT_BASE_PATH'))
+    jobs = print_workshop_plan(plans)
+    errors = any(plan['error'] for plan in plans)
+    if args.command == 'plan' or not jobs:
+        return 1 if errors else 0
+
+    if not args.yes:
+        if not sys.stdin.isatty():
+            return cli_fail("Refusing to upload without confirmation on a non-interactive terminal. Pass --yes.")
+        if input("Apply? (y/n): ").strip().lower() != 'y':
+            print(f"{YELLOW}=== ACTION CANCELED ==={RESET}")
+            return 1
+
+    workers = args.workers or int(SETTINGS.get('DEFAULT_BATCH_WORKERS') or 4)
+    start = time.perf_counter()
+    results = run_batch(jobs, workers, on_result=print_batch_progress)
+    _, failed, canceled = print_batch_report(results, time.perf_counter() - start)
+    return 0 if not failed and not canceled and not errors else 1
+
+
+def cli_render(args):
+    mod_names, error = cli_selected_mods(args)
+    if error:
+        return cli_fail(error)
+    if args.template and not os.path.isfile(args.template):
+        return cli_fail(f"File not found: {args.template}")
+
+    failed = 0
+    for mod_name in mod_names:
+        template = args.template or find_description_template(mod_name)
+        if not template:
+            print(f"{YELLOW}{mod_name}: no template in {SETTINGS.get('DEFAULT_DESCRIPTION_PATH') or '.'}{RESET}")
+            continue
+        result = render_description(template, mod_name, MODS.get(mod_name, ''), args.base_path)
+        if result['error']:
+            failed += 1
+            print(f"{RED}{mod_name}: {result['error']}{RESET}")
+            if not result['path']:
+                continue
+        color = GREEN if not result['error'] else RED
+        print(f"{color}{mod_name}{RESET}: {result['status']}, {result['length']}/{DESCRIPTION_MAX_LENGTH} characters -> {result['path']}")
+    return 1 if failed else 0
+
+
+def cli_jobs(args):
+    if args.cancel and not args.job_id:
+        return cli_fail("--cancel needs a job id.")
+    if args.cancel:
+        status, response = daemon_request('POST', f"/jobs/{args.job_id}/cancel")
+    elif args.job_id:
+        status, response = daemon_request('GET', f"/jobs/{args.job_id}")
+    else:
+        status, response = daemon_request('GET', '/jobs')
+    if status is None:
+        return cli_fail(f"Upload daemon not reachable on port {daemon_port()}: {response}")
+    if status != 200:
+        return cli_fail(response.get('error', f"HTTP {status}"))
+    if 'jobs' in response:
+        print_daemon_jobs(response['jobs'])
+    else:
+        print_daemon_jobs([response])
+        if response.get('output'):
+            print(f"\n{response['output']}")
+    return 0
+
+
+def cli_mods():
+    for name, wid in MODS.items():
+        print(f"{name}={wid or ''}")
+    return 0
+
+
+def run_cli(argv):
+    """Entry point: the interactive menu without arguments, the headless commands otherwise."""
+    if not argv:
+        main()
+        return 0
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 2
+
+    load_settings()
+    load_commands()
+    load_mods()
+    if SETTINGS.get('DEFAULT_DISCOVER_MODS') == '1':
+        run_mod_discovery(SETTINGS.get('DEFAULT_BASE_PATH'), interactive=False)
+    if args.command == 'mods':
+        return cli_mods()
+    if args.command == 'upload':
+        return cli_upload(args)
+    if args.command == 'watch':
+        return cli_watch(args)
+    if args.command == 'daemon':
+        return serve_daemon(args.port, args.workers)
+    if args.command == 'jobs':
+        return cli_jobs(args)
+    if args.command in ('plan', 'apply'):
+        return cli_plan(args)
+    if args.command == 'render':
+        return cli_render(args)
+    if args.command == 'history':
+        print_history_report(args.report, args.limit, args.mod)
+        return 0
+    return 2
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(run_cli(sys.argv[1:]))
@@ -0,0 +1,21 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import steamuploader  # noqa: E402
+
+
+@pytest.fixture
+def su(tmp_path, monkeypatch):
+    """steamuploader with its relative cache paths inside a fresh temporary folder and clean global state."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(steamuploader.SETTINGS, 'DEFAULT_BASE_PATH', str(tmp_path))
+    monkeypatch.setitem(steamuploader.DESCRIPTIONS, 'state', None)
+    steamuploader.CONTENT_SCANS.clear()
+    steamuploader.SCHEDULER.update(wakeup=None, waiting=[], seq=0, tokens=float(steamuploader.SCHEDULER_BURST),
+                                   updated=time.monotonic(), content_running=0)
+    return steamuploader
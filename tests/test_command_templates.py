@@ -0,0 +1,41 @@
+TEMPLATE = 'SteamUploader.exe -a 108600 -w {WORKSHOP_ID} -c {CONTENT} -t {TITLE} -v {VISIBILITY}'
+
+
+def test_compile_splits_the_template_into_parts(su):
+    compiled = su.compile_command_template(TEMPLATE)
+    assert compiled['executable'] == 'SteamUploader.exe'
+    assert compiled['args'] == [
+        ('fixed', '-a'), ('fixed', '108600'), ('fixed', '-w'), ('id', '{WORKSHOP_ID}'),
+        ('option', '-c', 'content_path'), ('option', '-t', 'title'), ('option', '-v', 'visibility'),
+    ]
+    assert compiled['unresolved'] == []
+
+
+def test_compile_is_cached_per_template(su):
+    assert su.compile_command_template(TEMPLATE) is su.compile_command_template(TEMPLATE)
+
+
+def test_unknown_placeholders_are_reported(su):
+    assert su.compile_command_template('uploader -w {WORKSHOP_ID} -x {CHANGENOTE}')['unresolved'] == ['{CHANGENOTE}']
+
+
+def test_quotes_group_words(su):
+    compiled = su.compile_command_template('"C:/Program Files/up.exe" -w {WORKSHOP_ID} --note "two words"')
+    assert compiled['executable'] == 'C:/Program Files/up.exe'
+    assert ('fixed', 'two words') in compiled['args']
+
+
+def test_build_fills_values_and_drops_empty_options(su):
+    argv = su.build_command(TEMPLATE, '42', content_path='/mods/ModA/Contents', title='My Mod')
+    assert argv == ['SteamUploader.exe', '-a', '108600', '-w', '42', '-c', '/mods/ModA/Contents', '-t', 'My Mod']
+
+
+def test_build_keeps_public_visibility_and_clears_values(su):
+    argv = su.build_command(TEMPLATE, '42', title='__CLEAR__', visibility='0')
+    assert argv == ['SteamUploader.exe', '-a', '108600', '-w', '42', '-t', '', '-v', '0']
+
+
+def test_build_expands_environment_variables_in_paths(su, monkeypatch):
+    monkeypatch.setenv('MODS_ROOT', '/srv/mods')
+    argv = su.build_command(TEMPLATE, '42', content_path='$MODS_ROOT/ModA/Contents')
+    assert argv[-1] == '/srv/mods/ModA/Contents'
@@ -0,0 +1,79 @@
+import os
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_variables_come_from_the_mod_folder(su, tmp_path):
+    write(tmp_path / 'ModA' / 'workshop.txt', 'version=1\ntitle=Better Mod\n')
+    write(tmp_path / 'ModA' / 'Contents' / 'mods' / 'BetterMod' / 'mod.info', 'name=Better Mod\nid=BetterMod\nmodversion=1.2\n')
+    template = write(tmp_path / 'desc' / 'description.txt.tmpl', '{{title}} {{version}} ({{mod_id}}) #{{ workshop_id }}')
+
+    result = su.render_description(template, 'ModA', '42')
+    assert result['error'] is None
+    assert result['status'] == 'rendered'
+    assert read(result['path']) == 'Better Mod 1.2 (BetterMod) #42'
+    assert result['length'] == len('Better Mod 1.2 (BetterMod) #42')
+    assert result['path'].endswith('.txt')
+
+
+def test_partials_are_included_without_their_trailing_newline(su, tmp_path):
+    write(tmp_path / 'desc' / 'footer.bbcode', '[b]{{mod_name}}[/b]\n')
+    template = write(tmp_path / 'desc' / 'description.bbcode.tmpl', 'Intro\n{{> footer.bbcode}}\n')
+    result = su.render_description(template, 'ModA', '42')
+    assert read(result['path']) == 'Intro\n[b]ModA[/b]\n'
+    assert result['path'].endswith('.bbcode')
+
+
+def test_unchanged_inputs_are_not_rendered_again(su, tmp_path):
+    template = write(tmp_path / 'desc' / 'description.txt.tmpl', 'Hello {{mod_name}}')
+    first = su.render_description(template, 'ModA', '42')
+    assert su.render_description(template, 'ModA', '42')['status'] == 'cached'
+
+    st = os.stat(template)
+    os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 5 * 10**9))
+    touched = su.render_description(template, 'ModA', '42')
+    assert touched['status'] == 'reused'
+    assert touched['path'] == first['path']
+
+    write(tmp_path / 'desc' / 'description.txt.tmpl', 'Bye {{mod_name}}')
+    changed = su.render_description(template, 'ModA', '42')
+    assert changed['status'] == 'rendered'
+    assert changed['path'] != first['path']
+    assert read(changed['path']) == 'Bye ModA'
+
+
+def test_each_mod_gets_its_own_output(su, tmp_path):
+    template = write(tmp_path / 'desc' / 'description.txt.tmpl', '{{mod_name}}')
+    a = su.render_description(template, 'ModA', '1')
+    b = su.render_description(template, 'ModB', '2')
+    assert a['path'] != b['path']
+    assert read(b['path']) == 'ModB'
+
+
+def test_template_errors_are_reported(su, tmp_path):
+    unknown = write(tmp_path / 'desc' / 'unknown.txt.tmpl', '{{nope}}')
+    assert 'Unknown variable {{nope}}' in su.render_description(unknown, 'ModA', '42')['error']
+
+    missing = write(tmp_path / 'desc' / 'missing.txt.tmpl', '{{> gone.txt}}')
+    assert 'Partial not found' in su.render_description(missing, 'ModA', '42')['error']
+
+    write(tmp_path / 'desc' / 'a.txt', '{{> b.txt}}')
+    write(tmp_path / 'desc' / 'b.txt', '{{> a.txt}}')
+    cycle = write(tmp_path / 'desc' / 'cycle.txt.tmpl', '{{> a.txt}}')
+    assert 'Include cycle' in su.render_description(cycle, 'ModA', '42')['error']
+
+
+def test_descriptions_over_the_steam_limit_are_errors(su, tmp_path):
+    template = write(tmp_path / 'desc' / 'long.txt.tmpl', 'x' * (su.DESCRIPTION_MAX_LENGTH + 1))
+    result = su.render_description(template, 'ModA', '42')
+    assert result['path'] is not None
+    assert 'Steam limit' in result['error']
@@ -0,0 +1,51 @@
+def test_unanchored_pattern_matches_at_any_depth(su):
+    rules = su.compile_ignore_rules(['*.psd'])
+    assert su.is_ignored('cover.psd', False, rules)
+    assert su.is_ignored('media/textures/cover.psd', False, rules)
+    assert not su.is_ignored('cover.png', False, rules)
+
+
+def test_anchored_pattern_matches_from_the_root_only(su):
+    rules = su.compile_ignore_rules(['/build', 'docs/*.md'])
+    assert su.is_ignored('build', True, rules)
+    assert not su.is_ignored('media/build', True, rules)
+    assert su.is_ignored('docs/readme.md', False, rules)
+    assert not su.is_ignored('docs/api/readme.md', False, rules)
+
+
+def test_double_star_and_character_classes(su):
+    rules = su.compile_ignore_rules(['media/**/*.xcf', 'log[0-9].txt', 'v?.lua'])
+    assert su.is_ignored('media/a.xcf', False, rules)
+    assert su.is_ignored('media/a/b/c.xcf', False, rules)
+    assert su.is_ignored('log7.txt', False, rules)
+    assert not su.is_ignored('logs.txt', False, rules)
+    assert su.is_ignored('v1.lua', False, rules)
+    assert not su.is_ignored('v10.lua', False, rules)
+
+
+def test_directory_only_rules_skip_files(su):
+    rules = su.compile_ignore_rules(['cache/'])
+    assert su.is_ignored('cache', True, rules)
+    assert not su.is_ignored('cache', False, rules)
+
+
+def test_later_negation_wins(su):
+    rules = su.compile_ignore_rules(['*.txt', '!keep.txt'])
+    assert su.is_ignored('notes.txt', False, rules)
+    assert not su.is_ignored('keep.txt', False, rules)
+    rules = su.compile_ignore_rules(['!keep.txt', '*.txt'])
+    assert su.is_ignored('keep.txt', False, rules)
+
+
+def test_comments_and_blank_lines_are_skipped(su):
+    assert su.compile_ignore_rules(['', '# *.lua', '   ', '/']) == []
+
+
+def test_load_ignore_rules_adds_the_mod_file_to_the_defaults(su, tmp_path):
+    contents = tmp_path / 'ModA' / 'Contents'
+    contents.mkdir(parents=True)
+    (tmp_path / 'ModA' / su.IGNORE_FILE_NAME).write_text('*.psd\n', encoding='utf-8')
+    rules = su.load_ignore_rules(str(contents))
+    assert su.is_ignored('.git', True, rules)
+    assert su.is_ignored('art/cover.psd', False, rules)
+    assert not su.is_ignored('mod.info', False, rules)
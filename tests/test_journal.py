@@ -0,0 +1,67 @@
+import json
+import os
+
+
+def queue(su, path, *names):
+    jobs = [{'mod_name': name, 'workshop_id': str(i + 1), 'template': 'uploader -w {WORKSHOP_ID}', 'kwargs': {}}
+            for i, name in enumerate(names)]
+    return su.journal_jobs(jobs, path)
+
+
+def test_replay_tracks_attempts_and_finished_jobs(su):
+    path = 'journal.jsonl'
+    a, b = queue(su, path, 'ModA', 'ModB')
+    su.journal_append({'event': 'attempt', 'id': a['id'], 'attempt': 2, 'ok': False}, path)
+    su.journal_append({'event': 'finished', 'id': b['id'], 'status': 'succeeded'}, path)
+
+    jobs = su.load_journal(path)
+    assert jobs[a['id']]['attempts'] == 2
+    assert jobs[a['id']]['status'] == 'pending'
+    assert jobs[b['id']]['status'] == 'succeeded'
+    assert jobs[a['id']]['job']['mod_name'] == 'ModA'
+    assert 'id' not in jobs[a['id']]['job']
+
+
+def test_pending_jobs_carry_their_attempts_and_journal(su):
+    path = 'journal.jsonl'
+    a, b = queue(su, path, 'ModA', 'ModB')
+    su.journal_append({'event': 'attempt', 'id': a['id'], 'attempt': 1, 'ok': False}, path)
+    su.journal_append({'event': 'finished', 'id': b['id'], 'status': 'failed'}, path)
+
+    pending = su.pending_journal_jobs(path)
+    assert [(job['id'], job['mod_name'], job['attempts'], job['journal']) for job in pending] == [(a['id'], 'ModA', 1, path)]
+
+
+def test_torn_last_line_is_ignored(su):
+    path = 'journal.jsonl'
+    a, = queue(su, path, 'ModA')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "finished", "id": "%s", "sta' % a['id'])
+    assert su.load_journal(path)[a['id']]['status'] == 'pending'
+
+
+def test_missing_journal_replays_to_nothing(su):
+    assert su.load_journal('missing.jsonl') == {}
+    assert su.pending_journal_jobs('missing.jsonl') == []
+
+
+def test_compaction_keeps_only_unfinished_jobs(su):
+    path = 'journal.jsonl'
+    a, b, c = queue(su, path, 'ModA', 'ModB', 'ModC')
+    su.journal_append({'event': 'attempt', 'id': a['id'], 'attempt': 3, 'ok': False}, path)
+    su.journal_append({'event': 'finished', 'id': b['id'], 'status': 'succeeded'}, path)
+    before = su.pending_journal_jobs(path)
+
+    su.compact_journal(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert {record['id'] for record in records} == {a['id'], c['id']}
+    assert su.pending_journal_jobs(path) == before
+
+
+def test_compaction_removes_a_finished_journal(su):
+    path = 'journal.jsonl'
+    a, = queue(su, path, 'ModA')
+    su.journal_append({'event': 'finished', 'id': a['id'], 'status': 'succeeded'}, path)
+    su.compact_journal(path)
+    assert not os.path.exists(path)
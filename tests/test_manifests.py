@@ -0,0 +1,69 @@
+import os
+
+
+def make_contents(tmp_path, files):
+    contents = tmp_path / 'ModA' / 'Contents'
+    for rel, data in files.items():
+        path = contents / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return str(contents)
+
+
+def test_manifest_lists_files_with_hashes_and_honours_rules(su, tmp_path):
+    contents = make_contents(tmp_path, {'mods/a.lua': b'print(1)', 'art/cover.psd': b'psd', 'notes.tmp': b'x'})
+    manifest = su.build_content_manifest(contents, rules=su.compile_ignore_rules(['*.psd', '*.tmp']))
+    assert sorted(manifest['files']) == ['mods/a.lua']
+    entry = manifest['files']['mods/a.lua']
+    assert entry['size'] == 8
+    assert entry['hash'] == su.hash_file(os.path.join(contents, 'mods', 'a.lua'), 8)
+
+
+def test_content_changes_are_detected_against_the_saved_manifest(su, tmp_path):
+    contents = make_contents(tmp_path, {'mods/a.lua': b'print(1)', 'mods/b.lua': b'print(2)'})
+    changed, manifest = su.check_content_changes('42', contents)
+    assert changed
+    su.save_manifest('42', manifest)
+
+    su.CONTENT_SCANS.clear()
+    assert su.check_content_changes('42', contents)[0] is False
+
+    make_contents(tmp_path, {'mods/b.lua': b'print(3)', 'mods/c.lua': b'new file'})
+    su.CONTENT_SCANS.clear()
+    changed, updated = su.check_content_changes('42', contents)
+    assert changed
+    assert su.changed_content_stats(su.load_manifest('42'), updated) == (2, 16)
+
+
+def test_removed_files_count_as_a_change(su, tmp_path):
+    contents = make_contents(tmp_path, {'a.txt': b'a', 'b.txt': b'b'})
+    previous = su.build_content_manifest(contents)
+    os.remove(os.path.join(contents, 'b.txt'))
+    su.CONTENT_SCANS.clear()
+    assert not su.manifests_match(previous, su.build_content_manifest(contents))
+
+
+def test_matching_needs_same_version_sizes_and_hashes(su):
+    files = {'a.txt': {'size': 1, 'mtime_ns': 1, 'hash': 'aa'}}
+    manifest = {'version': 1, 'files': files}
+    assert su.manifests_match(manifest, {'version': 1, 'files': {'a.txt': dict(files['a.txt'], mtime_ns=2)}})
+    assert not su.manifests_match(manifest, {'version': 1, 'files': {'a.txt': dict(files['a.txt'], hash='bb')}})
+    assert not su.manifests_match(dict(manifest, version=0), manifest)
+    assert not su.manifests_match(None, manifest)
+
+
+def test_hashes_are_reused_only_for_files_older_than_the_previous_scan(su, tmp_path):
+    contents = make_contents(tmp_path, {'a.txt': b'data'})
+    st = os.stat(os.path.join(contents, 'a.txt'))
+    entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': 'from-previous-scan'}
+
+    settled = {'version': 1, 'scanned_at': st.st_mtime_ns + su.MTIME_SAFETY_NS + 1, 'files': {'a.txt': entry}}
+    assert su.build_content_manifest(contents, settled)['files']['a.txt']['hash'] == 'from-previous-scan'
+
+    su.CONTENT_SCANS.clear()
+    recent = dict(settled, scanned_at=st.st_mtime_ns)
+    assert su.build_content_manifest(contents, recent)['files']['a.txt']['hash'] != 'from-previous-scan'
+
+
+def test_missing_content_folder_counts_as_changed(su, tmp_path):
+    assert su.check_content_changes('42', str(tmp_path / 'nowhere')) == (True, None)
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def scheduler(su, monkeypatch):
+    monkeypatch.setitem(su.SETTINGS, 'DEFAULT_CONTENT_UPLOADS', '1')
+    monkeypatch.setitem(su.SETTINGS, 'DEFAULT_UPLOADS_PER_MINUTE', '0')
+    return su
+
+
+def test_metadata_runs_while_content_waits(scheduler):
+    su = scheduler
+
+    async def scenario():
+        assert await su.acquire_upload_slot('content')
+        waiting = asyncio.create_task(su.acquire_upload_slot('content'))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        assert await asyncio.wait_for(su.acquire_upload_slot('metadata'), 1)
+        su.release_upload_slot('metadata')
+        su.release_upload_slot('content')
+        assert await asyncio.wait_for(waiting, 1)
+        su.release_upload_slot('content')
+
+    asyncio.run(scenario())
+    assert su.SCHEDULER['content_running'] == 0
+    assert su.SCHEDULER['waiting'] == []
+
+
+def test_content_uploads_start_first_come_first_served(scheduler):
+    su = scheduler
+    started = []
+
+    async def upload(name):
+        await su.acquire_upload_slot('content')
+        started.append(name)
+        await asyncio.sleep(0.01)
+        su.release_upload_slot('content')
+
+    async def scenario():
+        tasks = []
+        for name in ('first', 'second', 'third'):
+            tasks.append(asyncio.create_task(upload(name)))
+            await asyncio.sleep(0)
+        await asyncio.wait_for(asyncio.gather(*tasks), 2)
+
+    asyncio.run(scenario())
+    assert started == ['first', 'second', 'third']
+
+
+def test_rate_limit_waits_for_a_token(scheduler, monkeypatch):
+    su = scheduler
+    monkeypatch.setitem(su.SETTINGS, 'DEFAULT_UPLOADS_PER_MINUTE', '600')
+    su.SCHEDULER['tokens'] = 0.0
+    su.SCHEDULER['updated'] = time.monotonic()
+
+    async def scenario():
+        start = time.perf_counter()
+        assert await asyncio.wait_for(su.acquire_upload_slot('metadata'), 2)
+        return time.perf_counter() - start
+
+    assert asyncio.run(scenario()) >= 0.05
+    assert su.SCHEDULER['tokens'] < 1
+
+
+def test_tokens_refill_up_to_the_burst(scheduler, monkeypatch):
+    su = scheduler
+    monkeypatch.setitem(su.SETTINGS, 'DEFAULT_UPLOADS_PER_MINUTE', '60')
+    su.SCHEDULER['tokens'] = 0.0
+    su.SCHEDULER['updated'] = time.monotonic() - 3600
+    assert su.refill_upload_tokens() == 1.0
+    assert su.SCHEDULER['tokens'] == su.SCHEDULER_BURST
+
+
+def test_cancel_gives_up_waiting(scheduler):
+    su = scheduler
+    cancel = threading.Event()
+
+    async def scenario():
+        assert await su.acquire_upload_slot('content')
+        waiting = asyncio.create_task(su.acquire_upload_slot('content', cancel))
+        await asyncio.sleep(0.05)
+        cancel.set()
+        granted = await asyncio.wait_for(waiting, 2)
+        su.release_upload_slot('content')
+        return granted
+
+    assert asyncio.run(scenario()) is False
+    assert su.SCHEDULER['waiting'] == []
+
+
+def test_mod_lock_is_exclusive_per_workshop_item(su):
+    lock = su.try_mod_lock('42')
+    assert lock
+    assert su.try_mod_lock('42') is None
+    other = su.try_mod_lock('43')
+    assert other
+    su.release_mod_lock(lock)
+    su.release_mod_lock(other)
+    again = su.try_mod_lock('42')
+    assert again
+    su.release_mod_lock(again)